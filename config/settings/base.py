@@ -343,3 +343,11 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# GraphQL persisted queries, sha256 -> query written by scripts/export_schema.py
+GRAPHQL_PERSISTED_QUERIES_PATH = BASE_DIR / "persisted_queries.json"
+# Accept only the queries of the allow-list
+GRAPHQL_PERSISTED_QUERIES_ONLY = env.bool(
+    "GRAPHQL_PERSISTED_QUERIES_ONLY", default=False
+)
+# Parsed and validated documents kept per process
+GRAPHQL_DOCUMENT_CACHE_SIZE = 256
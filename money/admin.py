@@ -1,13 +1,20 @@
 from django import forms
 from django.contrib import admin
+from django.db.models.functions import TruncMonth
 
 from money.choices import DetailItemCategory, TransactionCategory
-from money.models.accounts import Account, AmountSnapshot, Bank
+from money.helpers import ledger, positions
+from money.models.accounts import Account, AmountSnapshot, AmountSnapshotWatermark, Bank
 from money.models.exchanges import Exchange
 from money.models.incomes import W2, Salary
 from money.models.shoppings import AmazonOrder, DetailItem, Retailer
 from money.models.stocks import Stock, StockPrice, StockTransaction
-from money.models.transactions import Transaction, TransactionDetail, TransactionFile
+from money.models.transactions import (
+    CategorizationRule,
+    Transaction,
+    TransactionDetail,
+    TransactionFile,
+)
 
 
 @admin.register(Bank)
@@ -20,12 +27,29 @@ class AccountAdmin(admin.ModelAdmin):
     list_display = ["name", "id", "bank", "currency", "is_active", "first_added"]
     list_filter = ["is_active", "bank", "first_added"]
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and "currency" in form.changed_data:
+            # Every month of the account moves to the rollups of the new currency
+            ledger.transactions_changed(
+                Transaction.objects.filter(account=obj)
+                .annotate(month=TruncMonth("date"))
+                .values_list("account_id", "month")
+                .distinct(),
+                {obj.pk: form.initial["currency"]},
+            )
+
 
 @admin.register(AmountSnapshot)
 class AmountSnapshotAdmin(admin.ModelAdmin):
     date_hierarchy = "date"
 
 
+@admin.register(AmountSnapshotWatermark)
+class AmountSnapshotWatermarkAdmin(admin.ModelAdmin):
+    list_display = ["currency", "dirty_date"]
+
+
 class TransactionAdminForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -53,6 +77,24 @@ class TransactionAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related("account", "retailer")
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        ledger.transactions_changed(
+            [
+                (form.initial.get("account"), form.initial.get("date")),
+                (obj.account_id, obj.date),
+            ]
+        )
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        ledger.transactions_changed([(obj.account_id, obj.date)])
+
+    def delete_queryset(self, request, queryset):
+        changes = list(queryset.values_list("account_id", "date"))
+        super().delete_queryset(request, queryset)
+        ledger.transactions_changed(changes)
+
 
 @admin.register(Retailer)
 class RetailerAdmin(admin.ModelAdmin):
@@ -104,11 +146,51 @@ class StockAdmin(admin.ModelAdmin):
 class StockPriceAdmin(admin.ModelAdmin):
     list_display = ("id", "stock", "date", "price")
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        positions.stock_prices_changed(
+            [
+                (form.initial.get("stock"), form.initial.get("date")),
+                (obj.stock_id, obj.date),
+            ]
+        )
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        positions.stock_prices_changed([(obj.stock_id, obj.date)])
+
+    def delete_queryset(self, request, queryset):
+        changes = list(queryset.values_list("stock_id", "date"))
+        super().delete_queryset(request, queryset)
+        positions.stock_prices_changed(changes)
+
 
 @admin.register(StockTransaction)
 class StockTransactionAdmin(admin.ModelAdmin):
     raw_id_fields = ("related_transaction",)
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        positions.stock_transactions_changed(
+            [
+                (
+                    form.initial.get("account"),
+                    form.initial.get("stock"),
+                    form.initial.get("date"),
+                ),
+                (obj.account_id, obj.stock_id, obj.date),
+            ]
+        )
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        positions.stock_transactions_changed([(obj.account_id, obj.stock_id, obj.date)])
+
+    def delete_queryset(self, request, queryset):
+        changes = list(queryset.values_list("account_id", "stock_id", "date"))
+        super().delete_queryset(request, queryset)
+        positions.stock_transactions_changed(changes)
+
 
 @admin.register(AmazonOrder)
 class AmazonOrderAdmin(admin.ModelAdmin):
@@ -140,10 +222,42 @@ class ExchangeAdmin(admin.ModelAdmin):
 
 @admin.register(TransactionFile)
 class TransactionFileAdmin(admin.ModelAdmin):
-    list_display = ["id", "file", "date"]
+    list_display = [
+        "id",
+        "file",
+        "date",
+        "account",
+        "file_format",
+        "is_processed",
+        "row_count",
+        "created_count",
+        "duplicate_count",
+        "processing_seconds",
+    ]
+    list_filter = ["is_processed", "file_format"]
     date_hierarchy = "date"
 
 
+@admin.register(CategorizationRule)
+class CategorizationRuleAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "priority",
+        "account",
+        "field",
+        "match_type",
+        "pattern",
+        "retailer",
+        "type",
+        "is_internal",
+        "reviewed",
+        "is_active",
+    ]
+    list_filter = ["is_active", "account", "match_type"]
+    search_fields = ["name", "pattern"]
+    raw_id_fields = ("retailer",)
+
+
 @admin.register(W2)
 class W2Admin(admin.ModelAdmin):
     list_display = ["id", "year", "date"]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MoneyConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "money"
+
+    def ready(self):
+        import money.signals  # noqa: F401
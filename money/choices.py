@@ -81,3 +81,32 @@ class ExchangeType(models.TextChoices):
     BANK = "BANK", "은행"
     WIREBARLEY = "WIREBARLEY", "와이어바알리"
     CREDITCARD = "CREDITCARD", "신용카드"
+
+
+class CostBasisMethod(models.TextChoices):
+    FIFO = "FIFO", "선입선출"
+    AVERAGE = "AVERAGE", "평균단가"
+
+
+class StatementFormat(models.TextChoices):
+    KAKAO_BANK = "kakao_bank", "카카오뱅크"
+    KB_BANK = "kb_bank", "국민은행"
+    NHBANK_HOUSING = "nhbank_housing", "농협 주택청약"
+
+
+class RuleField(models.TextChoices):
+    RETAILER = "retailer", "거래처"
+    NOTE = "note", "메모"
+    TYPE = "type", "구분"
+
+
+class RuleMatchType(models.TextChoices):
+    EXACT = "EXACT", "일치"
+    CONTAINS = "CONTAINS", "포함"
+    REGEX = "REGEX", "정규식"
+
+
+class TransactionGrouping(models.TextChoices):
+    MONTH = "MONTH", "월"
+    TYPE = "TYPE", "분류"
+    RETAILER = "RETAILER", "거래처"
@@ -385,7 +385,7 @@ class AmazonOrderForm(forms.ModelForm):
 class TransactionFileForm(forms.ModelForm):
     class Meta:
         model = TransactionFile
-        fields = "__all__"
+        fields = ["file", "date", "account", "file_format", "note"]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -395,6 +395,7 @@ class TransactionFileForm(forms.ModelForm):
             Row(Column("file", css_class="form-group")),
             Column("date", css_class="form-group"),
             Column("account", css_class="form-group"),
+            Column("file_format", css_class="form-group"),
             Column("note", css_class="form-group"),
             Submit("submit", "Submit", css_class="col-12"),
         )
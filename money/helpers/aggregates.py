@@ -0,0 +1,167 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from money.choices import TransactionGrouping
+from money.helpers.month_end import get_year_balances
+from money.helpers.rollups import month_of, next_month
+from money.models.accounts import Account
+from money.models.shoppings import Retailer
+from money.models.transactions import Transaction, TransactionMonthlySummary
+
+# Grouped column of the rollup and of Transaction per grouping
+GROUP_FIELDS = {
+    TransactionGrouping.MONTH: "month",
+    TransactionGrouping.TYPE: "type",
+    TransactionGrouping.RETAILER: "retailer",
+}
+
+
+@dataclass
+class TransactionTotal:
+    currency: str
+    month: date | None
+    type: str | None
+    retailer: Retailer | None
+    total: Decimal
+    income: Decimal
+    spending: Decimal
+    count: int
+
+
+@dataclass
+class BalanceSeries:
+    account: Account
+    # (first day of month, closing balance) from start to end
+    points: list[tuple[date, Decimal]]
+
+
+def _is_whole_months(start: date | None, end: date | None) -> bool:
+    return (start is None or start.day == 1) and (
+        end is None or (end + timedelta(1)).day == 1
+    )
+
+
+def get_transaction_totals(
+    group_by: Iterable[TransactionGrouping],
+    start: date | None = None,
+    end: date | None = None,
+    account_ids: list[int] | None = None,
+    is_internal: bool | None = False,
+) -> list[TransactionTotal]:
+    """
+    Sum of transactions between start and end per currency and group_by, from
+    one grouped query. Ranges of whole months over every account are read from
+    TransactionMonthlySummary, anything else is grouped from Transaction.
+    """
+    fields = [GROUP_FIELDS[TransactionGrouping(group)] for group in group_by]
+    fields = list(dict.fromkeys(fields))
+
+    if not account_ids and _is_whole_months(start, end):
+        query_set = TransactionMonthlySummary.objects.all()
+        if start is not None:
+            query_set = query_set.filter(month__gte=start)
+        if end is not None:
+            query_set = query_set.filter(month__lte=end)
+        if is_internal is not None:
+            query_set = query_set.filter(is_internal=is_internal)
+        rows = query_set.values("currency", *fields).annotate(
+            sum_total=Sum("total"),
+            sum_income=Sum("plus_sum"),
+            sum_spending=Sum("minus_sum"),
+            sum_count=Sum("count"),
+        )
+    else:
+        zero = Value(0, output_field=DecimalField(max_digits=15, decimal_places=2))
+        query_set = Transaction.objects.annotate(month=TruncMonth("date"))
+        if start is not None:
+            query_set = query_set.filter(date__gte=start)
+        if end is not None:
+            query_set = query_set.filter(date__lte=end)
+        if account_ids:
+            query_set = query_set.filter(account_id__in=account_ids)
+        if is_internal is not None:
+            query_set = query_set.filter(is_internal=is_internal)
+        rows = query_set.values(*fields, currency=F("account__currency")).annotate(
+            sum_total=Sum("amount"),
+            sum_income=Coalesce(Sum("amount", filter=Q(amount__gt=0)), zero),
+            sum_spending=Coalesce(Sum("amount", filter=Q(amount__lt=0)), zero),
+            sum_count=Count("id"),
+        )
+    rows = list(rows.order_by("currency", *fields))
+
+    retailers = {}
+    if "retailer" in fields:
+        retailers = Retailer.objects.in_bulk(
+            {row["retailer"] for row in rows if row["retailer"] is not None}
+        )
+
+    return [
+        TransactionTotal(
+            currency=row["currency"],
+            month=row.get("month"),
+            type=row.get("type"),
+            retailer=retailers.get(row.get("retailer")),
+            total=row["sum_total"],
+            income=row["sum_income"],
+            spending=row["sum_spending"],
+            count=row["sum_count"],
+        )
+        for row in rows
+    ]
+
+
+def get_balance_history(
+    start: date, end: date, account_ids: list[int] | None = None
+) -> list[BalanceSeries]:
+    """
+    Month end balance of the accounts, the active ones by default, for every
+    month from start to end. Months without a transaction carry the balance of
+    the month before, read with the closing balances from the per year cache of
+    money.helpers.month_end.
+    """
+    accounts = Account.objects.order_by("id")
+    if account_ids:
+        accounts = accounts.filter(id__in=account_ids)
+    else:
+        accounts = accounts.filter(is_active=True)
+    accounts = list(accounts)
+
+    first_month = month_of(start)
+    # Balance before the range, in the same order as money.helpers.balance
+    opening = dict(
+        Transaction.objects.filter(
+            account_id__in=[account.id for account in accounts],
+            date__lt=first_month,
+        )
+        .order_by("account_id", "-date", "amount", "-id")
+        .distinct("account_id")
+        .values_list("account_id", "balance")
+    )
+
+    closing: dict[tuple[int, date], Decimal | None] = {}
+    for year in range(start.year, end.year + 1):
+        for account_id, balances in get_year_balances(year).items():
+            for month, balance, _ in balances:
+                closing[(account_id, date(year, month, 1))] = balance
+
+    months = []
+    month = first_month
+    while month <= end:
+        months.append(month)
+        month = next_month(month)
+
+    history = []
+    for account in accounts:
+        balance = opening.get(account.id)
+        points = []
+        for month in months:
+            balance = closing.get((account.id, month), balance)
+            if balance is not None:
+                points.append((month, balance))
+        history.append(BalanceSeries(account=account, points=points))
+    return history
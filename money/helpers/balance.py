@@ -0,0 +1,125 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import DecimalField, F, Max, Min, QuerySet, Sum, Value, Window
+from django.utils import timezone
+
+from money.helpers.charts import invalidate_account_chart
+from money.helpers.month_end import invalidate_month_end_balances
+from money.models.accounts import Account
+from money.models.stocks import StockTransaction
+from money.models.transactions import Transaction
+
+# Same day transactions are ordered deposit first, id keeps the order stable.
+BALANCE_ORDERING = [F("date").asc(), F("amount").desc(), F("id").asc()]
+
+
+def write_running_sum(
+    query_set: QuerySet,
+    value_field: str,
+    partition_by: list[F] | None = None,
+    round_zero: bool = False,
+    start: Decimal = Decimal(0),
+) -> int:
+    """
+    Store the running sum of value_field into the balance column of every row in
+    query_set with a single UPDATE ... FROM (window query). The sum continues from
+    start, the balance of the row before query_set. Returns updated rows.
+    """
+    window_query = (
+        query_set.order_by()
+        .annotate(
+            running=Value(start, output_field=DecimalField())
+            + Window(
+                Sum(value_field), partition_by=partition_by, order_by=BALANCE_ORDERING
+            )
+        )
+        .values("id", "running")
+    )
+    sql, params = window_query.query.sql_with_params()
+
+    # Amounts have two decimal places, so rounding the running sum is the same as
+    # resetting the accumulated total to zero like the old per-row loop did.
+    value = "r.running"
+    if round_zero:
+        value = "CASE WHEN ABS(r.running) < 0.01 THEN 0 ELSE r.running END"
+
+    table = connection.ops.quote_name(query_set.model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} AS t SET balance = {value} FROM ({sql}) AS r "
+            f"WHERE t.id = r.id AND t.balance IS DISTINCT FROM {value}",
+            params,
+        )
+        return cursor.rowcount
+
+
+def update_account_balance(account: Account) -> None:
+    """Recompute balance of every transaction and the summary fields of account."""
+    update_balance_since(account, None)
+
+
+def update_stock_balance(account: Account) -> None:
+    """Recompute share balance of every stock transaction of account per stock."""
+    write_running_sum(
+        StockTransaction.objects.filter(account=account),
+        "shares",
+        partition_by=[F("stock_id")],
+    )
+
+
+def update_balance_since(account: Account, since: datetime.date | None) -> None:
+    """
+    Recompute balances of transactions on or after since, continuing from the
+    stored balance of the last transaction before it, and update the summary
+    fields of account. Only rows after since are read or written.
+    """
+    transaction_list = Transaction.objects.filter(account=account)
+
+    prev_transaction = None
+    updated_list = transaction_list
+    if since is not None:
+        prev_transaction = (
+            transaction_list.filter(date__lt=since)
+            .order_by("-date", "amount", "-id")
+            .values("date", "balance")
+            .first()
+        )
+        if prev_transaction is not None and prev_transaction["balance"] is None:
+            # Balances before since were never computed, nothing to continue from
+            update_balance_since(account, None)
+            return
+        updated_list = transaction_list.filter(date__gte=since)
+
+    start = prev_transaction["balance"] if prev_transaction else Decimal(0)
+    write_running_sum(updated_list, "amount", round_zero=True, start=start)
+
+    summary = updated_list.aggregate(
+        first=Min("date"), last=Max("date"), total=Sum("amount")
+    )
+    if summary["last"] is not None:
+        account.last_transaction = summary["last"]
+    elif prev_transaction is not None:
+        account.last_transaction = prev_transaction["date"]
+
+    if prev_transaction is None:
+        # None as well when the last transaction of the account was deleted
+        account.first_transaction = summary["first"]
+        if summary["last"] is None:
+            account.last_transaction = None
+
+    total = start + (summary["total"] or Decimal(0))
+    account.amount = Decimal(0) if abs(total) < 0.01 else total
+    account.last_update = timezone.now()
+    account.save(
+        update_fields=["amount", "first_transaction", "last_transaction", "last_update"]
+    )
+
+    invalidate_account_chart(account.pk)
+
+    # Every later month end balance moved with the rewritten rows
+    first_changed = since or account.first_transaction
+    if first_changed is not None:
+        last_changed = max(first_changed, account.last_transaction or first_changed)
+        invalidate_month_end_balances(first_changed.year, last_changed.year)
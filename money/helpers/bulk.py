@@ -0,0 +1,212 @@
+import copy
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+from money.helpers import ledger, positions
+from money.models.stocks import StockTransaction
+from money.models.transactions import Transaction
+
+BULK_BATCH_SIZE = 1000
+BULK_MAX_ROWS = 5000
+
+
+@dataclass
+class RowError:
+    index: int
+    field: str | None
+    message: str
+
+
+@dataclass
+class BulkResult:
+    rows: list[models.Model]
+    errors: list[RowError]
+
+
+def validate_rows(
+    model: type[models.Model], rows: list[tuple[int, models.Model]]
+) -> list[RowError]:
+    """
+    Field errors of (index, instance) rows. Foreign keys are checked with one
+    query per related model instead of the query per row of full_clean.
+    """
+    relations = [
+        field
+        for field in model._meta.concrete_fields
+        if field.is_relation and field.editable
+    ]
+    errors = []
+    for index, row in rows:
+        try:
+            row.clean_fields(exclude=[field.name for field in relations])
+        except ValidationError as e:
+            errors.extend(
+                RowError(index, field, message)
+                for field, messages in e.message_dict.items()
+                for message in messages
+            )
+
+    for field in relations:
+        ids = set()
+        for index, row in rows:
+            value = getattr(row, field.attname)
+            if value is None:
+                if not field.null:
+                    errors.append(
+                        RowError(index, field.name, "This field is required.")
+                    )
+                continue
+            try:
+                value = field.target_field.to_python(value)
+            except ValidationError:
+                errors.append(RowError(index, field.name, f"Invalid id {value}."))
+                continue
+            setattr(row, field.attname, value)
+            ids.add(value)
+
+        found = set(
+            field.related_model._base_manager.filter(pk__in=ids).values_list(
+                "pk", flat=True
+            )
+        )
+        for index, row in rows:
+            value = getattr(row, field.attname)
+            if value is not None and value in ids and value not in found:
+                errors.append(
+                    RowError(
+                        index,
+                        field.name,
+                        f"{field.related_model.__name__} {value} does not exist.",
+                    )
+                )
+
+    errors.sort(key=lambda error: error.index)
+    return errors
+
+
+def _rows_changed(model: type[models.Model], rows: Iterable[models.Model]) -> None:
+    """Update balances and positions once for every touched account."""
+    if model is Transaction:
+        ledger.transactions_changed((row.account_id, row.date) for row in rows)
+    elif model is StockTransaction:
+        positions.stock_transactions_changed(
+            (row.account_id, row.stock_id, row.date) for row in rows
+        )
+
+
+def _merge_errors(
+    known_errors: list[RowError] | None, found: list[RowError]
+) -> list[RowError]:
+    """Errors known by the caller and the ones found, one per (index, field)."""
+    errors = list(known_errors or [])
+    known = {(error.index, error.field) for error in errors}
+    errors.extend(error for error in found if (error.index, error.field) not in known)
+    errors.sort(key=lambda error: error.index)
+    return errors
+
+
+def _too_many(count: int) -> list[RowError]:
+    if count > BULK_MAX_ROWS:
+        return [RowError(0, None, f"At most {BULK_MAX_ROWS} rows at once.")]
+    return []
+
+
+def bulk_create_rows(
+    model: type[models.Model],
+    values: list[dict[str, Any]],
+    known_errors: list[RowError] | None = None,
+) -> BulkResult:
+    """
+    Create a row of model per dict of field values with bulk_create, in one
+    transaction. Nothing is written if a row is invalid or errors were already
+    known in the values.
+    """
+    errors = _too_many(len(values))
+    if errors:
+        return BulkResult([], errors)
+
+    rows = [model(**row_values) for row_values in values]
+    errors = _merge_errors(known_errors, validate_rows(model, list(enumerate(rows))))
+    if errors:
+        return BulkResult([], errors)
+
+    with transaction.atomic():
+        model.objects.bulk_create(rows, batch_size=BULK_BATCH_SIZE)
+        _rows_changed(model, rows)
+    return BulkResult(rows, [])
+
+
+def bulk_update_rows(
+    model: type[models.Model],
+    values: list[tuple[Any, dict[str, Any]]],
+    known_errors: list[RowError] | None = None,
+) -> BulkResult:
+    """
+    Set the field values of (pk, values) rows and save them with bulk_update, in
+    one transaction. Both the old and the new dates of a changed row refresh
+    the ledger. Nothing is written if a row is invalid or errors were already
+    known in the values.
+    """
+    errors = _too_many(len(values))
+    if errors:
+        return BulkResult([], errors)
+
+    pks = []
+    for index, (pk, _) in enumerate(values):
+        if pk is None:
+            pks.append(None)
+            continue
+        try:
+            pks.append(model._meta.pk.to_python(pk))
+        except ValidationError:
+            pks.append(None)
+            errors.append(RowError(index, "id", f"Invalid id {pk}."))
+    existing = model.objects.in_bulk([pk for pk in pks if pk is not None])
+
+    now = timezone.now()
+    seen = set()
+    before = []
+    rows = []
+    fields = {
+        field.name
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+    }
+    for index, (pk, (_, row_values)) in enumerate(zip(pks, values)):
+        if pk is None:
+            continue
+        row = existing.get(pk)
+        if row is None:
+            errors.append(
+                RowError(index, "id", f"{model.__name__} {pk} does not exist.")
+            )
+            continue
+        if row.pk in seen:
+            errors.append(RowError(index, "id", f"{model.__name__} {pk} is repeated."))
+            continue
+        seen.add(row.pk)
+
+        before.append(copy.copy(row))
+        for name, value in row_values.items():
+            setattr(row, name, value)
+            fields.add(model._meta.get_field(name).name)
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False):
+                setattr(row, field.attname, now)
+        rows.append((index, row))
+
+    errors = _merge_errors(known_errors, errors + validate_rows(model, rows))
+    if errors:
+        return BulkResult([], errors)
+
+    updated = [row for _, row in rows]
+    with transaction.atomic():
+        if fields:
+            model.objects.bulk_update(updated, fields, batch_size=BULK_BATCH_SIZE)
+        _rows_changed(model, before + updated)
+    return BulkResult(updated, [])
@@ -0,0 +1,152 @@
+import logging
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from django.db.models import QuerySet
+
+from money.choices import RuleMatchType, TransactionCategory
+from money.helpers.rollups import MonthBucket, month_of, refresh_monthly_summary
+from money.models.accounts import Account
+from money.models.transactions import CategorizationRule, Transaction
+
+CATEGORIZATION_BATCH_SIZE = 1000
+RULE_ACTIONS = ("retailer_id", "type", "is_internal", "reviewed")
+
+logger = logging.getLogger(__name__)
+
+
+class _FieldMatcher:
+    """Rules on one raw field: a dict of exact values and one combined regex."""
+
+    def __init__(self, rules: list[CategorizationRule]):
+        self.exact: defaultdict[str, list[CategorizationRule]] = defaultdict(list)
+        self.searched: list[tuple[CategorizationRule, re.Pattern]] = []
+        # Searched one by one, joining would renumber the groups of backreferences
+        self.separate: list[tuple[CategorizationRule, re.Pattern]] = []
+
+        alternatives = []
+        for rule in rules:
+            if rule.match_type == RuleMatchType.EXACT:
+                self.exact[rule.pattern].append(rule)
+                continue
+            try:
+                pattern = rule.compile_pattern()
+            except re.error as e:
+                logger.warning("Skipping categorization rule %s: %s", rule.pk, e)
+                continue
+            if pattern.groups:
+                self.separate.append((rule, pattern))
+            else:
+                self.searched.append((rule, pattern))
+                alternatives.append(f"(?:{pattern.pattern})")
+
+        # A single scan rejects the values no substring or regex rule can match
+        self.any_searched = None
+        if alternatives:
+            try:
+                self.any_searched = re.compile("|".join(alternatives))
+            except re.error:
+                # Inline flags are only allowed at the start of a whole pattern
+                self.separate.extend(self.searched)
+                self.searched = []
+
+    def candidates(self, value: str) -> list[CategorizationRule]:
+        rules = list(self.exact.get(value, []))
+        if self.any_searched is not None and self.any_searched.search(value):
+            rules.extend(
+                rule for rule, pattern in self.searched if pattern.search(value)
+            )
+        rules.extend(rule for rule, pattern in self.separate if pattern.search(value))
+        return rules
+
+
+class RuleMatcher:
+    """Active categorization rules compiled once for matching many rows."""
+
+    def __init__(self, rules: Iterable[CategorizationRule]):
+        per_field: defaultdict[str, list[CategorizationRule]] = defaultdict(list)
+        for rule in rules:
+            per_field[rule.field].append(rule)
+        self.fields = {
+            field: _FieldMatcher(field_rules)
+            for field, field_rules in per_field.items()
+        }
+
+    def match(self, account_id: int, raw: dict[str, Any]) -> CategorizationRule | None:
+        """Rule with the lowest priority matching the raw bank row of account."""
+        best = None
+        for field, matcher in self.fields.items():
+            value = raw.get(field)
+            if not isinstance(value, str):
+                continue
+            for rule in matcher.candidates(value):
+                if rule.account_id is not None and rule.account_id != account_id:
+                    continue
+                if any(
+                    raw.get(key) != expected
+                    for key, expected in rule.required_fields.items()
+                ):
+                    continue
+                if best is None or (rule.priority, rule.id) < (best.priority, best.id):
+                    best = rule
+        return best
+
+
+def apply_rules(
+    transactions: QuerySet[Transaction] | None = None,
+    batch_size: int = CATEGORIZATION_BATCH_SIZE,
+) -> int:
+    """
+    Apply the active rules to the unreviewed transactions that are still
+    uncategorized (ETC), so a type set by hand is never overwritten. Changed
+    rows are saved with bulk_update and the monthly summary of their months is
+    refreshed once. Returns the number of transactions changed.
+    """
+    matcher = RuleMatcher(CategorizationRule.objects.filter(is_active=True))
+    if not matcher.fields:
+        return 0
+
+    if transactions is None:
+        transactions = Transaction.objects.all()
+    # Only imported rows carrying a field some rule looks at
+    rows = (
+        transactions.filter(
+            reviewed=False,
+            type=TransactionCategory.ETC,
+            raw__has_any_keys=list(matcher.fields),
+        )
+        .only("id", "date", "account_id", "raw", *RULE_ACTIONS)
+        .order_by("id")
+        .iterator(chunk_size=batch_size)
+    )
+    currency_map = dict(Account.objects.values_list("id", "currency"))
+
+    changed_count = 0
+    buckets: set[MonthBucket] = set()
+    changed: list[Transaction] = []
+    for row in rows:
+        rule = matcher.match(row.account_id, row.raw)
+        if rule is None:
+            continue
+
+        before = [getattr(row, action) for action in RULE_ACTIONS]
+        for action in RULE_ACTIONS:
+            value = getattr(rule, action)
+            if value is not None:
+                setattr(row, action, value)
+        if before == [getattr(row, action) for action in RULE_ACTIONS]:
+            continue
+
+        changed.append(row)
+        buckets.add((month_of(row.date), currency_map[row.account_id]))
+        if len(changed) == batch_size:
+            Transaction.objects.bulk_update(changed, RULE_ACTIONS)
+            changed_count += len(changed)
+            changed = []
+
+    Transaction.objects.bulk_update(changed, RULE_ACTIONS)
+    changed_count += len(changed)
+    refresh_monthly_summary(buckets)
+    return changed_count
@@ -1,53 +1,102 @@
 from collections import defaultdict
-from decimal import Decimal
 from typing import Any
 
+from django.core.cache import cache
+from django.db.models import F, Max, Min, Q, Window
+from django.db.models.functions import RowNumber, Trunc
 from django.db.models.query import QuerySet
 
-from money.models.accounts import AmountSnapshot
+from money.models.accounts import Account, AmountSnapshot
 from money.models.transactions import Transaction
 
+ACCOUNT_CHART_POINTS = 400
+ACCOUNT_CHART_CACHE_KEY = "money:account_chart:{account_id}"
+# Trunc kinds from finest to coarsest with their approximate length in days
+ACCOUNT_CHART_RESOLUTIONS = [
+    ("day", 1),
+    ("week", 7),
+    ("month", 28),
+    ("quarter", 90),
+    ("year", 365),
+]
 
-def get_transaction_chart_data(
-    transaction_list: QuerySet[Transaction],
-    currency: str,
-    recalculate: bool = False,
-    reverse: bool = False,
-    sample_threshold: int = 1000,
-    sample_ratio: int = 50,
-    update_snapshot: bool = False,
-) -> list[dict[str, str]]:
-    """Create chart of transaction amounts. transaction_list should be sorted by date."""
-    transaction_list = transaction_list.filter(account__currency=currency)
-
-    chart_dict = []
-    total = Decimal(0.0)
-
-    sampling = transaction_list.count() > sample_threshold
-    count = 0
-
-    prev_month: tuple[int | None, int | None] = (None, None)
 
-    for transaction in transaction_list:
-        count += 1
-        total += transaction.amount
-
-        if update_snapshot:
-            new_month = (transaction.date.year, transaction.date.month)
-            if new_month != prev_month:
-                prev_month = new_month
+def get_account_chart_series(
+    account: Account, max_points: int = ACCOUNT_CHART_POINTS
+) -> list[dict[str, str]]:
+    """
+    Balance chart of account with at most max_points points, cached until the next
+    write to the account. Transactions are bucketed by the finest of
+    ACCOUNT_CHART_RESOLUTIONS that fits, and the first, last, lowest and highest
+    balance of every bucket are kept so spikes survive downsampling.
+    """
+    key = ACCOUNT_CHART_CACHE_KEY.format(account_id=account.pk)
+    series = cache.get(key)
+    if series is None:
+        series = _build_account_chart_series(account, max_points)
+        cache.set(key, series, timeout=None)
+    return series
+
+
+def invalidate_account_chart(account_id: int) -> None:
+    cache.delete(ACCOUNT_CHART_CACHE_KEY.format(account_id=account_id))
+
+
+def _build_account_chart_series(
+    account: Account, max_points: int
+) -> list[dict[str, str]]:
+    transaction_list = Transaction.objects.filter(
+        account=account, balance__isnull=False
+    )
+
+    first, last = account.first_transaction, account.last_transaction
+    if first is None or last is None:
+        date_range = transaction_list.aggregate(Min("date"), Max("date"))
+        first, last = date_range["date__min"], date_range["date__max"]
+        if first is None:
+            return []
+
+    # Each bucket contributes up to four points, partial buckets at both ends
+    # count as whole ones
+    max_buckets = max(max_points // 4, 1)
+    span = (last - first).days
+    kind = ACCOUNT_CHART_RESOLUTIONS[-1][0]
+    for resolution, days in ACCOUNT_CHART_RESOLUTIONS:
+        if span // days + 2 <= max_buckets:
+            kind = resolution
+            break
 
-        if not sampling or count % sample_ratio == 0:
-            chart_dict.append(
-                {
-                    "x": transaction.date.strftime("%Y-%m-%d"),
-                    "y": str(transaction.balance) if not recalculate else str(total),
-                }
-            )
+    bucket = Trunc("date", kind)
+    running_order = [F("date").asc(), F("amount").desc(), F("id").asc()]
+    reversed_order = [F("date").desc(), F("amount").asc(), F("id").desc()]
+    rows = (
+        transaction_list.annotate(
+            first_rank=Window(
+                RowNumber(), partition_by=[bucket], order_by=running_order
+            ),
+            last_rank=Window(
+                RowNumber(), partition_by=[bucket], order_by=reversed_order
+            ),
+            low_rank=Window(
+                RowNumber(),
+                partition_by=[bucket],
+                order_by=[F("balance").asc(), F("id").asc()],
+            ),
+            high_rank=Window(
+                RowNumber(),
+                partition_by=[bucket],
+                order_by=[F("balance").desc(), F("id").asc()],
+            ),
+        )
+        .filter(Q(first_rank=1) | Q(last_rank=1) | Q(low_rank=1) | Q(high_rank=1))
+        .order_by(*running_order)
+        .values_list("date", "balance")
+    )
 
-    if reverse:
-        chart_dict.reverse()
-    return chart_dict
+    return [
+        {"x": transaction_date.strftime("%Y-%m-%d"), "y": str(balance)}
+        for transaction_date, balance in rows
+    ]
 
 
 def snapshot_chart(
@@ -66,16 +115,13 @@ def snapshot_chart(
 
 
 def convert_snapshot_to_chart_data(
-    snapshot: list[Any], stock_set: set[str]
+    snapshot: list[Any], stock_list: list[str]
 ) -> tuple[list[str], str]:
-    from collections import defaultdict
-
     converted_data: defaultdict[str, list[str]] = defaultdict(list)  # Stock: Amount
-    stock_list = list(stock_set)
 
     labels = []
-    for date, stock_map in snapshot:  # Date: (Stock: Amount)
-        labels.append(date.strftime("%Y-%m-%d"))
+    for date, stock_map in snapshot:  # Date (YYYY-mm-dd): (Stock: Amount)
+        labels.append(date)
         for stock in stock_list:
             if stock in stock_map:
                 converted_data[stock].append(stock_map[stock])
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import uuid
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Model, QuerySet
+
+COUNT_CACHE_KEY = "money:count:{label}:{version}:{digest}"
+COUNT_VERSION_KEY = "money:count_version:{label}"
+COUNT_TIMEOUT = 60 * 60
+
+
+def _count_version(label: str) -> str:
+    key = COUNT_VERSION_KEY.format(label=label)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(key, version, timeout=None)
+    return version
+
+
+def get_cached_count(query_set: QuerySet) -> int:
+    """
+    COUNT(*) of query_set, cached per SQL until invalidate_counts is called for
+    its model.
+    """
+    label = query_set.model._meta.label_lower
+    digest = hashlib.sha256(str(query_set.order_by().query).encode()).hexdigest()
+    key = COUNT_CACHE_KEY.format(
+        label=label, version=_count_version(label), digest=digest
+    )
+    count = cache.get(key)
+    if count is None:
+        count = query_set.count()
+        cache.set(key, count, timeout=COUNT_TIMEOUT)
+    return count
+
+
+def get_estimated_count(query_set: QuerySet) -> int:
+    """Row count of query_set estimated by the query planner, without scanning."""
+    sql, params = query_set.order_by().query.sql_with_params()
+    with connections[query_set.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+def invalidate_counts(model: type[Model]) -> None:
+    """Drop every cached count of model, by moving on to a new version."""
+    cache.delete(COUNT_VERSION_KEY.format(label=model._meta.label_lower))
@@ -1,7 +1,7 @@
 import datetime
 from decimal import Decimal
 
-from django.db.models import Max, Q, Sum
+from django.db.models import Sum
 
 from money.choices import AccountType, CurrencyType, RetailerType
 from money.models.shoppings import Retailer
@@ -31,34 +31,20 @@ def get_transaction_summary(account_list):
         days=1
     )
 
-    prev_transaction_list_per_account = (
+    # Balance at the end of the last transaction date of each account until
+    # last month, in one query using DISTINCT ON (account)
+    prev_balance_per_account = (
         Transaction.objects.filter(
-            Q(
-                date__month__lte=last_prev_month_day.month,
-                date__year=last_prev_month_day.year,
-            )
-            | Q(date__year__lt=last_prev_month_day.year)
-        )
-        .filter(account__id__in=currency_map.keys())
-        .values("account")
-        .annotate(
-            last_date=Max("date"),
+            date__lte=last_prev_month_day, account__id__in=list(currency_map.keys())
         )
+        .order_by("account_id", "-date", "balance")
+        .distinct("account_id")
+        .values_list("account_id", "balance")
     )
 
-    for account in prev_transaction_list_per_account:
-        first_transaction = (
-            Transaction.objects.filter(account__id=account["account"])
-            .filter(date=account["last_date"])
-            .order_by("balance")
-            .first()
-        )
-
-        if first_transaction is not None:
-            balance = first_transaction.balance
-
-            if balance:
-                sum_dict[currency_map[account["account"]]]["prev"] += balance
+    for account_id, balance in prev_balance_per_account:
+        if balance:
+            sum_dict[currency_map[account_id]]["prev"] += balance
 
     sum_list = [(k, v) for k, v in sum_dict.items()]
     for _, v in sum_list:
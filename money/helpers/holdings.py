@@ -0,0 +1,79 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from money.models.accounts import Account, Bank
+from money.models.stocks import Stock, StockPosition
+
+BANK_HOLDINGS_CACHE_KEY = "money:bank_holdings:{bank_id}"
+
+
+@dataclass
+class Holding:
+    account: Account
+    stock: Stock
+    shares: Decimal
+    last_price: Decimal
+    value: Decimal
+
+
+# (account_id, stock_id, shares, last price, value) of a cached holding
+HoldingRow = tuple[int, int, Decimal, Decimal, Decimal]
+
+
+def get_bank_holdings(bank_id: int) -> list[Holding]:
+    """
+    Stocks held by the accounts of bank, read from the latest StockPosition of
+    every (account, stock). The numbers are cached until the next stock
+    transaction or price, the accounts and stocks are read on every call so
+    renamed, moved or deleted ones are never served from the cache.
+    """
+    key = BANK_HOLDINGS_CACHE_KEY.format(bank_id=bank_id)
+    rows: list[HoldingRow] | None = cache.get(key)
+    if rows is None:
+        rows = _build_bank_holdings(bank_id)
+        cache.set(key, rows, timeout=None)
+
+    accounts = Account.objects.filter(bank_id=bank_id).in_bulk({row[0] for row in rows})
+    stocks = Stock.objects.in_bulk({row[1] for row in rows})
+    holdings = [
+        Holding(
+            account=accounts[account_id],
+            stock=stocks[stock_id],
+            shares=shares,
+            last_price=last_price,
+            value=value,
+        )
+        for account_id, stock_id, shares, last_price, value in rows
+        if account_id in accounts and stock_id in stocks
+    ]
+    holdings.sort(key=lambda holding: (holding.account.name, holding.stock.name))
+    return holdings
+
+
+def invalidate_bank_holdings(account_ids: Iterable[int] | None = None) -> None:
+    """Drop cached holdings of the banks of account_ids, or of every bank."""
+    banks = Bank.objects.all()
+    if account_ids is not None:
+        banks = banks.filter(account__id__in=list(account_ids))
+    cache.delete_many(
+        [
+            BANK_HOLDINGS_CACHE_KEY.format(bank_id=bank_id)
+            for bank_id in banks.values_list("id", flat=True).distinct()
+        ]
+    )
+
+
+def _build_bank_holdings(bank_id: int) -> list[HoldingRow]:
+    return [
+        (account_id, stock_id, shares, price, market_value)
+        for account_id, stock_id, shares, price, market_value in (
+            StockPosition.objects.filter(account__bank_id=bank_id)
+            .order_by("account_id", "stock_id", "-date")
+            .distinct("account_id", "stock_id")
+            .values_list("account_id", "stock_id", "shares", "price", "market_value")
+        )
+        if shares != 0
+    ]
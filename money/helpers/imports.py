@@ -0,0 +1,183 @@
+import hashlib
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Any
+
+from django.db import transaction
+
+from money.choices import StatementFormat, TransactionCategory
+from money.helpers import ledger
+from money.models.transactions import Transaction
+
+IMPORT_BATCH_SIZE = 1000
+NHBANK_HOUSING_AMOUNT = Decimal(100000)
+
+# Fields of a parsed row, every one but date and amount is optional
+ImportRow = dict[str, Any]
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    duplicates: int = 0
+
+
+def _to_decimal(value: str) -> Decimal:
+    return Decimal(value.strip().replace(",", "") or 0)
+
+
+def _to_date(value: str) -> date:
+    return date.fromisoformat(value.strip().replace(".", "-")[:10])
+
+
+def _raw_fields(raw: dict[str, Any]) -> ImportRow:
+    """The bank row as the JSON note shown to people and as the raw column."""
+    return {
+        "note": json.dumps(raw, indent=2, sort_keys=True, ensure_ascii=False),
+        "raw": raw,
+    }
+
+
+def parse_kakao_bank(lines: Iterable[str]) -> Iterator[ImportRow]:
+    """카카오뱅크 입출금통장 TSV: 거래일시, 구분, 금액, 잔액, 메모, 거래처"""
+    for line in lines:
+        data = line.rstrip("\r\n").split("\t")
+        yield {
+            "date": _to_date(data[0]),
+            "amount": _to_decimal(data[2]),
+            **_raw_fields(
+                {
+                    "type": data[1],
+                    "retailer": data[5].strip(),
+                    "note": data[4],
+                    "balance": float(_to_decimal(data[3])),
+                }
+            ),
+        }
+
+
+def parse_kb_bank(lines: Iterable[str]) -> Iterator[ImportRow]:
+    """국민은행 TSV: 거래일시, 적요, 보낸분/받는분, 송금메모, 출금액, 입금액, 잔액"""
+    for line in lines:
+        data = line.rstrip("\r\n").split("\t")
+        withdraw = _to_decimal(data[4])
+        yield {
+            "date": _to_date(data[0]),
+            "amount": -withdraw if withdraw else _to_decimal(data[5]),
+            **_raw_fields(
+                {
+                    "type": data[1].strip().replace(" ", ""),
+                    "retailer": data[2].strip().replace(" ", ""),
+                    "note": "",
+                    "balance": float(_to_decimal(data[6])),
+                }
+            ),
+        }
+
+
+def parse_nhbank_housing(lines: Iterable[str]) -> Iterator[ImportRow]:
+    """농협 주택청약: 한 줄에 납입일 하나, 매번 같은 금액을 이체"""
+    for line in lines:
+        if line.strip():
+            yield {
+                "date": _to_date(line),
+                "amount": NHBANK_HOUSING_AMOUNT,
+                "is_internal": True,
+                "type": TransactionCategory.TRANSFER,
+            }
+
+
+PARSERS: dict[str, Callable[[Iterable[str]], Iterator[ImportRow]]] = {
+    StatementFormat.KAKAO_BANK: parse_kakao_bank,
+    StatementFormat.KB_BANK: parse_kb_bank,
+    StatementFormat.NHBANK_HOUSING: parse_nhbank_housing,
+}
+
+
+def detect_format(line: str) -> StatementFormat:
+    """Guess the statement format from the column count of its first line."""
+    columns = line.rstrip("\r\n").split("\t")
+    if len(columns) == 1:
+        _to_date(columns[0])
+        return StatementFormat.NHBANK_HOUSING
+    if len(columns) == 6:
+        return StatementFormat.KAKAO_BANK
+    if len(columns) == 7:
+        return StatementFormat.KB_BANK
+    raise ValueError(f"Unknown statement format with {len(columns)} columns")
+
+
+def fingerprint(account_id: int, row_date: date, amount: Decimal, note: str) -> str:
+    """Content hash of a ledger row, used to skip rows imported before."""
+    content = f"{account_id}|{row_date.isoformat()}|{amount:.2f}|{note}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def parse_rows(file_format: str, lines: Iterable[str]) -> Iterator[ImportRow]:
+    """Parse lines with the parser of file_format, naming the line of a bad row."""
+    try:
+        parser = PARSERS[file_format]
+    except KeyError as e:
+        raise ValueError(f"Unknown file format: {file_format}") from e
+
+    rows = parser(lines)
+    line_number = 0
+    while True:
+        line_number += 1
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except (IndexError, ValueError, InvalidOperation) as e:
+            raise ValueError(f"line {line_number}: {e}") from e
+        if not row["amount"].is_finite():
+            raise ValueError(f"line {line_number}: invalid amount {row['amount']}")
+        yield row
+
+
+def import_transactions(
+    account_id: int, rows: Iterable[ImportRow], batch_size: int = IMPORT_BATCH_SIZE
+) -> ImportResult:
+    """
+    Create Transaction rows of account in bulk, skipping rows whose fingerprint
+    is already in the ledger or earlier in rows. The balances of the account are
+    then updated once from the earliest new date. Nothing is written if a row
+    fails.
+    """
+    result = ImportResult()
+    created_dates: set[date] = set()
+    seen: set[str] = set()
+
+    rows = iter(rows)
+    with transaction.atomic():
+        while batch := list(islice(rows, batch_size)):
+            result.rows += len(batch)
+            new_transactions = {}
+            for row in batch:
+                key = fingerprint(
+                    account_id, row["date"], row["amount"], row.get("note") or ""
+                )
+                if key in seen:
+                    continue
+                seen.add(key)
+                new_transactions[key] = Transaction(
+                    account_id=account_id, import_fingerprint=key, **row
+                )
+
+            for key in Transaction.objects.filter(
+                account_id=account_id, import_fingerprint__in=list(new_transactions)
+            ).values_list("import_fingerprint", flat=True):
+                new_transactions.pop(key, None)
+
+            result.duplicates += len(batch) - len(new_transactions)
+            created = Transaction.objects.bulk_create(new_transactions.values())
+            result.created += len(created)
+            created_dates.update(row.date for row in created)
+
+        ledger.transactions_changed((account_id, day) for day in created_dates)
+    return result
@@ -0,0 +1,71 @@
+import datetime
+from collections import defaultdict
+from collections.abc import Iterable
+
+from money.helpers.balance import update_balance_since
+from money.helpers.counts import invalidate_counts
+from money.helpers.month_end import invalidate_month_end_balances
+from money.helpers.monthly import invalidate_month_range
+from money.helpers.rollups import MonthBucket, month_of, refresh_monthly_summary
+from money.helpers.snapshots import mark_snapshot_dirty
+from money.models.accounts import Account
+from money.models.transactions import Transaction
+
+# (account id, date) of a transaction before or after a write
+LedgerChange = tuple[int | None, datetime.date | None]
+
+
+def transactions_changed(
+    changes: Iterable[LedgerChange],
+    previous_currencies: dict[int, str] | None = None,
+) -> None:
+    """
+    Update data derived from transactions after transactions were created, edited
+    or deleted. Every account is recomputed once, from its earliest changed date,
+    and only the touched months of the monthly summary are rebuilt.
+    previous_currencies maps accounts deleted or moved to another currency to the
+    currency their transactions were rolled up in, which is rebuilt as well.
+    """
+    earliest: dict[int, datetime.date] = {}
+    months: defaultdict[int, set[datetime.date]] = defaultdict(set)
+    dates: set[datetime.date] = set()
+    for account_id, date in changes:
+        if account_id is None or date is None:
+            continue
+        dates.add(date)
+        if account_id not in earliest or date < earliest[account_id]:
+            earliest[account_id] = date
+        months[account_id].add(month_of(date))
+
+    earliest_per_currency: dict[str, datetime.date] = {}
+    buckets: set[MonthBucket] = set()
+
+    def currency_changed(account_id: int, currency: str) -> None:
+        since = earliest[account_id]
+        buckets.update((month, currency) for month in months[account_id])
+        currency_date = earliest_per_currency.get(currency)
+        if currency_date is None or since < currency_date:
+            earliest_per_currency[currency] = since
+
+    for account in Account.objects.filter(pk__in=earliest.keys()):
+        update_balance_since(account, earliest[account.pk])
+        currency_changed(account.pk, account.currency)
+
+    previous_currencies = {
+        account_id: currency
+        for account_id, currency in (previous_currencies or {}).items()
+        if account_id in earliest
+    }
+    for account_id, currency in previous_currencies.items():
+        currency_changed(account_id, currency)
+    if previous_currencies:
+        # Deleted accounts have no balances left to update, which drops these
+        invalidate_month_end_balances(min(dates).year, max(dates).year)
+
+    for currency, since in earliest_per_currency.items():
+        mark_snapshot_dirty(currency, since)
+
+    refresh_monthly_summary(buckets)
+    invalidate_month_range(dates)
+    if dates:
+        invalidate_counts(Transaction)
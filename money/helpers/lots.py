@@ -0,0 +1,260 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from itertools import chain
+
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from money.choices import CostBasisMethod
+from money.models.accounts import Account
+from money.models.stocks import (
+    RealizedGain,
+    Stock,
+    StockLot,
+    StockPosition,
+    StockTransaction,
+)
+
+LOT_BATCH_SIZE = 2000
+SHARE_PLACES = Decimal("0.0001")
+
+
+@dataclass
+class StockProfit:
+    account: Account
+    stock: Stock
+    year: int | None
+    shares: Decimal
+    cost_basis: Decimal
+    market_value: Decimal
+    realized_gain: Decimal
+    unrealized_gain: Decimal
+
+
+def rebuild_lots() -> None:
+    """Rebuild StockLot and RealizedGain of every (account, stock)."""
+    StockLot.objects.all().delete()
+    RealizedGain.objects.all().delete()
+    pairs = (
+        StockTransaction.objects.values_list("account_id", "stock_id")
+        .order_by()
+        .distinct()
+    )
+    for account_id, stock_id in pairs:
+        refresh_lots(account_id, stock_id, None)
+
+
+def refresh_lots(account_id: int, stock_id: int, since: date | None) -> None:
+    """
+    Replay the trades of (account, stock) on or after since for every cost basis
+    method, continuing from the lots left open by the trades before it.
+    """
+    trades = list(
+        StockTransaction.objects.filter(account_id=account_id, stock_id=stock_id)
+        .filter(**({} if since is None else {"date__gte": since}))
+        .order_by("date", "id")
+        .values_list("id", "date", "shares", "price")
+    )
+    for method in CostBasisMethod:
+        _refresh_method_lots(account_id, stock_id, method, since, trades)
+
+
+def _refresh_method_lots(
+    account_id: int,
+    stock_id: int,
+    method: CostBasisMethod,
+    since: date | None,
+    trades: list[tuple[int, date, Decimal, Decimal]],
+) -> None:
+    key = {"account_id": account_id, "stock_id": stock_id, "method": method}
+    lots = StockLot.objects.filter(**key)
+    gains = RealizedGain.objects.filter(**key)
+
+    old_lots: list[StockLot] = []
+    if since is None:
+        gains.delete()
+        lots.delete()
+    else:
+        gains.filter(date__gte=since).delete()
+        lots.filter(date__gte=since).delete()
+        # Only sales before since are left, so this is the state at since
+        old_lots = list(
+            lots.annotate(
+                closed=Coalesce(
+                    Sum("realizedgain__shares"),
+                    Decimal(0),
+                    output_field=DecimalField(),
+                )
+            ).order_by("date", "id")
+        )
+        for lot in old_lots:
+            lot.remaining = lot.shares - lot.closed
+    open_lots = [lot for lot in old_lots if lot.remaining > 0]
+
+    new_lots: list[StockLot] = []
+    new_gains: list[RealizedGain] = []
+    for trade_id, trade_date, shares, price in trades:
+        if shares > 0:
+            lot = StockLot(
+                **key,
+                date=trade_date,
+                trade_id=trade_id,
+                shares=shares,
+                price=price,
+                remaining=shares,
+            )
+            open_lots.append(lot)
+            new_lots.append(lot)
+            continue
+        if shares == 0:
+            continue
+
+        for lot, closed_shares, cost in _close_lots(open_lots, -shares, method):
+            proceeds = round(closed_shares * price, 2)
+            if lot is None:
+                cost = proceeds
+            new_gains.append(
+                RealizedGain(
+                    **key,
+                    date=trade_date,
+                    trade_id=trade_id,
+                    lot=lot,
+                    shares=closed_shares,
+                    proceeds=proceeds,
+                    cost=cost,
+                    gain=proceeds - cost,
+                )
+            )
+        open_lots = [lot for lot in open_lots if lot.remaining > 0]
+
+    StockLot.objects.bulk_update(old_lots, ["remaining"], batch_size=LOT_BATCH_SIZE)
+    # Created after the replay so remaining is final and gains can refer to them
+    StockLot.objects.bulk_create(new_lots, batch_size=LOT_BATCH_SIZE)
+    RealizedGain.objects.bulk_create(new_gains, batch_size=LOT_BATCH_SIZE)
+
+
+def _close_lots(
+    open_lots: list[StockLot], shares: Decimal, method: CostBasisMethod
+) -> list[tuple[StockLot | None, Decimal, Decimal]]:
+    """
+    Take shares out of open_lots and return (lot, shares, cost) per lot closed.
+    Shares beyond the open lots are returned with no lot.
+    """
+    closed: list[tuple[StockLot | None, Decimal, Decimal]] = []
+    held = sum((lot.remaining for lot in open_lots), Decimal(0))
+    taken = min(shares, held)
+
+    if method == CostBasisMethod.FIFO:
+        left = taken
+        for lot in open_lots:
+            if left <= 0:
+                break
+            part = min(lot.remaining, left)
+            lot.remaining -= part
+            left -= part
+            closed.append((lot, part, round(part * lot.price, 2)))
+    elif taken > 0:
+        average = sum(lot.remaining * lot.price for lot in open_lots) / held
+        left = taken
+        for index, lot in enumerate(open_lots):
+            if index == len(open_lots) - 1:
+                part = left
+            else:
+                part = (lot.remaining * taken / held).quantize(SHARE_PLACES)
+            part = min(part, lot.remaining)
+            lot.remaining -= part
+            left -= part
+            closed.append((lot, part, round(part * average, 2)))
+
+    if shares > taken:
+        closed.append((None, shares - taken, Decimal(0)))
+    return closed
+
+
+def get_stock_profits(
+    method: CostBasisMethod = CostBasisMethod.FIFO, year: int | None = None
+) -> list[StockProfit]:
+    """
+    Realized gain of every (account, stock) in year, or over all years, and the
+    unrealized gain of the shares still held at the end of it, marked to the
+    latest position price.
+    """
+    end = timezone.localdate()
+    gains = RealizedGain.objects.filter(method=method, date__lte=end)
+    if year is not None:
+        end = min(end, date(year, 12, 31))
+        gains = gains.filter(date__gte=date(year, 1, 1), date__lte=end)
+
+    realized = {
+        (row["account_id"], row["stock_id"]): row["gain__sum"]
+        for row in gains.values("account_id", "stock_id")
+        .annotate(Sum("gain"))
+        .order_by()
+    }
+
+    # Lots held now, plus the shares of them sold after end
+    held_now = (
+        StockLot.objects.filter(method=method, date__lte=end, remaining__gt=0)
+        .values("account_id", "stock_id")
+        .annotate(
+            held_shares=Sum("remaining"),
+            held_cost=Sum(
+                ExpressionWrapper(
+                    F("remaining") * F("price"), output_field=DecimalField()
+                )
+            ),
+        )
+        .order_by()
+    )
+    sold_after = (
+        RealizedGain.objects.filter(method=method, date__gt=end, lot__date__lte=end)
+        .values("account_id", "stock_id")
+        .annotate(
+            held_shares=Sum("shares"),
+            held_cost=Sum(
+                ExpressionWrapper(
+                    F("shares") * F("lot__price"), output_field=DecimalField()
+                )
+            ),
+        )
+        .order_by()
+    )
+    held: dict[tuple[int, int], tuple[Decimal, Decimal]] = {}
+    for row in chain(held_now, sold_after):
+        key = (row["account_id"], row["stock_id"])
+        shares, cost = held.get(key, (Decimal(0), Decimal(0)))
+        held[key] = (shares + row["held_shares"], cost + row["held_cost"])
+
+    prices = {
+        (account_id, stock_id): price
+        for account_id, stock_id, price in StockPosition.objects.filter(date__lte=end)
+        .order_by("account_id", "stock_id", "-date")
+        .distinct("account_id", "stock_id")
+        .values_list("account_id", "stock_id", "price")
+    }
+
+    keys = set(realized) | {key for key, (shares, _) in held.items() if shares}
+    accounts = Account.objects.in_bulk({account_id for account_id, _ in keys})
+    stocks = Stock.objects.in_bulk({stock_id for _, stock_id in keys})
+
+    profits = []
+    for account_id, stock_id in keys:
+        shares, cost = held.get((account_id, stock_id), (Decimal(0), Decimal(0)))
+        market_value = round(shares * prices.get((account_id, stock_id), 0), 2)
+        cost = round(cost, 2)
+        profits.append(
+            StockProfit(
+                account=accounts[account_id],
+                stock=stocks[stock_id],
+                year=year,
+                shares=shares,
+                cost_basis=cost,
+                market_value=market_value,
+                realized_gain=realized.get((account_id, stock_id), Decimal(0)),
+                unrealized_gain=market_value - cost,
+            )
+        )
+    profits.sort(key=lambda profit: (profit.account.name, profit.stock.name))
+    return profits
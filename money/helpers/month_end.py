@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models.functions import TruncMonth
+
+from money.models.accounts import Account
+from money.models.transactions import Transaction
+
+MONTH_END_CACHE_KEY = "money:month_end_balance:{year}"
+
+# account id -> [(month, closing balance, transaction id)] of one year
+MonthEndBalances = dict[int, list[tuple[int, Decimal | None, int]]]
+
+
+def get_month_end_balances(start: date, end: date) -> list[dict[str, Any]]:
+    """
+    Closing balance of every active account for each month between start and end,
+    read from the per year cache.
+    """
+    first_month = (start.year, start.month)
+    last_month = (end.year, end.month)
+
+    per_account: dict[int, list[dict[str, Any]]] = {}
+    for year in range(start.year, end.year + 1):
+        for account_id, balances in get_year_balances(year).items():
+            per_account.setdefault(account_id, []).extend(
+                {
+                    "year": year,
+                    "month": month,
+                    "balance": balance,
+                    "transaction_id": transaction_id,
+                }
+                for month, balance, transaction_id in balances
+                if first_month <= (year, month) <= last_month
+            )
+
+    return [
+        {
+            "account_id": account.id,
+            "account_name": account.name,
+            "balance": per_account.get(account.id, []),
+        }
+        for account in Account.objects.filter(is_active=True).order_by("id")
+    ]
+
+
+def get_year_balances(year: int) -> MonthEndBalances:
+    """
+    Balance of the last transaction of each (account, month) in year, from one
+    DISTINCT ON query. Last follows the running balance order of
+    money.helpers.balance: date, deposits first, then id.
+    """
+    key = MONTH_END_CACHE_KEY.format(year=year)
+    balances = cache.get(key)
+    if balances is None:
+        rows = (
+            Transaction.objects.filter(date__year=year)
+            .annotate(month=TruncMonth("date"))
+            .order_by("account_id", "month", "-date", "amount", "-id")
+            .distinct("account_id", "month")
+            .values_list("account_id", "month", "balance", "id")
+        )
+        balances = {}
+        for account_id, month, balance, transaction_id in rows:
+            balances.setdefault(account_id, []).append(
+                (month.month, balance, transaction_id)
+            )
+        cache.set(key, balances, timeout=None)
+    return balances
+
+
+def invalidate_month_end_balances(first_year: int, last_year: int) -> None:
+    """Drop cached balances of years whose closing balances may have changed."""
+    cache.delete_many(
+        [
+            MONTH_END_CACHE_KEY.format(year=year)
+            for year in range(first_year, last_year + 1)
+        ]
+    )
@@ -1,12 +1,17 @@
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import date
 from typing import Any
 
 from dateutil.rrule import MONTHLY, rrule
-from django.db.models import Sum
-from django.db.models.functions import TruncMonth
+from django.core.cache import cache
+from django.db.models import F, Max, Min, Sum
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 
+from money.models.transactions import Transaction
+
+MONTH_RANGE_CACHE_KEY = "money:transaction_month_range"
+
 
 def filter_month(request: HttpRequest, query_set: QuerySet) -> QuerySet:
     # month should given as YYYY-mm
@@ -21,13 +26,21 @@ def filter_month(request: HttpRequest, query_set: QuerySet) -> QuerySet:
     return query_set
 
 
-def update_month_info(
-    request: HttpRequest,
-    context: dict[str, Any],
-    start_date: datetime,
-    end_date: datetime,
-) -> None:
-    # update context, selected month info and return query set
+def filter_summary_month(request: HttpRequest, query_set: QuerySet) -> QuerySet:
+    # same as filter_month, for TransactionMonthlySummary
+    selected_month = request.GET.get("month")
+
+    if selected_month:
+        selected_month_split = selected_month.split("-")
+
+        query_set = query_set.filter(
+            month__year=selected_month_split[0], month__month=selected_month_split[1]
+        )
+    return query_set
+
+
+def update_month_info(request: HttpRequest, context: dict[str, Any]) -> None:
+    # update context, selected month info and cached month list
     selected_month = request.GET.get("month")
 
     if selected_month:
@@ -40,32 +53,62 @@ def update_month_info(
 
         context["additional_get_query"]["month"] = selected_month
 
-    context["months"] = _get_month_list(start_date, end_date)
+    context["months"] = get_month_range()["months"]
+
+
+def get_month_range() -> dict[str, Any]:
+    """
+    First and last transaction date with the months in between, cached until a
+    transaction outside of the range is written.
+    """
+    month_range = cache.get(MONTH_RANGE_CACHE_KEY)
+    if month_range is None:
+        date_range = Transaction.objects.aggregate(Min("date"), Max("date"))
+        month_range = {
+            "start": date_range["date__min"],
+            "end": date_range["date__max"],
+            "months": _get_month_list(date_range["date__min"], date_range["date__max"]),
+        }
+        cache.set(MONTH_RANGE_CACHE_KEY, month_range, timeout=None)
+    return month_range
+
+
+def invalidate_month_range(dates: Iterable[date]) -> None:
+    """Drop the cached month range if any of dates falls outside of it."""
+    month_range = cache.get(MONTH_RANGE_CACHE_KEY)
+    if month_range is None:
+        return
+
+    start, end = month_range["start"], month_range["end"]
+    for transaction_date in dates:
+        if start is None or not start <= transaction_date <= end:
+            cache.delete(MONTH_RANGE_CACHE_KEY)
+            return
 
 
 def update_month_summary(
     request: HttpRequest, context: dict[str, Any], query_set: QuerySet
 ) -> None:
-    # get monthly summary of transactions if month is not specified
+    # get monthly summary from TransactionMonthlySummary if month is not specified
     selected_month = request.GET.get("month")
     if not selected_month:
         month_detail = (
-            query_set.annotate(month=TruncMonth("date"))
-            .values("month", "account__currency")
-            .annotate(total_amount=Sum("amount"))
+            query_set.values("month", account__currency=F("currency"))
+            .annotate(total_amount=Sum("total"))
             .order_by("month")
         )
 
         context["month_detail"] = month_detail
 
 
-def _get_month_list(start_date: datetime, end_date: datetime) -> list[tuple[str, str]]:
-    month_list = []
-    for dt in rrule(MONTHLY, dtstart=start_date, until=end_date):
-        month_list.append(
-            (
-                dt.strftime("%Y-%m"),
-                f"{dt.year}년 {dt.month}월",
-            )
-        )
+def _get_month_list(
+    start_date: date | None, end_date: date | None
+) -> dict[int, list[str]]:
+    # YYYY-mm months grouped by year, as shared/month_selector.html expects
+    month_list: dict[int, list[str]] = {}
+    if start_date is None or end_date is None:
+        return month_list
+
+    for dt in rrule(MONTHLY, dtstart=start_date.replace(day=1), until=end_date):
+        month_list.setdefault(dt.year, []).append(dt.strftime("%Y-%m"))
     return month_list
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+PERSISTED_QUERY_CACHE_KEY = "money:persisted_query:{sha256}"
+PERSISTED_QUERY_TIMEOUT = 60 * 60 * 24 * 30
+
+
+class PersistedQueryError(Exception):
+    """
+    Rejected persisted query. The message and code are sent as a GraphQL error,
+    which is what clients check before sending the full query again.
+    """
+
+    def __init__(self, message: str, code: str = "BAD_REQUEST", status: int = 400):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _read_allow_list(path: str, mtime: float) -> dict[str, str]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_allow_list() -> dict[str, str]:
+    """sha256 -> query of the allow-list, read again when the file changes."""
+    path = str(settings.GRAPHQL_PERSISTED_QUERIES_PATH)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return {}
+    return _read_allow_list(path, mtime)
+
+
+def resolve_query(query: str | None, persisted: Any) -> str | None:
+    """
+    Query text of a request carrying a persistedQuery extension. A hash alone is
+    looked up in the allow-list, then in the queries registered by earlier
+    requests, which send the hash with its query the first time. With
+    GRAPHQL_PERSISTED_QUERIES_ONLY only allow-listed queries are accepted.
+    """
+    only_allowed = settings.GRAPHQL_PERSISTED_QUERIES_ONLY
+    if persisted is None:
+        if (
+            only_allowed
+            and query is not None
+            and query_hash(query) not in (get_allow_list())
+        ):
+            raise PersistedQueryError(
+                "PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED"
+            )
+        return query
+
+    if not isinstance(persisted, dict):
+        raise PersistedQueryError("Invalid persistedQuery extension")
+    if persisted.get("version") != 1:
+        raise PersistedQueryError("Unsupported persisted query version")
+    sha256 = persisted.get("sha256Hash")
+    if not isinstance(sha256, str):
+        raise PersistedQueryError("Missing persisted query sha256Hash")
+
+    key = PERSISTED_QUERY_CACHE_KEY.format(sha256=sha256)
+    if query is not None:
+        if query_hash(query) != sha256:
+            raise PersistedQueryError("Provided sha256Hash does not match query")
+        if sha256 in get_allow_list():
+            return query
+        if only_allowed:
+            raise PersistedQueryError(
+                "PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED"
+            )
+        cache.set(key, query, timeout=PERSISTED_QUERY_TIMEOUT)
+        return query
+
+    query = get_allow_list().get(sha256)
+    if query is None and not only_allowed:
+        query = cache.get(key)
+    if query is None:
+        # A 200 like other servers, the client then registers the query
+        raise PersistedQueryError(
+            "PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND", status=200
+        )
+    return query
@@ -0,0 +1,231 @@
+import heapq
+from collections.abc import Iterable, Iterator
+from datetime import date
+from decimal import Decimal
+from itertools import groupby
+from typing import Any
+
+from money.choices import CurrencyType
+from money.helpers.holdings import invalidate_bank_holdings
+from money.helpers.lots import refresh_lots
+from money.models.stocks import StockPosition, StockPrice, StockTransaction
+
+POSITION_BATCH_SIZE = 2000
+
+# (account id, stock id, date) of a stock transaction before or after a write
+StockChange = tuple[int | None, int | None, date | None]
+# (stock id, date) of a stock price before or after a write
+PriceChange = tuple[int | None, date | None]
+
+# Event kinds, trades of a date are applied before its closing price
+TRADE, PRICE = 0, 1
+
+
+def stock_transactions_changed(changes: Iterable[StockChange]) -> None:
+    """
+    Refresh positions and cost basis lots of every (account, stock) from its
+    earliest changed date.
+    """
+    earliest: dict[tuple[int, int], date] = {}
+    for account_id, stock_id, changed_date in changes:
+        if account_id is None or stock_id is None or changed_date is None:
+            continue
+        key = (account_id, stock_id)
+        if key not in earliest or changed_date < earliest[key]:
+            earliest[key] = changed_date
+
+    for (account_id, stock_id), since in earliest.items():
+        refresh_positions(account_id, stock_id, since)
+        refresh_lots(account_id, stock_id, since)
+    if earliest:
+        invalidate_bank_holdings({account_id for account_id, _ in earliest})
+
+
+def stock_prices_changed(changes: Iterable[PriceChange]) -> None:
+    """Refresh positions of every account trading a stock whose price was written."""
+    earliest: dict[int, date] = {}
+    for stock_id, changed_date in changes:
+        if stock_id is None or changed_date is None:
+            continue
+        if stock_id not in earliest or changed_date < earliest[stock_id]:
+            earliest[stock_id] = changed_date
+
+    holders = (
+        StockTransaction.objects.filter(stock_id__in=earliest.keys())
+        .values_list("account_id", "stock_id")
+        .order_by()
+        .distinct()
+    )
+    account_ids = set()
+    for account_id, stock_id in holders:
+        refresh_positions(account_id, stock_id, earliest[stock_id])
+        account_ids.add(account_id)
+    if account_ids:
+        invalidate_bank_holdings(account_ids)
+
+
+def rebuild_positions() -> None:
+    """Rebuild StockPosition of every (account, stock) from the first trade."""
+    StockPosition.objects.all().delete()
+    pairs = (
+        StockTransaction.objects.values_list("account_id", "stock_id")
+        .order_by()
+        .distinct()
+    )
+    for account_id, stock_id in pairs:
+        refresh_positions(account_id, stock_id, None)
+    invalidate_bank_holdings()
+
+
+def refresh_positions(account_id: int, stock_id: int, since: date | None) -> None:
+    """
+    Recompute StockPosition of (account, stock) on or after since, continuing from
+    the last position before it.
+    """
+    positions = StockPosition.objects.filter(account_id=account_id, stock_id=stock_id)
+    trades = StockTransaction.objects.filter(account_id=account_id, stock_id=stock_id)
+
+    shares, price = Decimal(0), Decimal(0)
+    if since is None:
+        positions.delete()
+        # Prices before the first trade never produce a position
+        since = trades.order_by("date").values_list("date", flat=True).first()
+        if since is None:
+            return
+    else:
+        prev = (
+            positions.filter(date__lt=since)
+            .order_by("-date")
+            .values_list("shares", "price")
+            .first()
+        )
+        if prev is not None:
+            shares, price = prev
+        positions.filter(date__gte=since).delete()
+
+    trade_rows = (
+        trades.filter(date__gte=since)
+        .order_by("date", "id")
+        .values_list("date", "shares", "price")
+        .iterator(chunk_size=POSITION_BATCH_SIZE)
+    )
+    price_rows = (
+        StockPrice.objects.filter(stock_id=stock_id, date__gte=since)
+        .order_by("date")
+        .values_list("date", "price")
+        .iterator(chunk_size=POSITION_BATCH_SIZE)
+    )
+    events = heapq.merge(
+        ((row[0], TRADE, row[1], row[2]) for row in trade_rows),
+        ((row[0], PRICE, None, row[1]) for row in price_rows),
+        key=lambda event: event[:2],
+    )
+
+    new_positions = []
+    for event_date, day_events in groupby(events, key=lambda event: event[0]):
+        traded = False
+        for _, kind, traded_shares, event_price in day_events:
+            if kind == TRADE:
+                shares += traded_shares
+                traded = True
+            price = event_price
+
+        if abs(shares) < Decimal("0.0001"):
+            shares = Decimal(0)
+        # Keep the closing row of a position so readers can drop it
+        if shares == 0 and not traded:
+            continue
+
+        new_positions.append(
+            StockPosition(
+                date=event_date,
+                account_id=account_id,
+                stock_id=stock_id,
+                shares=shares,
+                price=price,
+                market_value=round(shares * price, 2),
+            )
+        )
+    StockPosition.objects.bulk_create(new_positions, batch_size=POSITION_BATCH_SIZE)
+
+
+def get_position_history(
+    currency: str = CurrencyType.USD,
+    start: date | None = None,
+    end: date | None = None,
+) -> Iterator[tuple[date, dict[str, tuple[Decimal, Decimal, Decimal]]]]:
+    """
+    Yield (date, {stock name: (shares, price, market value)}) for every date with
+    a position change between start and end, summed over accounts of currency.
+    """
+    positions = StockPosition.objects.filter(account__currency=currency)
+
+    # (account id, stock id) -> (stock name, shares, price, market value)
+    holdings: dict[tuple[int, int], tuple[str, Decimal, Decimal, Decimal]] = {}
+    if start is not None:
+        opening = (
+            positions.filter(date__lt=start)
+            .order_by("account_id", "stock_id", "-date")
+            .distinct("account_id", "stock_id")
+            .values_list(
+                "account_id",
+                "stock_id",
+                "stock__name",
+                "shares",
+                "price",
+                "market_value",
+            )
+        )
+        for account_id, stock_id, *position in opening:
+            if position[1] != 0:
+                holdings[(account_id, stock_id)] = tuple(position)
+        positions = positions.filter(date__gte=start)
+    if end is not None:
+        positions = positions.filter(date__lte=end)
+
+    rows = (
+        positions.order_by("date")
+        .values_list(
+            "date",
+            "account_id",
+            "stock_id",
+            "stock__name",
+            "shares",
+            "price",
+            "market_value",
+        )
+        .iterator(chunk_size=POSITION_BATCH_SIZE)
+    )
+    for position_date, day_rows in groupby(rows, key=lambda row: row[0]):
+        for _, account_id, stock_id, *position in day_rows:
+            if position[1] == 0:
+                holdings.pop((account_id, stock_id), None)
+            else:
+                holdings[(account_id, stock_id)] = tuple(position)
+
+        per_stock: dict[str, tuple[Decimal, Decimal, Decimal]] = {}
+        for name, shares, price, value in holdings.values():
+            held_shares, _, held_value = per_stock.get(
+                name, (Decimal(0), price, Decimal(0))
+            )
+            per_stock[name] = (held_shares + shares, price, held_value + value)
+        yield position_date, per_stock
+
+
+def get_stock_snapshot(
+    start: date | None = None, end: date | None = None
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """USD stock holdings per date, read from StockPosition."""
+    stock_transaction_data = []
+    stock_name_set: set[str] = set()
+    for position_date, per_stock in get_position_history(CurrencyType.USD, start, end):
+        stock_name_set.update(per_stock.keys())
+        stock_transaction_data.append(
+            {
+                "date": position_date.strftime("%Y-%m-%d"),
+                "balance": {name: row[0] for name, row in per_stock.items()},
+                "price": {name: row[1] for name, row in per_stock.items()},
+                "total": round(sum(row[2] for row in per_stock.values()), 2),
+            }
+        )
+    return stock_transaction_data, sorted(stock_name_set)
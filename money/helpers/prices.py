@@ -0,0 +1,103 @@
+import csv
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+
+from money.helpers import positions
+from money.models.stocks import Stock, StockPrice
+
+PRICE_BATCH_SIZE = 5000
+PRICE_COLUMNS = ("ticker", "date", "price")
+
+
+@dataclass
+class PriceLoadResult:
+    rows: int = 0
+    created: int = 0
+    unknown_tickers: set[str] = field(default_factory=set)
+
+
+def read_price_file(path: str | Path) -> Iterator[dict[str, str]]:
+    """
+    Stream rows with ticker, date (YYYY-mm-dd) and price columns from a CSV or
+    Parquet file. Parquet needs the optional pyarrow package.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq  # see requirements/optional.txt
+        except ImportError as e:
+            raise ValueError("Reading parquet files requires pyarrow") from e
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(
+            batch_size=PRICE_BATCH_SIZE, columns=list(PRICE_COLUMNS)
+        ):
+            for row in batch.to_pylist():
+                yield {key: str(value) for key, value in row.items()}
+        return
+
+    with path.open(newline="") as f:
+        reader = csv.DictReader(f)
+        missing = set(PRICE_COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{path.name} is missing columns: {sorted(missing)}")
+        yield from reader
+
+
+def _insert_prices(prices: dict[tuple[int, date], StockPrice]) -> int:
+    """
+    Bulk create prices of (stock_id, date) pairs not stored yet, returning how
+    many were new since bulk_create with ignore_conflicts does not tell.
+    """
+    if not prices:
+        return 0
+    existing = set(
+        StockPrice.objects.filter(
+            stock_id__in={stock_id for stock_id, _ in prices},
+            date__in={price_date for _, price_date in prices},
+        ).values_list("stock_id", "date")
+    )
+    StockPrice.objects.bulk_create(
+        prices.values(), ignore_conflicts=True, batch_size=PRICE_BATCH_SIZE
+    )
+    return len(prices.keys() - existing)
+
+
+def load_prices(rows: Iterable[dict[str, str]]) -> PriceLoadResult:
+    """
+    Insert StockPrice rows in batches, skipping (stock, date) pairs that already
+    exist, then refresh the positions of the loaded stocks once.
+    """
+    stock_map = dict(
+        Stock.objects.exclude(ticker=None).values_list("ticker", "id").order_by()
+    )
+    result = PriceLoadResult()
+    earliest: dict[int, date] = {}
+
+    rows = iter(rows)
+    while batch := list(islice(rows, PRICE_BATCH_SIZE)):
+        prices: dict[tuple[int, date], StockPrice] = {}
+        for row in batch:
+            result.rows += 1
+            stock_id = stock_map.get(row["ticker"])
+            if stock_id is None:
+                result.unknown_tickers.add(row["ticker"])
+                continue
+
+            price_date = date.fromisoformat(row["date"][:10])
+            prices.setdefault(
+                (stock_id, price_date),
+                StockPrice(
+                    stock_id=stock_id, date=price_date, price=Decimal(row["price"])
+                ),
+            )
+            if stock_id not in earliest or price_date < earliest[stock_id]:
+                earliest[stock_id] = price_date
+        result.created += _insert_prices(prices)
+
+    positions.stock_prices_changed(earliest.items())
+    return result
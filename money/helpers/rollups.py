@@ -0,0 +1,86 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from money.models.transactions import Transaction, TransactionMonthlySummary
+
+ROLLUP_BATCH_SIZE = 2000
+
+# (first day of month, currency) of a TransactionMonthlySummary row
+MonthBucket = tuple[date, str]
+
+
+def month_of(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def rebuild_monthly_summary() -> None:
+    """Rebuild TransactionMonthlySummary of every month from Transaction."""
+    TransactionMonthlySummary.objects.all().delete()
+    save_summaries(Transaction.objects.all())
+
+
+def refresh_monthly_summary(buckets: Iterable[MonthBucket]) -> None:
+    """Recompute TransactionMonthlySummary rows of the given (month, currency)."""
+    months_per_currency: defaultdict[str, set[date]] = defaultdict(set)
+    for month, currency in buckets:
+        months_per_currency[currency].add(month_of(month))
+    if not months_per_currency:
+        return
+
+    bucket_filter = Q()
+    for currency, months in months_per_currency.items():
+        bucket_filter |= Q(currency=currency, month__in=months)
+    TransactionMonthlySummary.objects.filter(bucket_filter).delete()
+
+    transaction_filter = Q()
+    for currency, months in months_per_currency.items():
+        for month in months:
+            transaction_filter |= Q(
+                account__currency=currency,
+                date__gte=month,
+                date__lt=next_month(month),
+            )
+    save_summaries(Transaction.objects.filter(transaction_filter))
+
+
+def save_summaries(query_set) -> None:
+    """Group query_set by rollup key and insert the rows."""
+    zero = Value(0, output_field=DecimalField(max_digits=15, decimal_places=2))
+    rows = (
+        query_set.annotate(month=TruncMonth("date"))
+        .values("month", "account__currency", "type", "retailer", "is_internal")
+        .annotate(
+            total=Sum("amount"),
+            plus_sum=Coalesce(Sum("amount", filter=Q(amount__gt=0)), zero),
+            minus_sum=Coalesce(Sum("amount", filter=Q(amount__lt=0)), zero),
+            count=Count("id"),
+        )
+        .order_by()
+    )
+    TransactionMonthlySummary.objects.bulk_create(
+        (
+            TransactionMonthlySummary(
+                month=row["month"],
+                currency=row["account__currency"],
+                type=row["type"],
+                retailer_id=row["retailer"],
+                is_internal=row["is_internal"],
+                total=row["total"],
+                plus_sum=row["plus_sum"],
+                minus_sum=row["minus_sum"],
+                count=row["count"],
+            )
+            for row in rows.iterator(chunk_size=ROLLUP_BATCH_SIZE)
+        ),
+        batch_size=ROLLUP_BATCH_SIZE,
+    )
@@ -1,119 +1,140 @@
 from collections import defaultdict
-from copy import copy
+from collections.abc import Iterable, Iterator
+from datetime import date
 from decimal import Decimal
 from typing import DefaultDict
 
 from money.choices import CurrencyType
-from money.models.accounts import AmountSnapshot
-from money.models.stocks import StockTransaction
+from money.models.accounts import AmountSnapshot, AmountSnapshotWatermark
 from money.models.transactions import Transaction
 
+SNAPSHOT_BATCH_SIZE = 2000
+
 
 def create_daily_snapshot() -> None:
-    currency_list = CurrencyType.choices
-    all_transaction_list = (
-        Transaction.objects.all().order_by("date").prefetch_related("account")
+    """
+    Refresh AmountSnapshot of every currency with a dirty date, starting from the
+    last clean snapshot instead of the first transaction.
+    """
+    for currency, dirty_date in claim_dirty_dates():
+        refresh_snapshot(currency, dirty_date)
+
+
+def rebuild_daily_snapshot() -> None:
+    """Rebuild AmountSnapshot of every date with transactions, per currency."""
+    for currency, _ in CurrencyType.choices:
+        rebuild_snapshot(currency)
+
+
+def claim_dirty_dates() -> list[tuple[str, date]]:
+    """
+    Return (currency, dirty date) pairs to refresh and clear them. Writes during
+    the refresh mark the currency dirty again.
+    """
+    dirty_dates = []
+    for watermark in AmountSnapshotWatermark.objects.all():
+        AmountSnapshotWatermark.objects.filter(
+            pk=watermark.pk, dirty_date=watermark.dirty_date
+        ).delete()
+        dirty_dates.append((watermark.currency, watermark.dirty_date))
+    return dirty_dates
+
+
+def rebuild_snapshot(currency: str) -> None:
+    """Rebuild AmountSnapshot of currency from the first transaction."""
+    AmountSnapshotWatermark.objects.filter(currency=currency).delete()
+    rows = (
+        Transaction.objects.filter(account__currency=currency)
+        .order_by("date")
+        .values_list("date", "amount", "account__name")
+        .iterator(chunk_size=SNAPSHOT_BATCH_SIZE)
     )
+    save_snapshots(build_snapshots(currency, rows))
 
-    for currency in currency_list:
-        transaction_list = all_transaction_list.filter(account__currency=currency[0])
-        if not transaction_list:
-            continue
 
-        prev_date = transaction_list[0].date
-        total_value = Decimal(0.0)
+def refresh_snapshot(currency: str, since: date) -> None:
+    """Recompute AmountSnapshot of currency on or after since."""
+    last_clean = (
+        AmountSnapshot.objects.filter(currency=currency, date__lt=since)
+        .order_by("-date")
+        .first()
+    )
+    total_value = last_clean.amount if last_clean else Decimal(0)
+    history = (
+        {k: Decimal(v) for k, v in last_clean.summary.items()}
+        if last_clean and last_clean.summary
+        else {}
+    )
 
-        history: DefaultDict[str, Decimal] = defaultdict(Decimal)
-        for transaction in transaction_list:
-            # Save previous date value
-            if prev_date != transaction.date:
-                create_snapshot(prev_date, currency[0], total_value, history)
-                prev_date = transaction.date
+    # Dates may have lost all of their transactions
+    AmountSnapshot.objects.filter(currency=currency, date__gte=since).delete()
 
-            account_id = transaction.account.name
-            account_value = history[account_id]
-            account_value = account_value + transaction.amount
+    rows = (
+        Transaction.objects.filter(account__currency=currency, date__gte=since)
+        .order_by("date")
+        .values_list("date", "amount", "account__name")
+        .iterator(chunk_size=SNAPSHOT_BATCH_SIZE)
+    )
+    save_snapshots(build_snapshots(currency, rows, total_value, history))
 
-            # Update value in the map
-            if account_value == 0.0:
-                del history[account_id]
-            else:
-                history[account_id] = account_value
-            total_value += transaction.amount
 
-        # Last value will not be added by the above loop
-        create_snapshot(prev_date, currency[0], total_value, history)
+def mark_snapshot_dirty(currency: str, dirty_date: date) -> None:
+    """Move the dirty date of currency back to dirty_date if it is earlier."""
+    watermark, created = AmountSnapshotWatermark.objects.get_or_create(
+        currency=currency, defaults={"dirty_date": dirty_date}
+    )
+    if not created and dirty_date < watermark.dirty_date:
+        AmountSnapshotWatermark.objects.filter(
+            pk=watermark.pk, dirty_date__gt=dirty_date
+        ).update(dirty_date=dirty_date)
+
+
+def build_snapshots(
+    currency: str,
+    rows: Iterable[tuple[date, Decimal, str]],
+    total_value: Decimal = Decimal(0),
+    history: dict[str, Decimal] | None = None,
+) -> Iterator[AmountSnapshot]:
+    """
+    Stream (date, amount, account name) rows sorted by date and yield one snapshot
+    at the end of each date. total_value and history are the state before rows.
+    """
+    account_values: DefaultDict[str, Decimal] = defaultdict(Decimal, history or {})
+
+    prev_date = None
+    for transaction_date, amount, account_name in rows:
+        # Save previous date value
+        if prev_date is not None and prev_date != transaction_date:
+            yield create_snapshot(prev_date, currency, total_value, account_values)
+        prev_date = transaction_date
+
+        account_value = account_values[account_name] + amount
+        if account_value == 0.0:
+            del account_values[account_name]
+        else:
+            account_values[account_name] = account_value
+        total_value += amount
+
+    # Last value will not be added by the above loop
+    if prev_date is not None:
+        yield create_snapshot(prev_date, currency, total_value, account_values)
 
 
 def create_snapshot(
-    date: str, currency: str, amount: Decimal, summary: DefaultDict[str, Decimal]
-) -> None:
+    snapshot_date: date, currency: str, amount: Decimal, summary: dict[str, Decimal]
+) -> AmountSnapshot:
     float_summary = {k: str(v) for k, v in summary.items()}
-    if AmountSnapshot.objects.filter(date=date, currency=currency):
-        snapshot = AmountSnapshot.objects.get(date=date, currency=currency)
-        snapshot.amount = amount
-        snapshot.summary = float_summary
-    else:
-        snapshot = AmountSnapshot(
-            date=date, currency=currency, amount=amount, summary=float_summary
-        )
-    snapshot.save()
-
-
-def get_stock_snapshot() -> tuple[list[dict], list[str]]:
-    transaction_list = (
-        StockTransaction.objects.filter(account__currency=CurrencyType.USD)
-        .order_by("date", "shares")
-        .prefetch_related("stock")
-    )
-    if not transaction_list:
-        return [], []
-
-    stock_transaction_data = []
-    stock_name_set = set()
-
-    total_balance: DefaultDict[str, Decimal] = defaultdict(Decimal)
-    price_info: DefaultDict[str, Decimal] = defaultdict(Decimal)
-    prev_date = transaction_list[0].date
-    for transaction in transaction_list:
-        stock_name_set.add(transaction.stock.name)
-
-        # append prev date data
-        if prev_date != transaction.date:
-            today_total = Decimal(0.0)
-            for stock_name, stock_amount in total_balance.items():
-                today_total += stock_amount * price_info[stock_name]
-
-            stock_transaction_data.append(
-                {
-                    "date": prev_date.strftime("%Y-%m-%d"),
-                    "balance": copy(total_balance),
-                    "price": copy(price_info),
-                    "total": round(today_total, 2),
-                }
-            )
-            prev_date = transaction.date
-
-        amount = total_balance[transaction.stock.name]
-        amount += transaction.shares
-        amount = round(amount, 5)
-        if amount == 0.0:
-            del total_balance[transaction.stock.name]
-            del price_info[transaction.stock.name]
-        else:
-            total_balance[transaction.stock.name] = amount
-            price_info[transaction.stock.name] = transaction.price
-
-    today_total = Decimal(0.0)
-    for stock_name, stock_amount in total_balance.items():
-        today_total += stock_amount * price_info[stock_name]
-    stock_transaction_data.append(
-        {
-            "date": prev_date.strftime("%Y-%m-%d"),
-            "balance": copy(total_balance),
-            "price": copy(price_info),
-            "total": round(today_total, 2),
-        }
+    return AmountSnapshot(
+        date=snapshot_date, currency=currency, amount=amount, summary=float_summary
     )
 
-    return stock_transaction_data, list(stock_name_set)
+
+def save_snapshots(snapshot_list: Iterable[AmountSnapshot]) -> None:
+    """Insert or overwrite snapshots keyed by (date, currency)."""
+    AmountSnapshot.objects.bulk_create(
+        snapshot_list,
+        batch_size=SNAPSHOT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["date", "currency"],
+        update_fields=["amount", "summary"],
+    )
@@ -0,0 +1,203 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+
+from money.choices import CurrencyType, TransactionCategory
+from money.models.exchanges import Exchange
+from money.models.transactions import Transaction
+
+# KRW per USD an exchange between a KRW and a USD account has to fall in
+EXCHANGE_RATIO_RANGE = (Decimal(1000), Decimal(1600))
+# Days a deposit may post after the withdrawal of the same transfer
+TRANSFER_DATE_WINDOW = 3
+
+
+@dataclass(frozen=True)
+class TransferCandidate:
+    id: int
+    date: date
+    amount: Decimal
+    account_id: int
+    currency: str
+
+
+@dataclass(frozen=True)
+class TransferMatch:
+    """A withdrawal and the deposit it paired with, with the rate of an exchange."""
+
+    source: TransferCandidate
+    target: TransferCandidate
+    ratio_per_krw: Decimal | None = None
+
+
+def exchange_ratio(source: TransferCandidate, target: TransferCandidate) -> Decimal:
+    """KRW per USD of an exchange between a KRW and a USD transaction."""
+    krw, usd = (
+        (source, target) if source.currency == CurrencyType.KRW else (target, source)
+    )
+    return round(abs(krw.amount) / abs(usd.amount), 2)
+
+
+def check_pair(
+    source: TransferCandidate, target: TransferCandidate
+) -> TransferMatch | None:
+    """
+    Pair two internal transactions if they can be the two sides of a transfer,
+    an opposite amount in another account, or an exchange on the same date.
+    """
+    if source.account_id == target.account_id or source.amount * target.amount >= 0:
+        return None
+    if source.amount > 0:
+        source, target = target, source
+
+    if source.currency == target.currency:
+        if abs(source.amount + target.amount) < Decimal("0.01"):
+            return TransferMatch(source, target)
+        return None
+
+    if source.date != target.date:
+        return None
+    ratio = exchange_ratio(source, target)
+    low, high = EXCHANGE_RATIO_RANGE
+    if low <= ratio <= high:
+        return TransferMatch(source, target, ratio)
+    return None
+
+
+def _candidates(query_set) -> list[TransferCandidate]:
+    return [
+        TransferCandidate(*row)
+        for row in query_set.order_by("date", "id").values_list(
+            "id", "date", "amount", "account_id", "account__currency"
+        )
+    ]
+
+
+def candidates_by_id(ids: Iterable[int]) -> list[TransferCandidate]:
+    """Internal transactions of ids without a related transaction."""
+    return _candidates(
+        Transaction.objects.filter(
+            id__in=list(ids), is_internal=True, related_transaction=None
+        )
+    )
+
+
+def load_candidates(
+    start: date | None = None, end: date | None = None
+) -> list[TransferCandidate]:
+    """Unreviewed internal transfers without a related transaction."""
+    query_set = Transaction.objects.filter(
+        reviewed=False,
+        is_internal=True,
+        type=TransactionCategory.TRANSFER,
+        related_transaction=None,
+    )
+    if start is not None:
+        query_set = query_set.filter(date__gte=start)
+    if end is not None:
+        query_set = query_set.filter(date__lte=end + timedelta(TRANSFER_DATE_WINDOW))
+    return _candidates(query_set)
+
+
+def match_transfers(
+    candidates: list[TransferCandidate], window: int = TRANSFER_DATE_WINDOW
+) -> list[TransferMatch]:
+    """
+    Pair every withdrawal with one deposit. Same currency deposits are looked up
+    by (abs amount, date) from the withdrawal date up to window days later, and
+    exchanges by the date and the ratio band. A withdrawal with more than one
+    equally good deposit is left for review.
+    """
+    deposits: defaultdict[tuple[Decimal, date], list[TransferCandidate]] = defaultdict(
+        list
+    )
+    deposits_by_date: defaultdict[date, list[TransferCandidate]] = defaultdict(list)
+    for candidate in candidates:
+        if candidate.amount > 0:
+            deposits[(candidate.amount, candidate.date)].append(candidate)
+            deposits_by_date[candidate.date].append(candidate)
+
+    used: set[int] = set()
+    matches = []
+    for source in candidates:
+        if source.amount >= 0:
+            continue
+
+        found: list[TransferMatch] = []
+        for days in range(window + 1):
+            key = (-source.amount, source.date + timedelta(days))
+            found = [
+                match
+                for target in deposits.get(key, [])
+                if target.id not in used
+                and target.currency == source.currency
+                and (match := check_pair(source, target)) is not None
+            ]
+            if found:
+                break
+        if not found:
+            found = [
+                match
+                for target in deposits_by_date.get(source.date, [])
+                if target.id not in used
+                and target.currency != source.currency
+                and (match := check_pair(source, target)) is not None
+            ]
+
+        if len(found) == 1:
+            matches.append(found[0])
+            used.add(found[0].target.id)
+    return matches
+
+
+def save_matches(matches: list[TransferMatch]) -> list[TransferMatch]:
+    """
+    Link both sides of every match and create the Exchange rows of the exchanges
+    in bulk. Matches with a transaction linked since they were made are skipped,
+    the saved ones are returned.
+    """
+    ids = [match.source.id for match in matches] + [
+        match.target.id for match in matches
+    ]
+    with transaction.atomic():
+        free = set(
+            Transaction.objects.select_for_update()
+            .filter(id__in=ids, related_transaction=None)
+            .values_list("id", flat=True)
+        )
+        matches = [
+            match
+            for match in matches
+            if match.source.id in free and match.target.id in free
+        ]
+
+        Transaction.objects.bulk_update(
+            [
+                Transaction(id=one.id, related_transaction_id=other.id)
+                for match in matches
+                for one, other in (
+                    (match.source, match.target),
+                    (match.target, match.source),
+                )
+            ],
+            ["related_transaction"],
+        )
+        Exchange.objects.bulk_create(
+            Exchange(
+                date=match.source.date,
+                from_transaction_id=match.source.id,
+                to_transaction_id=match.target.id,
+                from_amount=match.source.amount,
+                to_amount=match.target.amount,
+                from_currency=match.source.currency,
+                to_currency=match.target.currency,
+                ratio_per_krw=match.ratio_per_krw,
+            )
+            for match in matches
+            if match.ratio_per_krw is not None
+        )
+    return matches
@@ -0,0 +1,149 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Min
+from django.utils import timezone
+
+from money.models.accounts import Account
+from money.models.stocks import StockPosition, StockPrice
+
+# [(date, market value)] in date order
+ValueSeries = list[tuple[date, Decimal]]
+# Longer daily series are charted with one point per month
+PORTFOLIO_CHART_POINTS = 400
+
+# Positions and prices become intervals [valid_from, valid_to) with LEAD and are
+# expanded to one row per day, so the as-of join is a hash join on (stock, date)
+# instead of a subquery per (date, stock).
+PORTFOLIO_VALUE_SQL = """
+WITH positions AS (
+    SELECT
+        account_id,
+        stock_id,
+        shares,
+        price,
+        date AS valid_from,
+        LEAD(date, 1, 'infinity'::date) OVER (
+            PARTITION BY account_id, stock_id ORDER BY date
+        ) AS valid_to
+    FROM {position_table}
+    WHERE date <= %(end)s
+),
+prices AS (
+    SELECT
+        stock_id,
+        price,
+        date AS valid_from,
+        LEAD(date, 1, 'infinity'::date) OVER (
+            PARTITION BY stock_id ORDER BY date
+        ) AS valid_to
+    FROM {price_table}
+    WHERE date <= %(end)s AND stock_id IN (SELECT stock_id FROM positions)
+),
+daily_positions AS (
+    SELECT
+        account_id,
+        stock_id,
+        shares,
+        price,
+        valid_from,
+        generate_series(
+            GREATEST(valid_from, %(start)s::date),
+            LEAST(valid_to - 1, %(end)s::date),
+            '1 day'
+        )::date AS date
+    FROM positions
+    WHERE shares <> 0 AND valid_to > %(start)s
+),
+daily_prices AS (
+    SELECT
+        stock_id,
+        price,
+        valid_from,
+        generate_series(
+            GREATEST(valid_from, %(start)s::date),
+            LEAST(valid_to - 1, %(end)s::date),
+            '1 day'
+        )::date AS date
+    FROM prices
+    WHERE valid_to > %(start)s
+)
+SELECT
+    daily_positions.date,
+    daily_positions.account_id,
+    SUM(
+        daily_positions.shares * CASE
+            WHEN daily_prices.valid_from > daily_positions.valid_from
+                THEN daily_prices.price
+            ELSE daily_positions.price
+        END
+    ) AS market_value
+FROM daily_positions
+LEFT JOIN daily_prices
+    ON daily_prices.stock_id = daily_positions.stock_id
+    AND daily_prices.date = daily_positions.date
+GROUP BY daily_positions.date, daily_positions.account_id
+ORDER BY daily_positions.date, daily_positions.account_id
+"""
+
+
+def get_portfolio_values(
+    start: date | None = None, end: date | None = None
+) -> tuple[dict[int, ValueSeries], dict[str, ValueSeries]]:
+    """
+    Daily market value of the stocks held by every account between start and end,
+    marking each position to the latest StockPrice or trade price as of the date.
+    Returns ({account id: [(date, value)]}, {currency: [(date, value)]}).
+    """
+    if end is None:
+        end = timezone.localdate()
+    if start is None:
+        start = StockPosition.objects.aggregate(Min("date"))["date__min"]
+        if start is None:
+            return {}, {}
+
+    sql = PORTFOLIO_VALUE_SQL.format(
+        position_table=connection.ops.quote_name(StockPosition._meta.db_table),
+        price_table=connection.ops.quote_name(StockPrice._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"start": start, "end": end})
+        rows = cursor.fetchall()
+
+    currency_map = dict(
+        Account.objects.filter(
+            pk__in={account_id for _, account_id, _ in rows}
+        ).values_list("id", "currency")
+    )
+
+    per_account: defaultdict[int, ValueSeries] = defaultdict(list)
+    per_currency: defaultdict[str, dict[date, Decimal]] = defaultdict(dict)
+    for value_date, account_id, market_value in rows:
+        market_value = round(market_value, 2)
+        per_account[account_id].append((value_date, market_value))
+
+        currency_values = per_currency[currency_map[account_id]]
+        currency_values[value_date] = (
+            currency_values.get(value_date, Decimal(0)) + market_value
+        )
+
+    return dict(per_account), {
+        currency: list(values.items()) for currency, values in per_currency.items()
+    }
+
+
+def downsample_values(
+    series: ValueSeries, max_points: int = PORTFOLIO_CHART_POINTS
+) -> ValueSeries:
+    """
+    series as it is if it has at most max_points days, otherwise the last value
+    of every month, so a chart of the whole history stays bounded.
+    """
+    if len(series) <= max_points:
+        return series
+    month_ends: dict[date, tuple[date, Decimal]] = {}
+    for value_date, value in series:
+        month_ends[value_date.replace(day=1)] = (value_date, value)
+    return list(month_ends.values())
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from money.helpers.categorization import apply_rules
+from money.models.transactions import Transaction
+
+
+class Command(BaseCommand):
+    help = "Categorize unreviewed transactions with the active CategorizationRule rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", type=int, help="Only this account id")
+
+    def handle(self, *args, **options):
+        transactions = Transaction.objects.all()
+        if options["account"] is not None:
+            transactions = transactions.filter(account_id=options["account"])
+
+        changed = apply_rules(transactions)
+        self.stdout.write(self.style.SUCCESS(f"Categorized {changed} transactions"))
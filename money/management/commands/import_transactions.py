@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from money.helpers.imports import PARSERS, import_transactions, parse_rows
+from money.models.accounts import Account
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a bank statement into the ledger of an account. Rows imported "
+        "before are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("format", choices=sorted(PARSERS))
+        parser.add_argument("path", help="Statement file exported from the bank")
+        parser.add_argument("--account", type=int, required=True, help="Account id")
+
+    def handle(self, *args, **options):
+        if not Account.objects.filter(pk=options["account"]).exists():
+            raise CommandError(f"Account {options['account']} does not exist")
+
+        try:
+            with open(options["path"], encoding="utf-8") as f:
+                result = import_transactions(
+                    options["account"], parse_rows(options["format"], f)
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(f"{options['path']}: {e}") from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.created} of {result.rows} transactions created, "
+                f"{result.duplicates} duplicates skipped"
+            )
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from money.helpers.prices import load_prices, read_price_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Load StockPrice rows from CSV or Parquet files with ticker, date "
+        "(YYYY-mm-dd) and price columns. Existing (stock, date) prices are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="CSV or Parquet files")
+
+    def handle(self, *args, **options):
+        for path in options["paths"]:
+            try:
+                with transaction.atomic():
+                    result = load_prices(read_price_file(path))
+            except (OSError, KeyError, ValueError, ArithmeticError) as e:
+                raise CommandError(f"{path}: {e}") from e
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{path}: {result.created} of {result.rows} prices created"
+                )
+            )
+            if result.unknown_tickers:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Unknown tickers: {', '.join(sorted(result.unknown_tickers))}"
+                    )
+                )
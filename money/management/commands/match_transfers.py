@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from money.helpers.transfers import load_candidates, match_transfers, save_matches
+
+
+class Command(BaseCommand):
+    help = "Pair unreviewed internal transfers and exchanges between accounts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument(
+            "--commit", action="store_true", help="Save the pairs instead of listing"
+        )
+
+    def handle(self, *args, **options):
+        matches = match_transfers(load_candidates(options["start"], options["end"]))
+        if options["commit"]:
+            saved = save_matches(matches)
+            self.stdout.write(self.style.SUCCESS(f"Matched {len(saved)} transfers"))
+            return
+
+        for match in matches:
+            rate = "" if match.ratio_per_krw is None else f" @ {match.ratio_per_krw}"
+            self.stdout.write(
+                f"{match.source.date} #{match.source.id} {match.source.amount} "
+                f"-> {match.target.date} #{match.target.id} {match.target.amount}"
+                f"{rate}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Found {len(matches)} transfers"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from money.helpers.rollups import rebuild_monthly_summary
+from money.models.transactions import TransactionMonthlySummary
+
+
+class Command(BaseCommand):
+    help = "Rebuild TransactionMonthlySummary from every transaction"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_monthly_summary()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {TransactionMonthlySummary.objects.count()} monthly summaries"
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from money.helpers.lots import rebuild_lots
+from money.models.stocks import RealizedGain, StockLot
+
+
+class Command(BaseCommand):
+    help = "Rebuild StockLot and RealizedGain from every stock transaction"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_lots()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {StockLot.objects.count()} stock lots and "
+                f"{RealizedGain.objects.count()} realized gains"
+            )
+        )
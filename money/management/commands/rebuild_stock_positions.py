@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from money.helpers.positions import rebuild_positions
+from money.models.stocks import StockPosition
+
+
+class Command(BaseCommand):
+    help = "Rebuild StockPosition from every stock transaction and stock price"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_positions()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {StockPosition.objects.count()} stock positions"
+            )
+        )
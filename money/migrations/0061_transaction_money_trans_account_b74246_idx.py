@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("money", "0060_remove_account_amount_int_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "date"], name="money_trans_account_b74246_idx"
+            ),
+        ),
+    ]
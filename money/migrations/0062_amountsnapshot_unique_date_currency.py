@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicated_snapshots(apps, schema_editor):
+    # Keep the most recently written snapshot of each (date, currency)
+    AmountSnapshot = apps.get_model("money", "AmountSnapshot")
+    latest = (
+        AmountSnapshot.objects.values("date", "currency")
+        .annotate(latest_id=Max("id"))
+        .values("latest_id")
+    )
+    AmountSnapshot.objects.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0061_transaction_money_trans_account_b74246_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicated_snapshots, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="amountsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("date", "currency"), name="unique_amount_snapshot_per_day"
+            ),
+        ),
+    ]
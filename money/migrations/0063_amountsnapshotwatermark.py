@@ -0,0 +1,64 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:07
+
+import django_choices_field.fields
+import money.choices
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def mark_all_snapshots_dirty(apps, schema_editor):
+    # Existing snapshots were never tracked, so the first refresh rebuilds them all
+    Transaction = apps.get_model("money", "Transaction")
+    AmountSnapshotWatermark = apps.get_model("money", "AmountSnapshotWatermark")
+    first_dates = (
+        Transaction.objects.values("account__currency")
+        .annotate(first_date=Min("date"))
+        .order_by()
+    )
+    AmountSnapshotWatermark.objects.bulk_create(
+        AmountSnapshotWatermark(
+            currency=row["account__currency"], dirty_date=row["first_date"]
+        )
+        for row in first_dates
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0062_amountsnapshot_unique_date_currency"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AmountSnapshotWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "currency",
+                    django_choices_field.fields.TextChoicesField(
+                        choices=[("KRW", "원화"), ("USD", "달러")],
+                        choices_enum=money.choices.CurrencyType,
+                        default="USD",
+                        max_length=3,
+                    ),
+                ),
+                ("dirty_date", models.DateField()),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("currency",), name="unique_amount_snapshot_watermark"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(mark_all_snapshots_dirty, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import migrations
+
+TASK_NAME = "Nightly snapshot refresh"
+
+
+def schedule_snapshot_refresh(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    crontab, _ = CrontabSchedule.objects.get_or_create(
+        minute="0",
+        hour="3",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+        timezone=settings.TIME_ZONE,
+    )
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "money.tasks.refresh_daily_snapshot",
+            "crontab": crontab,
+        },
+    )
+
+
+def unschedule_snapshot_refresh(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0063_amountsnapshotwatermark"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_snapshot_refresh, unschedule_snapshot_refresh),
+    ]
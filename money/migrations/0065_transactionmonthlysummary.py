@@ -0,0 +1,138 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:11
+
+import django.db.models.deletion
+import django_choices_field.fields
+import money.choices
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+def build_monthly_summary(apps, schema_editor):
+    Transaction = apps.get_model("money", "Transaction")
+    TransactionMonthlySummary = apps.get_model("money", "TransactionMonthlySummary")
+    zero = Value(0, output_field=DecimalField(max_digits=15, decimal_places=2))
+    rows = (
+        Transaction.objects.annotate(month=TruncMonth("date"))
+        .values("month", "account__currency", "type", "retailer", "is_internal")
+        .annotate(
+            total=Sum("amount"),
+            plus_sum=Coalesce(Sum("amount", filter=Q(amount__gt=0)), zero),
+            minus_sum=Coalesce(Sum("amount", filter=Q(amount__lt=0)), zero),
+            count=Count("id"),
+        )
+        .order_by()
+    )
+    TransactionMonthlySummary.objects.bulk_create(
+        (
+            TransactionMonthlySummary(
+                month=row["month"],
+                currency=row["account__currency"],
+                type=row["type"],
+                retailer_id=row["retailer"],
+                is_internal=row["is_internal"],
+                total=row["total"],
+                plus_sum=row["plus_sum"],
+                minus_sum=row["minus_sum"],
+                count=row["count"],
+            )
+            for row in rows.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0064_schedule_nightly_snapshot_refresh"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TransactionMonthlySummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "currency",
+                    django_choices_field.fields.TextChoicesField(
+                        choices=[("KRW", "원화"), ("USD", "달러")],
+                        choices_enum=money.choices.CurrencyType,
+                        default="USD",
+                        max_length=3,
+                    ),
+                ),
+                ("month", models.DateField()),
+                (
+                    "type",
+                    django_choices_field.fields.TextChoicesField(
+                        choices=[
+                            ("SERVICE", "서비스"),
+                            ("DAILY_NECESSITY", "생필품"),
+                            ("MEMBERSHIP", "맴버쉽"),
+                            ("GROCERY", "식료품"),
+                            ("EAT_OUT", "외식"),
+                            ("CLOTHING", "옷"),
+                            ("PRESENT", "선물"),
+                            ("CAR", "차/주유/운임"),
+                            ("HOUSING", "집/월세"),
+                            ("LEISURE", "여가"),
+                            ("MEDICAL", "의료비"),
+                            ("PARENTING", "육아"),
+                            ("TRANSFER", "이체"),
+                            ("INTEREST", "이자"),
+                            ("INCOME", "소득"),
+                            ("STOCK", "주식"),
+                            ("CASH", "현금"),
+                            ("ETC", "기타"),
+                        ],
+                        choices_enum=money.choices.TransactionCategory,
+                        default="ETC",
+                        max_length=30,
+                    ),
+                ),
+                ("is_internal", models.BooleanField(default=False)),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=15),
+                ),
+                (
+                    "plus_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=15),
+                ),
+                (
+                    "minus_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=15),
+                ),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["date"], name="money_trans_date_6dd3d7_idx"),
+        ),
+        migrations.AddField(
+            model_name="transactionmonthlysummary",
+            name="retailer",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="money.retailer",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transactionmonthlysummary",
+            index=models.Index(
+                fields=["month", "currency"], name="money_trans_month_0ba962_idx"
+            ),
+        ),
+        migrations.RunPython(build_monthly_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0065_transactionmonthlysummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockPosition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("shares", models.DecimalField(decimal_places=4, max_digits=15)),
+                ("price", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("market_value", models.DecimalField(decimal_places=2, max_digits=15)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="money.account"
+                    ),
+                ),
+                (
+                    "stock",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="money.stock"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["date"], name="money_stock_date_28803d_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("account", "stock", "date"),
+                        name="unique_stock_position",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:21
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicated_prices(apps, schema_editor):
+    # Keep the most recently written price of each (stock, date)
+    StockPrice = apps.get_model("money", "StockPrice")
+    latest = (
+        StockPrice.objects.values("stock", "date")
+        .annotate(latest_id=Max("id"))
+        .values("latest_id")
+    )
+    StockPrice.objects.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0066_stockposition"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicated_prices, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="stockprice",
+            constraint=models.UniqueConstraint(
+                fields=("stock", "date"), name="unique_stock_price_per_day"
+            ),
+        ),
+    ]
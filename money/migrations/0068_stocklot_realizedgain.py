@@ -0,0 +1,129 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:26
+
+import django.db.models.deletion
+import django_choices_field.fields
+import money.choices
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0067_stockprice_unique_stock_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockLot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "method",
+                    django_choices_field.fields.TextChoicesField(
+                        choices=[("FIFO", "선입선출"), ("AVERAGE", "평균단가")],
+                        choices_enum=money.choices.CostBasisMethod,
+                        max_length=10,
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("shares", models.DecimalField(decimal_places=4, max_digits=15)),
+                ("price", models.DecimalField(decimal_places=4, max_digits=15)),
+                ("remaining", models.DecimalField(decimal_places=4, max_digits=15)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="money.account"
+                    ),
+                ),
+                (
+                    "stock",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="money.stock"
+                    ),
+                ),
+                (
+                    "trade",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="money.stocktransaction",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="RealizedGain",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "method",
+                    django_choices_field.fields.TextChoicesField(
+                        choices=[("FIFO", "선입선출"), ("AVERAGE", "평균단가")],
+                        choices_enum=money.choices.CostBasisMethod,
+                        max_length=10,
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("shares", models.DecimalField(decimal_places=4, max_digits=15)),
+                ("proceeds", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("cost", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("gain", models.DecimalField(decimal_places=2, max_digits=15)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="money.account"
+                    ),
+                ),
+                (
+                    "stock",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="money.stock"
+                    ),
+                ),
+                (
+                    "trade",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="money.stocktransaction",
+                    ),
+                ),
+                (
+                    "lot",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="money.stocklot",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="stocklot",
+            index=models.Index(
+                fields=["account", "stock", "method", "date"],
+                name="money_stock_account_5073d2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="realizedgain",
+            index=models.Index(
+                fields=["account", "stock", "method", "date"],
+                name="money_reali_account_39834a_idx",
+            ),
+        ),
+    ]
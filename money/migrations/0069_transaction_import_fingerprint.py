@@ -0,0 +1,49 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:29
+
+import hashlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def fill_import_fingerprint(apps, schema_editor):
+    # Same content hash as money.helpers.imports.fingerprint, so statements
+    # imported by the old scripts are skipped when they are imported again
+    Transaction = apps.get_model("money", "Transaction")
+    rows = Transaction.objects.order_by("id").only(
+        "id", "account_id", "date", "amount", "note"
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        content = (
+            f"{row.account_id}|{row.date.isoformat()}|{row.amount:.2f}|{row.note or ''}"
+        )
+        row.import_fingerprint = hashlib.sha256(content.encode()).hexdigest()
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            Transaction.objects.bulk_update(batch, ["import_fingerprint"])
+            batch = []
+    Transaction.objects.bulk_update(batch, ["import_fingerprint"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0068_stocklot_realizedgain"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="import_fingerprint",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(fill_import_fingerprint, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "import_fingerprint"],
+                name="money_trans_account_f0ea69_idx",
+            ),
+        ),
+    ]
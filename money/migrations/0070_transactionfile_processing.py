@@ -0,0 +1,77 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:30
+
+import django_choices_field.fields
+import money.choices
+from django.db import migrations, models
+
+TASK_NAME = "Process uploaded transaction files"
+
+
+def schedule_file_processing(apps, schema_editor):
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    interval, _ = IntervalSchedule.objects.get_or_create(every=10, period="minutes")
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "money.tasks.process_transaction_files",
+            "interval": interval,
+        },
+    )
+
+
+def unschedule_file_processing(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0069_transaction_import_fingerprint"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transactionfile",
+            name="created_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="transactionfile",
+            name="duplicate_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="transactionfile",
+            name="error",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="transactionfile",
+            name="file_format",
+            field=django_choices_field.fields.TextChoicesField(
+                blank=True,
+                choices=[
+                    ("kakao_bank", "카카오뱅크"),
+                    ("kb_bank", "국민은행"),
+                    ("nhbank_housing", "농협 주택청약"),
+                ],
+                choices_enum=money.choices.StatementFormat,
+                max_length=20,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="transactionfile",
+            name="processing_seconds",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="transactionfile",
+            name="row_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(schedule_file_processing, unschedule_file_processing),
+    ]
@@ -0,0 +1,263 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:32
+
+import django.db.models.deletion
+import django_choices_field.fields
+import money.choices
+from django.db import migrations, models
+
+KAKAO_BANK_ACCOUNT_ID = 9
+KB_BANK_ACCOUNT_ID = 8
+FRIENDS = [
+    "전성빈",
+    "김혜인",
+    "김호영",
+    "손동희",
+    "송광호",
+    "서장혁",
+    "구한준",
+    "이재준",
+    "김동완",
+    "길태호",
+    "정창용",
+    "하소정",
+    "권수용",
+    "토스 김호영",
+    "토스 하소정",
+    "토스_현명욱",
+    "간편이체(박상준)",
+    "안종찬",
+]
+
+# Rules of scripts/kakao_bank_update.py and scripts/kb_bank_update.py as
+# (account id, field, match type, pattern, required fields, retailer name,
+# type, is_internal, reviewed), in the order the scripts checked them
+SEED_RULES = [
+    (9, "retailer", "CONTAINS", "입출금통장 이자", {}, "카카오뱅크", "INTEREST", None, True),
+    (9, "retailer", "CONTAINS", "세이프박스 이자", {}, "카카오뱅크", "INTEREST", None, True),
+    (9, "note", "EXACT", "계좌간자동이체", {}, None, "TRANSFER", True, None),
+    (9, "retailer", "REGEX", "적금.*신규|신규.*적금", {}, None, "TRANSFER", True, None),
+    (
+        9,
+        "note",
+        "REGEX",
+        "^(일반이체|타행자동이체|일반입금)$",
+        {"retailer": "박윤재"},
+        None,
+        "TRANSFER",
+        True,
+        None,
+    ),
+    (
+        9,
+        "note",
+        "EXACT",
+        "자동이체(기타)",
+        {"retailer": "토스 박윤재"},
+        None,
+        "TRANSFER",
+        True,
+        None,
+    ),
+    (9, "retailer", "EXACT", "카카오페이", {}, None, "TRANSFER", True, None),
+    (9, "retailer", "CONTAINS", "동행복권", {}, "로또", "LEISURE", None, True),
+    (9, "retailer", "EXACT", "Amazon_AWS", {}, "Amazon AWS", "LEISURE", None, True),
+    (9, "retailer", "CONTAINS", "aws", {}, "Amazon AWS", "LEISURE", None, True),
+    (9, "retailer", "EXACT", "대출이자", {}, "카카오뱅크", "INTEREST", None, True),
+    (9, "retailer", "EXACT", "카카오뱅크 캐시백지급", {}, "카카오뱅크", "INTEREST", None, True),
+    (9, "retailer", "EXACT", "유민주", {}, "Minjoo Yoo", "TRANSFER", None, True),
+    (9, "retailer", "EXACT", "이현영", {}, "가족", "TRANSFER", None, True),
+    (9, "retailer", "EXACT", "박형준", {}, "가족", "TRANSFER", None, True),
+    *[
+        (9, "retailer", "EXACT", name, {}, "친구", "TRANSFER", None, True)
+        for name in FRIENDS
+    ],
+    (9, "retailer", "EXACT", "ATM출금", {}, None, "CASH", None, True),
+    (9, "retailer", "CONTAINS", "코인원", {}, "투자", "STOCK", None, True),
+    (8, "retailer", "EXACT", "유민주", {}, "Minjoo Yoo", "TRANSFER", None, True),
+    *[
+        (8, "retailer", "EXACT", name, {}, None, "TRANSFER", True, None)
+        for name in [
+            "급여",
+            "박윤재",
+            "KB카드출금",
+            "카드대금결제",
+            "신한카드",
+            "20600904025240",
+            "토스 박윤재",
+        ]
+    ],
+    *[
+        (
+            8,
+            "retailer",
+            "CONTAINS",
+            pattern,
+            {},
+            "Communication Cost",
+            "SERVICE",
+            None,
+            True,
+        )
+        for pattern in ["티플러스", "KT98729577", "KT통신요금"]
+    ],
+    (
+        8,
+        "retailer",
+        "REGEX",
+        "삼성.*002건|002건.*삼성",
+        {},
+        "Life Insurance",
+        "SERVICE",
+        None,
+        True,
+    ),
+    (8, "retailer", "CONTAINS", "이자세금", {}, "KB Bank", "INTEREST", None, True),
+    (8, "retailer", "EXACT", "신림건영3차", {}, "신림건영3차", "HOUSING", None, True),
+    (8, "retailer", "EXACT", "서울도시가스", {}, "서울도시가스", "HOUSING", None, True),
+]
+
+
+def seed_rules(apps, schema_editor):
+    Account = apps.get_model("money", "Account")
+    Retailer = apps.get_model("money", "Retailer")
+    CategorizationRule = apps.get_model("money", "CategorizationRule")
+
+    account_ids = set(
+        Account.objects.filter(
+            pk__in=[KAKAO_BANK_ACCOUNT_ID, KB_BANK_ACCOUNT_ID]
+        ).values_list("id", flat=True)
+    )
+    retailer_map = dict(Retailer.objects.values_list("name", "id"))
+
+    rules = []
+    for priority, rule in enumerate(SEED_RULES, start=1):
+        account_id, field, match_type, pattern, required = rule[:5]
+        retailer_name, type_, is_internal, reviewed = rule[5:]
+        # Rules of an account or retailer this database does not have are skipped
+        if account_id not in account_ids:
+            continue
+        if retailer_name is not None and retailer_name not in retailer_map:
+            continue
+        rules.append(
+            CategorizationRule(
+                name=f"{field} {pattern}",
+                priority=priority * 10,
+                account_id=account_id,
+                field=field,
+                match_type=match_type,
+                pattern=pattern,
+                required_fields=required,
+                retailer_id=retailer_map.get(retailer_name),
+                type=type_,
+                is_internal=is_internal,
+                reviewed=reviewed,
+            )
+        )
+    CategorizationRule.objects.bulk_create(rules)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("money", "0070_transactionfile_processing"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategorizationRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("priority", models.PositiveIntegerField(default=100)),
+                ("is_active", models.BooleanField(default=True)),
+                (
+                    "field",
+                    django_choices_field.fields.TextChoicesField(
+                        choices=[("retailer", "거래처"), ("note", "메모"), ("type", "구분")],
+                        choices_enum=money.choices.RuleField,
+                        default="retailer",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "match_type",
+                    django_choices_field.fields.TextChoicesField(
+                        choices=[("EXACT", "일치"), ("CONTAINS", "포함"), ("REGEX", "정규식")],
+                        choices_enum=money.choices.RuleMatchType,
+                        default="EXACT",
+                        max_length=10,
+                    ),
+                ),
+                ("pattern", models.CharField(max_length=200)),
+                (
+                    "required_fields",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Other note fields that must equal the given values",
+                    ),
+                ),
+                (
+                    "type",
+                    django_choices_field.fields.TextChoicesField(
+                        blank=True,
+                        choices=[
+                            ("SERVICE", "서비스"),
+                            ("DAILY_NECESSITY", "생필품"),
+                            ("MEMBERSHIP", "맴버쉽"),
+                            ("GROCERY", "식료품"),
+                            ("EAT_OUT", "외식"),
+                            ("CLOTHING", "옷"),
+                            ("PRESENT", "선물"),
+                            ("CAR", "차/주유/운임"),
+                            ("HOUSING", "집/월세"),
+                            ("LEISURE", "여가"),
+                            ("MEDICAL", "의료비"),
+                            ("PARENTING", "육아"),
+                            ("TRANSFER", "이체"),
+                            ("INTEREST", "이자"),
+                            ("INCOME", "소득"),
+                            ("STOCK", "주식"),
+                            ("CASH", "현금"),
+                            ("ETC", "기타"),
+                        ],
+                        choices_enum=money.choices.TransactionCategory,
+                        max_length=30,
+                        null=True,
+                    ),
+                ),
+                ("is_internal", models.BooleanField(blank=True, null=True)),
+                ("reviewed", models.BooleanField(blank=True, null=True)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Only transactions of this account, every account if empty",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="money.account",
+                    ),
+                ),
+                (
+                    "retailer",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="money.retailer",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["priority", "id"],
+            },
+        ),
+        migrations.RunPython(seed_rules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:34
+
+import django.contrib.postgres.indexes
+import json
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 2000
+
+
+def fill_raw(apps, schema_editor):
+    # Each chunk commits on its own so a large ledger is not locked at once
+    Transaction = apps.get_model("money", "Transaction")
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Transaction.objects.filter(id__gt=last_id, raw__isnull=True)
+                .exclude(note=None)
+                .order_by("id")
+                .only("id", "note")[:BATCH_SIZE]
+            )
+            if not rows:
+                return
+            last_id = rows[-1].id
+
+            parsed = []
+            for row in rows:
+                try:
+                    data = json.loads(row.note)
+                except ValueError:
+                    continue
+                if isinstance(data, dict):
+                    row.raw = data
+                    parsed.append(row)
+            Transaction.objects.bulk_update(parsed, ["raw"])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("money", "0071_categorizationrule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="raw",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_raw, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["raw"],
+                name="money_transaction_raw_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="categorizationrule",
+            name="required_fields",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Other raw fields that must equal the given values",
+            ),
+        ),
+    ]
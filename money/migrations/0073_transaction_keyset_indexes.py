@@ -0,0 +1,40 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:44
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The new indexes are built before the ones they cover are dropped, without
+    # locking writes to the ledger
+    atomic = False
+
+    dependencies = [
+        ("money", "0072_transaction_raw"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "date", "id"], name="money_trans_account_5f1b02_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="transaction",
+            index=models.Index(
+                fields=["date", "id"], name="money_trans_date_8b3722_idx"
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="transaction",
+            name="money_trans_account_b74246_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="transaction",
+            name="money_trans_date_6dd3d7_idx",
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:40
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # jsonb_path_ops only serves @>, @? and @@, not the key lookups on raw
+    atomic = False
+
+    dependencies = [
+        ("money", "0073_transaction_keyset_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="transaction",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["raw"], name="money_transaction_raw_keys"
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="transaction",
+            name="money_transaction_raw_gin",
+        ),
+    ]
@@ -51,7 +51,11 @@ class Bank(models.Model):
     def balance(self) -> list[BankBalance]:
         sum_dict = defaultdict(Decimal)
 
-        for account in Account.objects.filter(bank=self):
+        # Prefetched for every bank of a page by the GraphQL BankNode
+        accounts = getattr(self, "balance_accounts", None)
+        if accounts is None:
+            accounts = Account.objects.filter(bank=self)
+        for account in accounts:
             sum_dict[account.currency] += account.amount
         return [
             BankBalance(currency=currency, value=value)
@@ -63,5 +67,30 @@ class AmountSnapshot(BaseAmountModel, BaseCurrencyModel):
     date = models.DateField()
     summary = models.JSONField(null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "currency"], name="unique_amount_snapshot_per_day"
+            )
+        ]
+
     def __str__(self) -> str:
         return f"{self.date}: {self.currency}"
+
+
+class AmountSnapshotWatermark(BaseCurrencyModel):
+    """
+    Earliest date of a currency whose AmountSnapshot is out of date.
+    """
+
+    dirty_date = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["currency"], name="unique_amount_snapshot_watermark"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.currency}: {self.dirty_date}"
@@ -1,7 +1,9 @@
 from decimal import Decimal
 
 from django.db import models
+from django_choices_field import TextChoicesField
 
+from money.choices import CostBasisMethod
 from money.models.accounts import Account
 from money.models.base import (
     BaseAmountModel,
@@ -45,3 +47,88 @@ class StockTransaction(BaseTimeStampModel, BaseAmountModel, BaseURLModel):
 class StockPrice(BaseTimeStampModel):
     stock = models.ForeignKey(Stock, on_delete=models.CASCADE)
     price = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        # The (stock, date) index of the constraint also serves as-of lookups
+        constraints = [
+            models.UniqueConstraint(
+                fields=["stock", "date"], name="unique_stock_price_per_day"
+            )
+        ]
+
+
+class StockPosition(models.Model):
+    """
+    Shares of a stock held by an account after the trades and prices of date.
+    A row is written on every date the position or the stock price changes, and
+    a position closed on date is written with zero shares.
+    Maintained by money.helpers.positions.
+    """
+
+    date = models.DateField()
+    account = models.ForeignKey(Account, on_delete=models.CASCADE)
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE)
+    shares = models.DecimalField(max_digits=15, decimal_places=4)
+    price = models.DecimalField(max_digits=15, decimal_places=2)
+    market_value = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "stock", "date"], name="unique_stock_position"
+            )
+        ]
+        indexes = [models.Index(fields=["date"])]
+
+    def __str__(self):
+        return f"{self.date.strftime('%Y-%m-%d')} {self.account} {self.stock}: {self.shares}"
+
+
+class StockLot(models.Model):
+    """
+    Shares bought by a stock transaction and the part of them still held.
+    Sales consume lots oldest first under FIFO and proportionally under average
+    cost, so the weighted lot price of an account is its average cost.
+    Maintained by money.helpers.lots.
+    """
+
+    method = TextChoicesField(max_length=10, choices_enum=CostBasisMethod)
+    date = models.DateField()
+    account = models.ForeignKey(Account, on_delete=models.CASCADE)
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE)
+    trade = models.ForeignKey(StockTransaction, on_delete=models.CASCADE)
+    shares = models.DecimalField(max_digits=15, decimal_places=4)
+    price = models.DecimalField(max_digits=15, decimal_places=4)
+    remaining = models.DecimalField(max_digits=15, decimal_places=4)
+
+    class Meta:
+        indexes = [models.Index(fields=["account", "stock", "method", "date"])]
+
+    def __str__(self):
+        return f"{self.date.strftime('%Y-%m-%d')} {self.stock} {self.method}: {self.remaining}/{self.shares}"
+
+
+class RealizedGain(models.Model):
+    """
+    Shares of a lot closed by a sale. Shares sold beyond the open lots have no
+    lot and no cost basis to compare against, so they realize no gain.
+    """
+
+    method = TextChoicesField(max_length=10, choices_enum=CostBasisMethod)
+    date = models.DateField()
+    account = models.ForeignKey(Account, on_delete=models.CASCADE)
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE)
+    trade = models.ForeignKey(StockTransaction, on_delete=models.CASCADE)
+    lot = models.ForeignKey(StockLot, on_delete=models.CASCADE, null=True, blank=True)
+    shares = models.DecimalField(max_digits=15, decimal_places=4)
+    proceeds = models.DecimalField(max_digits=15, decimal_places=2)
+    cost = models.DecimalField(max_digits=15, decimal_places=2)
+    gain = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        indexes = [models.Index(fields=["account", "stock", "method", "date"])]
+
+    def __str__(self):
+        return (
+            f"{self.date.strftime('%Y-%m-%d')} {self.stock} {self.method}: {self.gain}"
+        )
@@ -1,10 +1,19 @@
+import re
+
+from django.contrib.postgres.indexes import GinIndex
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.urls import reverse
 from django_choices_field import TextChoicesField
 
-from money.choices import TransactionCategory
+from money.choices import RuleField, RuleMatchType, StatementFormat, TransactionCategory
 from money.models.accounts import Account
-from money.models.base import BaseAmountModel, BaseTimeStampModel, BaseURLModel
+from money.models.base import (
+    BaseAmountModel,
+    BaseCurrencyModel,
+    BaseTimeStampModel,
+    BaseURLModel,
+)
 from money.models.shoppings import DetailItem, Retailer
 
 
@@ -17,6 +26,8 @@ class Transaction(BaseTimeStampModel, BaseAmountModel, BaseURLModel):
         max_digits=15, decimal_places=2, null=True, blank=True
     )
     note = models.TextField(null=True, blank=True)
+    # Columns of the imported bank row (type, retailer, note, balance)
+    raw = models.JSONField(null=True, blank=True)
     is_internal = models.BooleanField(default=False)
     requires_detail = models.BooleanField(default=False)
 
@@ -30,6 +41,18 @@ class Transaction(BaseTimeStampModel, BaseAmountModel, BaseURLModel):
     related_transaction = models.ForeignKey(
         "self", on_delete=models.SET_NULL, blank=True, null=True
     )
+    # sha256 of (account, date, amount, note), see money.helpers.imports
+    import_fingerprint = models.CharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # (date, id) is the keyset of TransactionConnection pages
+            models.Index(fields=["account", "date", "id"]),
+            models.Index(fields=["date", "id"]),
+            models.Index(fields=["account", "import_fingerprint"]),
+            # jsonb_ops serves the key lookups (?, ?|) as well as containment
+            GinIndex(fields=["raw"], name="money_transaction_raw_keys"),
+        ]
 
     def get_absolute_url(self):
         return reverse("money:transaction_detail", kwargs={"pk": self.pk})
@@ -61,5 +84,111 @@ class TransactionFile(BaseTimeStampModel):
     is_processed = models.BooleanField(default=False)
     processed_date = models.DateTimeField(null=True, blank=True)
 
+    # Filled by money.tasks.process_transaction_file
+    file_format = TextChoicesField(
+        max_length=20, choices_enum=StatementFormat, null=True, blank=True
+    )
+    row_count = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    processing_seconds = models.FloatField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+
     def __str__(self):
         return f"{self.date}: {self.file.name}"
+
+    @property
+    def rows_per_second(self) -> float | None:
+        if not self.processing_seconds:
+            return None
+        return self.row_count / self.processing_seconds
+
+
+class TransactionMonthlySummary(BaseCurrencyModel):
+    """
+    Transactions rolled up by (month, currency, type, retailer, is_internal).
+    Maintained by money.helpers.rollups whenever transactions are written.
+    """
+
+    month = models.DateField()
+    type = TextChoicesField(
+        max_length=30,
+        choices_enum=TransactionCategory,
+        default=TransactionCategory.ETC,
+    )
+    retailer = models.ForeignKey(
+        Retailer, on_delete=models.SET_NULL, blank=True, null=True
+    )
+    is_internal = models.BooleanField(default=False)
+    total = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    plus_sum = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    minus_sum = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["month", "currency"])]
+
+    def __str__(self):
+        return f"{self.month.strftime('%Y-%m')} {self.currency} {self.type}"
+
+
+class CategorizationRule(models.Model):
+    """
+    Categorize unreviewed, uncategorized imported transactions whose raw bank
+    row matches.
+    The rule with the lowest priority wins, and empty actions leave the field
+    as it is. Applied by money.helpers.categorization.
+    """
+
+    name = models.CharField(max_length=100)
+    priority = models.PositiveIntegerField(default=100)
+    is_active = models.BooleanField(default=True)
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Only transactions of this account, every account if empty",
+    )
+
+    field = TextChoicesField(
+        max_length=20, choices_enum=RuleField, default=RuleField.RETAILER
+    )
+    match_type = TextChoicesField(
+        max_length=10, choices_enum=RuleMatchType, default=RuleMatchType.EXACT
+    )
+    pattern = models.CharField(max_length=200)
+    required_fields = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Other raw fields that must equal the given values",
+    )
+
+    retailer = models.ForeignKey(
+        Retailer, on_delete=models.CASCADE, null=True, blank=True
+    )
+    type = TextChoicesField(
+        max_length=30, choices_enum=TransactionCategory, null=True, blank=True
+    )
+    is_internal = models.BooleanField(null=True, blank=True)
+    reviewed = models.BooleanField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["priority", "id"]
+
+    def clean(self):
+        if self.match_type == RuleMatchType.EXACT:
+            return
+        try:
+            self.compile_pattern()
+        except re.error as e:
+            raise ValidationError({"pattern": f"Invalid regular expression: {e}"})
+
+    def compile_pattern(self) -> re.Pattern:
+        """Regex searched by a CONTAINS or REGEX rule, raises re.error if invalid."""
+        if self.match_type == RuleMatchType.CONTAINS:
+            return re.compile(re.escape(self.pattern))
+        return re.compile(self.pattern)
+
+    def __str__(self):
+        return f"{self.priority} {self.name}: {self.field} {self.match_type} {self.pattern}"
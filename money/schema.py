@@ -1,23 +1,62 @@
+from datetime import date
+
 import strawberry
 import strawberry.django
+from django.conf import settings
 from django.db.models import Sum
+from graphql import GraphQLError
+from strawberry import relay
+from strawberry.extensions import ParserCache, ValidationCache
+from strawberry.types import Info
 from strawberry_django import mutations
 from strawberry_django.optimizer import DjangoOptimizerExtension
 from strawberry_django.relay import ListConnectionWithTotalCount
 
+from money.choices import CostBasisMethod, TransactionGrouping
+from money.helpers.aggregates import get_balance_history, get_transaction_totals
+from money.helpers.lots import get_stock_profits
 from money.models.incomes import Salary
+from money.models.shoppings import AmazonOrder
+from money.models.stocks import StockTransaction
+from money.models.transactions import Transaction
 from money.types import types
-from money.types.accounts import AccountInput, AccountNode, AmountSnapshotNode, BankNode
+from money.types.accounts import (
+    AccountInput,
+    AccountNode,
+    AmountSnapshotNode,
+    BalancePointNode,
+    BalanceSeriesNode,
+    BankNode,
+)
+from money.types.bulk import bulk_create_inputs, bulk_update_inputs, row_errors
+from money.types.extensions import LedgerUpdateExtension
 from money.types.incomes import SalaryNode
 from money.types.retailers import RetailerInput, RetailerNode
-from money.types.shoppings import AmazonOrderInput, AmazonOrderNode
+from money.types.shoppings import (
+    AmazonOrderBulkPayload,
+    AmazonOrderInput,
+    AmazonOrderNode,
+    AmazonOrderPartialInput,
+)
 from money.types.stocks import (
+    CostBasisMethodEnum,
     StockInput,
     StockNode,
+    StockProfitNode,
+    StockTransactionBulkPayload,
     StockTransactionInput,
     StockTransactionNode,
+    StockTransactionPartialInput,
+)
+from money.types.transactions import (
+    TransactionBulkPayload,
+    TransactionConnection,
+    TransactionGroupingEnum,
+    TransactionInput,
+    TransactionNode,
+    TransactionPartialInput,
+    TransactionTotalNode,
 )
-from money.types.transactions import TransactionInput, TransactionNode
 
 
 def get_salary_years() -> list[int]:
@@ -44,11 +83,125 @@ def get_salary_summary() -> list[types.SalarySummaryNode]:
     ]
 
 
+def get_stock_profit(
+    method: CostBasisMethodEnum = CostBasisMethod.FIFO, year: int | None = None
+) -> list[StockProfitNode]:
+    return [
+        StockProfitNode(
+            account=profit.account,
+            stock=profit.stock,
+            year=profit.year,
+            shares=profit.shares,
+            cost_basis=profit.cost_basis,
+            market_value=profit.market_value,
+            realized_gain=profit.realized_gain,
+            unrealized_gain=profit.unrealized_gain,
+        )
+        for profit in get_stock_profits(CostBasisMethod(method), year)
+    ]
+
+
+def _account_ids(accounts: list[relay.GlobalID] | None) -> list[int]:
+    """Primary keys of AccountNode ids, a GraphQL error for any other id."""
+    type_name = AccountNode.__strawberry_definition__.name
+    account_ids = []
+    for account in accounts or []:
+        if account.type_name != type_name or not account.node_id.isdigit():
+            raise GraphQLError(f"Invalid account id: {account}")
+        account_ids.append(int(account.node_id))
+    return account_ids
+
+
+def get_transaction_total(
+    group_by: list[TransactionGroupingEnum],
+    start: date | None = None,
+    end: date | None = None,
+    accounts: list[relay.GlobalID] | None = None,
+    is_internal: bool | None = False,
+) -> list[TransactionTotalNode]:
+    account_ids = _account_ids(accounts)
+    return [
+        TransactionTotalNode(
+            currency=total.currency,
+            month=total.month,
+            type=total.type,
+            retailer=total.retailer,
+            total=total.total,
+            income=total.income,
+            spending=total.spending,
+            count=total.count,
+        )
+        for total in get_transaction_totals(
+            [TransactionGrouping(group) for group in group_by],
+            start,
+            end,
+            account_ids,
+            is_internal,
+        )
+    ]
+
+
+def get_balance_series(
+    start: date, end: date, accounts: list[relay.GlobalID] | None = None
+) -> list[BalanceSeriesNode]:
+    account_ids = _account_ids(accounts)
+    return [
+        BalanceSeriesNode(
+            account=series.account,
+            points=[
+                BalancePointNode(month=month, balance=balance)
+                for month, balance in series.points
+            ],
+        )
+        for series in get_balance_history(start, end, account_ids)
+    ]
+
+
+def create_transactions(
+    info: Info, data: list[TransactionInput]
+) -> TransactionBulkPayload:
+    result = bulk_create_inputs(info, Transaction, data)
+    return TransactionBulkPayload(nodes=result.rows, errors=row_errors(result))
+
+
+def update_transactions(
+    info: Info, data: list[TransactionPartialInput]
+) -> TransactionBulkPayload:
+    result = bulk_update_inputs(info, Transaction, data)
+    return TransactionBulkPayload(nodes=result.rows, errors=row_errors(result))
+
+
+def create_stock_transactions(
+    info: Info, data: list[StockTransactionInput]
+) -> StockTransactionBulkPayload:
+    result = bulk_create_inputs(info, StockTransaction, data)
+    return StockTransactionBulkPayload(nodes=result.rows, errors=row_errors(result))
+
+
+def update_stock_transactions(
+    info: Info, data: list[StockTransactionPartialInput]
+) -> StockTransactionBulkPayload:
+    result = bulk_update_inputs(info, StockTransaction, data)
+    return StockTransactionBulkPayload(nodes=result.rows, errors=row_errors(result))
+
+
+def create_amazon_orders(
+    info: Info, data: list[AmazonOrderInput]
+) -> AmazonOrderBulkPayload:
+    result = bulk_create_inputs(info, AmazonOrder, data)
+    return AmazonOrderBulkPayload(nodes=result.rows, errors=row_errors(result))
+
+
+def update_amazon_orders(
+    info: Info, data: list[AmazonOrderPartialInput]
+) -> AmazonOrderBulkPayload:
+    result = bulk_update_inputs(info, AmazonOrder, data)
+    return AmazonOrderBulkPayload(nodes=result.rows, errors=row_errors(result))
+
+
 @strawberry.type
 class Query:
-    transaction_relay: ListConnectionWithTotalCount[
-        TransactionNode
-    ] = strawberry.django.connection()
+    transaction_relay: TransactionConnection = strawberry.django.connection()
 
     retailer_relay: ListConnectionWithTotalCount[
         RetailerNode
@@ -80,24 +233,54 @@ class Query:
     salary_summary: list[types.SalarySummaryNode] = strawberry.field(
         resolver=get_salary_summary
     )
+    stock_profit: list[StockProfitNode] = strawberry.field(resolver=get_stock_profit)
+    transaction_total: list[TransactionTotalNode] = strawberry.field(
+        resolver=get_transaction_total
+    )
+    balance_series: list[BalanceSeriesNode] = strawberry.field(
+        resolver=get_balance_series
+    )
 
 
 @strawberry.type
 class Mutation:
     create_account: AccountNode = mutations.create(AccountInput)
-    create_transaction: TransactionNode = mutations.create(TransactionInput)
+    create_transaction: TransactionNode = mutations.create(
+        TransactionInput, extensions=[LedgerUpdateExtension()]
+    )
     create_retailer: RetailerNode = mutations.create(RetailerInput)
     create_stock: StockNode = mutations.create(StockInput)
     create_stock_transaction: StockTransactionNode = mutations.create(
-        StockTransactionInput
+        StockTransactionInput, extensions=[LedgerUpdateExtension()]
     )
     create_amazon_order: AmazonOrderNode = mutations.create(AmazonOrderInput)
 
+    create_transactions: TransactionBulkPayload = strawberry.mutation(
+        resolver=create_transactions
+    )
+    update_transactions: TransactionBulkPayload = strawberry.mutation(
+        resolver=update_transactions
+    )
+    create_stock_transactions: StockTransactionBulkPayload = strawberry.mutation(
+        resolver=create_stock_transactions
+    )
+    update_stock_transactions: StockTransactionBulkPayload = strawberry.mutation(
+        resolver=update_stock_transactions
+    )
+    create_amazon_orders: AmazonOrderBulkPayload = strawberry.mutation(
+        resolver=create_amazon_orders
+    )
+    update_amazon_orders: AmazonOrderBulkPayload = strawberry.mutation(
+        resolver=update_amazon_orders
+    )
+
 
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
     extensions=[
         DjangoOptimizerExtension,
+        ParserCache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE),
+        ValidationCache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE),
     ],
 )
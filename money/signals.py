@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.db.transaction import on_commit
+from django.dispatch import receiver
+
+from money.helpers import ledger
+from money.helpers.counts import invalidate_counts
+from money.models.accounts import Account
+from money.models.transactions import Transaction
+
+
+# Writes that bypass ledger.transactions_changed, such as scripts, the admin and
+# the deletes cascading from an account. TransactionFilter also filters by the
+# fields of the account.
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def transaction_counts_changed(sender, **kwargs):
+    invalidate_counts(Transaction)
+
+
+@receiver(pre_delete, sender=Account)
+def account_deleted(sender, instance, **kwargs):
+    """
+    Rebuild what the transactions of a deleted account were rolled up into,
+    once the delete that cascades to them is committed.
+    """
+    changes = list(
+        Transaction.objects.filter(account=instance)
+        .values_list("account_id", "date")
+        .distinct()
+    )
+    if changes:
+        currencies = {instance.pk: instance.currency}
+        on_commit(lambda: ledger.transactions_changed(changes, currencies))
@@ -0,0 +1,172 @@
+import codecs
+import datetime
+import logging
+import time
+from collections.abc import Iterable
+from itertools import chain
+from typing import Any
+
+from celery import group
+from celery.result import GroupResult
+from django.db import transaction
+from django.utils import timezone
+
+from config import celery_app
+from money.choices import CurrencyType
+from money.helpers import balance, categorization, imports, snapshots
+from money.models.accounts import Account
+from money.models.transactions import Transaction, TransactionFile
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task()
+def update_account_balance(account_id: int) -> int:
+    """Recompute transaction and stock balances of an account."""
+    account = Account.objects.get(pk=account_id)
+    with transaction.atomic():
+        balance.update_account_balance(account)
+        balance.update_stock_balance(account)
+    return account_id
+
+
+@celery_app.task()
+def refresh_snapshot(currency: str, since: str | None = None) -> str:
+    """Refresh AmountSnapshot of currency from since, or rebuild it without since."""
+    try:
+        with transaction.atomic():
+            if since is None:
+                snapshots.rebuild_snapshot(currency)
+            else:
+                snapshots.refresh_snapshot(currency, datetime.date.fromisoformat(since))
+    except Exception:
+        # The dirty date was claimed before the task ran, keep it for the next run
+        if since is not None:
+            snapshots.mark_snapshot_dirty(currency, datetime.date.fromisoformat(since))
+        raise
+    return currency
+
+
+@celery_app.task()
+def refresh_daily_snapshot() -> str:
+    """Nightly entry point for django-celery-beat."""
+    return update_daily_snapshot().id
+
+
+def _import_file(transaction_file: TransactionFile) -> imports.ImportResult:
+    if transaction_file.account_id is None:
+        raise ValueError("The file has no account")
+
+    with transaction_file.file.open("rb") as f:
+        lines = codecs.iterdecode(f, "utf-8-sig")
+        first_line = next(lines, "")
+        if not transaction_file.file_format:
+            transaction_file.file_format = imports.detect_format(first_line)
+        result = imports.import_transactions(
+            transaction_file.account_id,
+            imports.parse_rows(
+                transaction_file.file_format, chain([first_line], lines)
+            ),
+        )
+    categorization.apply_rules(
+        Transaction.objects.filter(account_id=transaction_file.account_id)
+    )
+    return result
+
+
+@celery_app.task()
+def process_transaction_file(file_id: int) -> int:
+    """
+    Import an uploaded statement into the ledger of its account, categorize it
+    and record the row counts and time taken. A file that fails for any reason
+    keeps is_processed unset and stores the error, so it is not queued again.
+    """
+    with transaction.atomic():
+        transaction_file = (
+            TransactionFile.objects.select_for_update(skip_locked=True)
+            .filter(pk=file_id, is_processed=False)
+            .first()
+        )
+        if transaction_file is None:
+            return file_id
+
+        started = time.monotonic()
+        try:
+            # A savepoint, so a database error still leaves the file to record it
+            with transaction.atomic():
+                result = _import_file(transaction_file)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            transaction_file.error = str(e)
+        except Exception as e:
+            # Anything else is recorded too, or the file would be queued forever
+            logger.exception("Processing TransactionFile %s failed", file_id)
+            transaction_file.error = f"{type(e).__name__}: {e}"
+        else:
+            transaction_file.error = ""
+            transaction_file.is_processed = True
+            transaction_file.processed_date = timezone.now()
+            transaction_file.row_count = result.rows
+            transaction_file.created_count = result.created
+            transaction_file.duplicate_count = result.duplicates
+        transaction_file.processing_seconds = time.monotonic() - started
+        transaction_file.save()
+    return file_id
+
+
+@celery_app.task()
+def process_transaction_files() -> list[int]:
+    """Periodic entry point, queue every unprocessed file that has not failed."""
+    file_ids = list(
+        TransactionFile.objects.filter(is_processed=False, error="")
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    for file_id in file_ids:
+        process_transaction_file.delay(file_id)
+    return file_ids
+
+
+def update_balances(account_ids: Iterable[int]) -> GroupResult:
+    """Fan out one balance update per account."""
+    return start_group([update_account_balance.s(pk) for pk in account_ids])
+
+
+def update_daily_snapshot(full: bool = False) -> GroupResult:
+    """Fan out one snapshot refresh per dirty currency, or per currency if full."""
+    if full:
+        signatures = [
+            refresh_snapshot.s(currency) for currency, _ in CurrencyType.choices
+        ]
+    else:
+        signatures = [
+            refresh_snapshot.s(currency, dirty_date.isoformat())
+            for currency, dirty_date in snapshots.claim_dirty_dates()
+        ]
+    return start_group(signatures)
+
+
+def start_group(signatures: list) -> GroupResult:
+    """Run signatures in parallel and store the group so it can be polled."""
+    result = group(signatures).apply_async()
+    result.save()
+    return result
+
+
+def get_progress(group_id: str) -> dict[str, Any]:
+    """Progress of a group started by start_group, read from the result backend."""
+    result = GroupResult.restore(group_id, app=celery_app)
+    if result is None:
+        return {"state": "PENDING", "completed": 0, "total": 0}
+
+    if result.failed():
+        state = "FAILURE"
+    elif result.ready():
+        state = "SUCCESS"
+    else:
+        state = "PROGRESS"
+
+    return {
+        "state": state,
+        "completed": result.completed_count(),
+        "total": len(result.results),
+    }
@@ -48,7 +48,7 @@ def abs_filter(value):
 
 @register.filter
 def add_float(value1, value2):
-    return value1 + value2
+    return float(value1) + float(value2)
 
 
 @register.filter
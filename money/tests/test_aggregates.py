@@ -0,0 +1,181 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from strawberry.relay import to_base64
+
+from money.choices import AccountType, TransactionCategory, TransactionGrouping
+from money.helpers.aggregates import get_balance_history, get_transaction_totals
+from money.helpers.balance import update_account_balance
+from money.helpers.rollups import rebuild_monthly_summary
+from money.models.accounts import Account, Bank
+from money.models.shoppings import Retailer
+from money.models.transactions import Transaction
+
+
+class AggregateTest(TestCase):
+    """거래 합계와 잔액 추이 집계를 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.krw = Account.objects.create(
+            name="KRW Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.usd = Account.objects.create(
+            name="USD Account",
+            bank=self.bank,
+            amount=0,
+            currency="USD",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.market = Retailer.objects.create(name="마트")
+
+        for account, day, amount, category, retailer in (
+            (
+                self.krw,
+                datetime.date(2024, 1, 5),
+                "1000",
+                TransactionCategory.ETC,
+                None,
+            ),
+            (
+                self.krw,
+                datetime.date(2024, 1, 20),
+                "-300",
+                TransactionCategory.GROCERY,
+                self.market,
+            ),
+            (
+                self.krw,
+                datetime.date(2024, 3, 2),
+                "-200",
+                TransactionCategory.GROCERY,
+                self.market,
+            ),
+            (self.usd, datetime.date(2024, 1, 10), "50", TransactionCategory.ETC, None),
+        ):
+            Transaction.objects.create(
+                account=account,
+                date=day,
+                amount=Decimal(amount),
+                type=category,
+                retailer=retailer,
+            )
+        update_account_balance(self.krw)
+        update_account_balance(self.usd)
+        rebuild_monthly_summary()
+
+    def test_totals_by_month(self):
+        """월별 합계를 통화별로 월 단위 집계에서 읽는지 테스트합니다."""
+        with self.assertNumQueries(1):
+            totals = get_transaction_totals([TransactionGrouping.MONTH])
+
+        self.assertEqual(
+            [
+                (t.currency, t.month, t.total, t.income, t.spending, t.count)
+                for t in totals
+            ],
+            [
+                ("KRW", datetime.date(2024, 1, 1), 700, 1000, -300, 2),
+                ("KRW", datetime.date(2024, 3, 1), -200, 0, -200, 1),
+                ("USD", datetime.date(2024, 1, 1), 50, 50, 0, 1),
+            ],
+        )
+
+    def test_totals_of_partial_range(self):
+        """월 중간 범위와 계좌 조건은 거래에서 바로 집계하는지 테스트합니다."""
+        with self.assertNumQueries(2):
+            totals = get_transaction_totals(
+                [TransactionGrouping.TYPE, TransactionGrouping.RETAILER],
+                start=datetime.date(2024, 1, 15),
+                end=datetime.date(2024, 3, 31),
+                account_ids=[self.krw.id],
+            )
+
+        self.assertEqual(
+            [(t.currency, t.type, t.retailer, t.total, t.count) for t in totals],
+            [("KRW", TransactionCategory.GROCERY, self.market, -500, 2)],
+        )
+
+    def test_balance_history(self):
+        """거래가 없는 달은 이전 달 잔액을 이어받는지 테스트합니다."""
+        history = get_balance_history(
+            datetime.date(2024, 2, 1), datetime.date(2024, 3, 31), [self.krw.id]
+        )
+
+        self.assertEqual(len(history), 1)
+        self.assertEqual(
+            history[0].points,
+            [(datetime.date(2024, 2, 1), 700), (datetime.date(2024, 3, 1), 500)],
+        )
+
+    def test_graphql_queries(self):
+        """집계 필드를 GraphQL 요청 한 번으로 조회하는지 테스트합니다."""
+        query = """
+        query {
+          transactionTotal(groupBy: [TYPE], start: "2024-01-01", end: "2024-01-31") {
+            currency
+            type
+            total
+          }
+          balanceSeries(start: "2024-01-01", end: "2024-01-31", accounts: ["%s"]) {
+            account { name }
+            points { month balance }
+          }
+        }
+        """ % to_base64(
+            "AccountNode", self.usd.id
+        )
+
+        response = self.client.post(
+            "/money/graphql", {"query": query}, content_type="application/json"
+        )
+
+        data = response.json()
+        self.assertNotIn("errors", data)
+        self.assertEqual(
+            data["data"]["transactionTotal"],
+            [
+                {"currency": "KRW", "type": "ETC", "total": "1000.00"},
+                {"currency": "KRW", "type": "GROCERY", "total": "-300.00"},
+                {"currency": "USD", "type": "ETC", "total": "50.00"},
+            ],
+        )
+        self.assertEqual(
+            data["data"]["balanceSeries"],
+            [
+                {
+                    "account": {"name": "USD Account"},
+                    "points": [{"month": "2024-01-01", "balance": "50.00"}],
+                }
+            ],
+        )
+
+    def test_graphql_invalid_account_ids(self):
+        """다른 타입이나 숫자가 아닌 계좌 ID를 GraphQL 오류로 거부하는지 테스트합니다."""
+        for account in (
+            to_base64("RetailerNode", self.usd.id),
+            to_base64("AccountNode", "usd"),
+        ):
+            query = (
+                'query { balanceSeries(start: "2024-01-01", end: "2024-01-31", '
+                'accounts: ["%s"]) { points { month } } }' % account
+            )
+            response = self.client.post(
+                "/money/graphql", {"query": query}, content_type="application/json"
+            )
+
+            self.assertEqual(
+                response.json()["errors"][0]["message"],
+                f"Invalid account id: {account}",
+            )
@@ -0,0 +1,303 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from money.choices import AccountType
+from money.helpers import ledger
+from money.helpers.balance import (
+    update_account_balance,
+    update_balance_since,
+    update_stock_balance,
+)
+from money.helpers.month_end import get_month_end_balances
+from money.models.accounts import Account, Bank
+from money.models.stocks import Stock, StockTransaction
+from money.models.transactions import Transaction
+
+
+class UpdateBalanceTest(TestCase):
+    """잔액 재계산 엔진을 테스트하는 클래스"""
+
+    def setUp(self):
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Test Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+
+    def create_transaction(self, day, amount):
+        return Transaction.objects.create(
+            account=self.account,
+            date=datetime.date(2024, 1, day),
+            amount=Decimal(amount),
+        )
+
+    def test_running_balance(self):
+        """같은 날짜의 거래는 입금이 먼저 계산되는지 테스트합니다."""
+        first = self.create_transaction(1, "100.00")
+        withdraw = self.create_transaction(2, "-30.50")
+        deposit = self.create_transaction(2, "10.00")
+        last = self.create_transaction(3, "-79.50")
+
+        update_account_balance(self.account)
+
+        balances = {
+            t.pk: t.balance for t in Transaction.objects.filter(account=self.account)
+        }
+        self.assertEqual(balances[first.pk], Decimal("100.00"))
+        self.assertEqual(balances[deposit.pk], Decimal("110.00"))
+        self.assertEqual(balances[withdraw.pk], Decimal("79.50"))
+        self.assertEqual(balances[last.pk], Decimal("0.00"))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal("0.00"))
+        self.assertEqual(self.account.first_transaction, datetime.date(2024, 1, 1))
+        self.assertEqual(self.account.last_transaction, datetime.date(2024, 1, 3))
+        self.assertIsNotNone(self.account.last_update)
+
+    def test_stock_balance_per_stock(self):
+        """주식 잔고가 종목별로 누적되는지 테스트합니다."""
+        apple = Stock.objects.create(name="Apple", ticker="AAPL")
+        google = Stock.objects.create(name="Google", ticker="GOOG")
+
+        rows = []
+        for day, stock, shares in (
+            (1, apple, "2"),
+            (2, google, "1.5"),
+            (3, apple, "-1"),
+            (4, google, "0.5"),
+        ):
+            rows.append(
+                StockTransaction.objects.create(
+                    account=self.account,
+                    stock=stock,
+                    date=datetime.date(2024, 1, day),
+                    price=Decimal(10),
+                    shares=Decimal(shares),
+                    amount=Decimal(10) * Decimal(shares),
+                )
+            )
+
+        update_stock_balance(self.account)
+
+        for row, expected in zip(rows, ("2", "1.5", "1", "2")):
+            row.refresh_from_db()
+            self.assertEqual(row.balance, Decimal(expected))
+
+    def test_update_balance_view(self):
+        """update_balance 뷰가 잔액을 갱신하는지 테스트합니다."""
+        self.create_transaction(1, "100.00")
+        self.create_transaction(2, "-40.00")
+
+        response = self.client.get(
+            reverse("money:update_balance", kwargs={"account_id": self.account.id})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal("60.00"))
+
+
+class IncrementalBalanceTest(TestCase):
+    """수정된 날짜 이후만 잔액을 재계산하는지 테스트하는 클래스"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpassword"
+        )
+        self.client.login(username="testuser", password="testpassword")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Test Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.transactions = [
+            Transaction.objects.create(
+                account=self.account,
+                date=datetime.date(2024, 1, day),
+                amount=Decimal(amount),
+            )
+            for day, amount in ((1, "100"), (2, "-20"), (3, "50"), (4, "-10"))
+        ]
+        update_account_balance(self.account)
+
+    def balances(self):
+        return list(
+            Transaction.objects.filter(account=self.account)
+            .order_by("date", "-amount", "id")
+            .values_list("balance", flat=True)
+        )
+
+    def test_update_balance_since(self):
+        """이전 거래의 저장된 잔액부터 이어서 계산하는지 테스트합니다."""
+        Transaction.objects.filter(pk=self.transactions[2].pk).update(amount=70)
+
+        with self.assertNumQueries(4):
+            update_balance_since(self.account, datetime.date(2024, 1, 3))
+
+        self.assertEqual(self.balances(), [100, 80, 150, 140])
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal(140))
+        self.assertEqual(self.account.last_transaction, datetime.date(2024, 1, 4))
+
+    def test_delete_last_transaction(self):
+        """마지막 거래가 삭제되면 이전 거래 기준으로 계좌를 갱신하는지 테스트합니다."""
+        self.transactions[3].delete()
+
+        update_balance_since(self.account, datetime.date(2024, 1, 4))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal(130))
+        self.assertEqual(self.account.last_transaction, datetime.date(2024, 1, 3))
+
+    def test_delete_every_transaction(self):
+        """계좌의 거래가 모두 삭제되면 첫 거래일과 마지막 거래일을 비우는지 테스트합니다."""
+        Transaction.objects.filter(account=self.account).delete()
+
+        update_balance_since(self.account, datetime.date(2024, 1, 1))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal(0))
+        self.assertIsNone(self.account.first_transaction)
+        self.assertIsNone(self.account.last_transaction)
+
+    def test_transaction_update_view(self):
+        """거래 날짜를 옮기면 이전 날짜부터 잔액이 갱신되는지 테스트합니다."""
+        moved = self.transactions[1]
+        response = self.client.post(
+            reverse("money:transaction_update", kwargs={"pk": moved.pk}),
+            {
+                "account": self.account.pk,
+                "type": moved.type,
+                "date": "2024-01-05",
+                "amount": "-20",
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.balances(), [100, 150, 140, 120])
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.last_transaction, datetime.date(2024, 1, 5))
+
+    def test_create_transaction_mutation(self):
+        """GraphQL로 거래를 추가하면 계좌 잔액이 갱신되는지 테스트합니다."""
+        query = """
+        mutation {
+          createTransaction(data: {
+            amount: 30,
+            date: "2024-01-02",
+            account: {set: "%s"},
+            isInternal: false
+          }) {
+            id
+          }
+        }
+        """ % (
+            self.account.id
+        )
+
+        response = self.client.post(
+            "/money/graphql", {"query": query}, content_type="application/json"
+        )
+
+        self.assertNotIn("errors", response.json())
+        self.assertEqual(self.balances(), [100, 130, 110, 160, 150])
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal(150))
+
+
+class MonthEndBalanceTest(TestCase):
+    """월말 잔액 조회를 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.accounts = [
+            Account.objects.create(
+                name=f"Account {i}",
+                bank=self.bank,
+                amount=0,
+                currency="KRW",
+                type=AccountType.CHECKING_ACCOUNT,
+            )
+            for i in range(3)
+        ]
+        for account in self.accounts:
+            for transaction_date, amount in (
+                (datetime.date(2023, 12, 31), "10"),
+                (datetime.date(2024, 1, 5), "100"),
+                (datetime.date(2024, 1, 31), "-30"),
+                (datetime.date(2024, 1, 31), "20"),
+                (datetime.date(2024, 3, 1), "5"),
+            ):
+                Transaction.objects.create(
+                    account=account, date=transaction_date, amount=Decimal(amount)
+                )
+            ledger.transactions_changed([(account.id, datetime.date(2023, 12, 31))])
+
+    def get_balances(self, **params):
+        response = self.client.get(reverse("money:get_end_month_balance"), params)
+        return {
+            row["account_id"]: [
+                (balance["year"], balance["month"], Decimal(balance["balance"]))
+                for balance in row["balance"]
+            ]
+            for row in response.json()["end_month_balances"]
+        }
+
+    def test_year(self):
+        """계좌마다 달별 마지막 거래의 잔액을 반환하는지 테스트합니다."""
+        expected = [(2024, 1, Decimal(100)), (2024, 3, Decimal(105))]
+        self.assertEqual(
+            self.get_balances(year=2024),
+            {account.id: expected for account in self.accounts},
+        )
+
+    def test_date_range(self):
+        """여러 해에 걸친 기간도 조회할 수 있는지 테스트합니다."""
+        balances = self.get_balances(start="2023-12-01", end="2024-02-29")
+        self.assertEqual(
+            balances[self.accounts[0].id],
+            [(2023, 12, Decimal(10)), (2024, 1, Decimal(100))],
+        )
+
+    def test_cached_until_write(self):
+        """캐시된 연도는 쿼리 없이 조회되고 거래가 바뀌면 다시 계산되는지 테스트합니다."""
+        get_month_end_balances(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+        with self.assertNumQueries(1):
+            get_month_end_balances(
+                datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+            )
+
+        account = self.accounts[0]
+        Transaction.objects.create(
+            account=account, date=datetime.date(2023, 6, 1), amount=Decimal(1)
+        )
+        ledger.transactions_changed([(account.id, datetime.date(2023, 6, 1))])
+
+        self.assertEqual(
+            self.get_balances(year=2024)[account.id],
+            [(2024, 1, Decimal(101)), (2024, 3, Decimal(106))],
+        )
+
+    def test_invalid_year(self):
+        """잘못된 연도는 400을 반환하는지 테스트합니다."""
+        response = self.client.get(
+            reverse("money:get_end_month_balance"), {"year": "abc"}
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,162 @@
+import datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from money.choices import AccountType, RuleField, RuleMatchType, TransactionCategory
+from money.helpers import ledger
+from money.helpers.categorization import apply_rules
+from money.models.accounts import Account, Bank
+from money.models.shoppings import Retailer
+from money.models.transactions import (
+    CategorizationRule,
+    Transaction,
+    TransactionMonthlySummary,
+)
+
+
+class CategorizationRuleTest(TestCase):
+    """규칙 기반 거래 분류를 테스트하는 클래스"""
+
+    def setUp(self):
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Test Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.other_account = Account.objects.create(
+            name="Other Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.friend = Retailer.objects.create(name="친구")
+        self.lotto = Retailer.objects.create(name="로또")
+
+    def create(self, retailer, note="", account=None, reviewed=False):
+        return Transaction.objects.create(
+            account=account or self.account,
+            date=datetime.date(2024, 1, 1),
+            amount=Decimal(-100),
+            raw={"retailer": retailer, "note": note, "type": "출금"},
+            reviewed=reviewed,
+        )
+
+    def rule(self, pattern, match_type=RuleMatchType.EXACT, **kwargs):
+        return CategorizationRule.objects.create(
+            name=pattern, pattern=pattern, match_type=match_type, **kwargs
+        )
+
+    def test_match_types_and_priority(self):
+        """일치, 포함, 정규식 조건과 우선순위대로 분류하는지 테스트합니다."""
+        self.rule(
+            "김호영",
+            retailer=self.friend,
+            type=TransactionCategory.TRANSFER,
+            reviewed=True,
+        )
+        self.rule(
+            "동행복권",
+            RuleMatchType.CONTAINS,
+            retailer=self.lotto,
+            type=TransactionCategory.LEISURE,
+            reviewed=True,
+        )
+        self.rule(
+            "^(일반이체|일반입금)$",
+            RuleMatchType.REGEX,
+            field=RuleField.NOTE,
+            required_fields={"retailer": "박윤재"},
+            type=TransactionCategory.TRANSFER,
+            is_internal=True,
+        )
+        self.rule("김", RuleMatchType.CONTAINS, priority=200, type="ETC")
+        friend = self.create("김호영")
+        lotto = self.create("동행복권(로또)")
+        internal = self.create("박윤재", note="일반입금")
+        not_internal = self.create("김철수", note="일반입금")
+        reviewed = self.create("김호영", reviewed=True)
+
+        self.assertEqual(apply_rules(), 3)
+
+        def state(transaction):
+            transaction.refresh_from_db()
+            return (
+                transaction.retailer_id,
+                transaction.type,
+                transaction.is_internal,
+                transaction.reviewed,
+            )
+
+        self.assertEqual(state(friend), (self.friend.id, "TRANSFER", False, True))
+        self.assertEqual(state(lotto), (self.lotto.id, "LEISURE", False, True))
+        self.assertEqual(state(internal), (None, "TRANSFER", True, False))
+        self.assertEqual(state(not_internal), (None, "ETC", False, False))
+        self.assertEqual(state(reviewed), (None, "ETC", False, True))
+
+    def test_account_scope(self):
+        """계좌를 지정한 규칙은 그 계좌의 거래만 분류하는지 테스트합니다."""
+        self.rule("김호영", account=self.account, retailer=self.friend)
+        scoped = self.create("김호영")
+        other = self.create("김호영", account=self.other_account)
+
+        apply_rules()
+
+        scoped.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(scoped.retailer, self.friend)
+        self.assertIsNone(other.retailer)
+
+    def test_batches_and_monthly_summary(self):
+        """여러 묶음을 같은 쿼리 수로 저장하고 월별 요약을 갱신하는지 테스트합니다."""
+        self.rule("김호영", retailer=self.friend, type=TransactionCategory.TRANSFER)
+        for _ in range(6):
+            self.create("김호영")
+        ledger.transactions_changed([(self.account.id, datetime.date(2024, 1, 1))])
+
+        with self.assertNumQueries(9):
+            self.assertEqual(apply_rules(batch_size=2), 6)
+
+        self.assertEqual(
+            list(TransactionMonthlySummary.objects.values_list("type", "retailer")),
+            [("TRANSFER", self.friend.id)],
+        )
+        self.assertEqual(apply_rules(), 0)
+
+    def test_invalid_and_grouped_patterns(self):
+        """잘못된 정규식은 막고 역참조가 있는 규칙도 분류하는지 테스트합니다."""
+        invalid = CategorizationRule(
+            name="invalid", pattern="(", match_type=RuleMatchType.REGEX
+        )
+        with self.assertRaises(ValidationError):
+            invalid.full_clean()
+        invalid.save()
+
+        self.rule(r"(.)\1", RuleMatchType.REGEX, retailer=self.friend)
+        self.rule("로또", RuleMatchType.CONTAINS, retailer=self.lotto)
+        repeated = self.create("김김")
+        lotto = self.create("동행복권(로또)")
+
+        self.assertEqual(apply_rules(), 2)
+        repeated.refresh_from_db()
+        lotto.refresh_from_db()
+        self.assertEqual(repeated.retailer, self.friend)
+        self.assertEqual(lotto.retailer, self.lotto)
+
+    def test_keeps_categorized_transactions(self):
+        """분류를 직접 바꾼 거래는 검토 전이어도 덮어쓰지 않는지 테스트합니다."""
+        self.rule("김호영", retailer=self.friend, type=TransactionCategory.TRANSFER)
+        edited = self.create("김호영")
+        edited.type = TransactionCategory.PRESENT
+        edited.save()
+
+        self.assertEqual(apply_rules(), 0)
+        edited.refresh_from_db()
+        self.assertEqual(
+            (edited.retailer, edited.type), (None, TransactionCategory.PRESENT)
+        )
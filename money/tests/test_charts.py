@@ -0,0 +1,80 @@
+import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from money.choices import AccountType
+from money.helpers import ledger
+from money.helpers.charts import get_account_chart_series
+from money.models.accounts import Account, Bank
+from money.models.transactions import Transaction
+
+
+class AccountChartSeriesTest(TestCase):
+    """계좌 잔액 차트 다운샘플링을 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Test Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.start = datetime.date(2020, 1, 1)
+
+    def create_history(self, days):
+        Transaction.objects.bulk_create(
+            Transaction(
+                account=self.account,
+                date=self.start + datetime.timedelta(days=day),
+                amount=Decimal(1),
+            )
+            for day in range(days)
+        )
+        ledger.transactions_changed([(self.account.id, self.start)])
+        self.account.refresh_from_db()
+
+    def test_short_history_keeps_every_day(self):
+        """기간이 짧으면 일 단위로 모든 잔액을 그리는지 테스트합니다."""
+        self.create_history(10)
+
+        series = get_account_chart_series(self.account)
+
+        self.assertEqual(len(series), 10)
+        self.assertEqual(series[0], {"x": "2020-01-01", "y": "1.00"})
+        self.assertEqual(series[-1], {"x": "2020-01-10", "y": "10.00"})
+
+    def test_long_history_is_bounded_and_keeps_spikes(self):
+        """기간이 길어도 점 개수가 제한되고 급등락이 남는지 테스트합니다."""
+        self.create_history(2000)
+        spike_date = self.start + datetime.timedelta(days=1234)
+        Transaction.objects.create(
+            account=self.account, date=spike_date, amount=Decimal(100000)
+        )
+        Transaction.objects.create(
+            account=self.account, date=spike_date, amount=Decimal(-100000)
+        )
+        ledger.transactions_changed([(self.account.id, spike_date)])
+        self.account.refresh_from_db()
+
+        series = get_account_chart_series(self.account, max_points=100)
+
+        self.assertLessEqual(len(series), 100)
+        self.assertEqual(series[0]["x"], "2020-01-01")
+        self.assertEqual(series[-1]["y"], "2000.00")
+        self.assertIn("101235.00", [point["y"] for point in series])
+
+    def test_cached_until_write(self):
+        """다음 거래 기록 전까지 캐시를 사용하는지 테스트합니다."""
+        self.create_history(10)
+        get_account_chart_series(self.account)
+
+        with self.assertNumQueries(0):
+            get_account_chart_series(self.account)
+
+        self.create_history(1)
+        self.assertEqual(get_account_chart_series(self.account)[-1]["y"], "11.00")
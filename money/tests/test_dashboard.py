@@ -0,0 +1,72 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from money.choices import AccountType, CurrencyType
+from money.helpers import ledger
+from money.helpers.helper import get_transaction_summary
+from money.models.accounts import Account, Bank
+from money.models.transactions import Transaction
+
+
+class HomeViewTest(TestCase):
+    """홈 화면 요약을 테스트하는 클래스"""
+
+    def setUp(self):
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+        self.bank = Bank.objects.create(name="Test Bank")
+
+        self.last_month = datetime.date.today().replace(day=1) - datetime.timedelta(
+            days=1
+        )
+        self.this_month = datetime.date.today().replace(day=1)
+
+    def create_account(self, currency):
+        account = Account.objects.create(
+            name=f"Account {Account.objects.count()}",
+            bank=self.bank,
+            amount=0,
+            currency=currency,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        for transaction_date, amount in (
+            (self.last_month - datetime.timedelta(days=40), "100"),
+            (self.last_month, "50"),
+            (self.last_month, "-30"),
+            (self.this_month, "10"),
+        ):
+            Transaction.objects.create(
+                account=account, date=transaction_date, amount=Decimal(amount)
+            )
+        ledger.transactions_changed([(account.id, self.last_month)])
+        account.refresh_from_db()
+        return account
+
+    def test_previous_month_balance(self):
+        """지난달 마지막 거래의 잔액으로 증감을 계산하는지 테스트합니다."""
+        accounts = [self.create_account(CurrencyType.USD) for _ in range(2)]
+        accounts.append(self.create_account(CurrencyType.KRW))
+
+        summary = dict(get_transaction_summary(accounts))
+
+        self.assertEqual(summary["USD"]["current"], Decimal(260))
+        self.assertEqual(summary["USD"]["prev"], Decimal(240))
+        self.assertEqual(summary["USD"]["diff"], Decimal(20))
+        self.assertEqual(summary["KRW"]["prev"], Decimal(120))
+
+    def test_query_count_does_not_grow_with_accounts(self):
+        """계좌 수와 관계없이 홈 화면의 쿼리 수가 고정되는지 테스트합니다."""
+        self.create_account(CurrencyType.USD)
+        with self.assertNumQueries(7):
+            self.client.get(reverse("money:home"))
+
+        for _ in range(5):
+            self.create_account(CurrencyType.USD)
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse("money:home"))
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,601 @@
+import datetime
+import json
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from strawberry.relay.utils import from_base64, to_base64
+
+from money.choices import AccountType
+from money.helpers import ledger
+from money.helpers.balance import update_account_balance
+from money.helpers.persisted_queries import query_hash
+from money.models.accounts import Account, Bank
+from money.models.shoppings import AmazonOrder
+from money.models.stocks import Stock, StockPosition, StockTransaction
+from money.models.transactions import Transaction
+
+BANK_QUERY = """
+query {
+  bankRelay {
+    edges {
+      node {
+        name
+        balance { currency value }
+        accountSet {
+          edges { node { name transactionCount latestBalance } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class BatchedFieldTest(TestCase):
+    """계산 필드를 요청마다 묶어서 조회하는지 테스트하는 클래스"""
+
+    def setUp(self):
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+    def create_bank(self, name):
+        bank = Bank.objects.create(name=name)
+        for currency, amounts in (("KRW", ("1000", "-300")), ("USD", ("50",))):
+            account = Account.objects.create(
+                name=f"{name} {currency}",
+                bank=bank,
+                amount=0,
+                currency=currency,
+                type=AccountType.CHECKING_ACCOUNT,
+            )
+            for day, amount in enumerate(amounts, start=1):
+                Transaction.objects.create(
+                    account=account,
+                    date=datetime.date(2024, 1, day),
+                    amount=Decimal(amount),
+                )
+            update_account_balance(account)
+        return bank
+
+    def query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/money/graphql", {"query": BANK_QUERY}, content_type="application/json"
+            )
+        data = response.json()
+        self.assertNotIn("errors", data)
+        return data["data"]["bankRelay"]["edges"], len(queries)
+
+    def test_bank_relay(self):
+        """은행 수와 관계없이 잔액, 거래 수, 최근 잔액의 쿼리 수가 같은지 테스트합니다."""
+        self.create_bank("A Bank")
+        _, one_bank_queries = self.query()
+
+        self.create_bank("B Bank")
+        self.create_bank("C Bank")
+        edges, queries = self.query()
+
+        self.assertEqual(queries, one_bank_queries)
+        self.assertEqual(len(edges), 3)
+        node = edges[0]["node"]
+        self.assertEqual(
+            sorted(node["balance"], key=lambda balance: balance["currency"]),
+            [
+                {"currency": "KRW", "value": "700.00"},
+                {"currency": "USD", "value": "50.00"},
+            ],
+        )
+        self.assertEqual(
+            node["accountSet"]["edges"],
+            [
+                {
+                    "node": {
+                        "name": "A Bank KRW",
+                        "transactionCount": 2,
+                        "latestBalance": "700.00",
+                    }
+                },
+                {
+                    "node": {
+                        "name": "A Bank USD",
+                        "transactionCount": 1,
+                        "latestBalance": "50.00",
+                    }
+                },
+            ],
+        )
+
+
+TRANSACTION_QUERY = """
+query ($first: Int, $last: Int, $after: String, $before: String, $order: TransactionOrder) {
+  transactionRelay(
+    first: $first, last: $last, after: $after, before: $before, order: $order
+  ) {
+    pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+    edges { cursor node { amount } }
+  }
+}
+"""
+
+
+class KeysetPaginationTest(TestCase):
+    """거래 목록을 (날짜, id) 커서로 넘기는지 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Test Account",
+            bank=bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        # Amounts follow the (date, id) order
+        for amount, day in ((1, 1), (2, 2), (3, 2), (4, 3), (5, 5)):
+            Transaction.objects.create(
+                account=self.account,
+                date=datetime.date(2024, 1, day),
+                amount=Decimal(amount),
+            )
+
+    def query(self, query=TRANSACTION_QUERY, **variables):
+        response = self.client.post(
+            "/money/graphql",
+            {"query": query, "variables": variables},
+            content_type="application/json",
+        )
+        data = response.json()
+        self.assertNotIn("errors", data)
+        return data["data"]["transactionRelay"]
+
+    def amounts(self, page):
+        return [int(Decimal(edge["node"]["amount"])) for edge in page["edges"]]
+
+    def test_pages_forward(self):
+        """다음 페이지가 마지막 커서 이후부터 이어지는지 테스트합니다."""
+        pages = []
+        after = None
+        while True:
+            page = self.query(first=2, after=after)
+            pages.append(self.amounts(page))
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            after = page["pageInfo"]["endCursor"]
+
+        self.assertEqual(pages, [[1, 2], [3, 4], [5]])
+        self.assertTrue(page["pageInfo"]["hasPreviousPage"])
+
+    def test_pages_descending_and_backward(self):
+        """날짜 내림차순과 뒤쪽 페이지를 커서로 넘기는지 테스트합니다."""
+        first = self.query(first=2, order={"date": "DESC"})
+        self.assertEqual(self.amounts(first), [5, 4])
+
+        second = self.query(
+            first=2, after=first["pageInfo"]["endCursor"], order={"date": "DESC"}
+        )
+        self.assertEqual(self.amounts(second), [3, 2])
+
+        back = self.query(
+            last=1, before=second["pageInfo"]["startCursor"], order={"date": "DESC"}
+        )
+        self.assertEqual(self.amounts(back), [4])
+        self.assertTrue(back["pageInfo"]["hasPreviousPage"])
+        self.assertTrue(back["pageInfo"]["hasNextPage"])
+
+    def test_default_and_date_id_orders_use_keyset(self):
+        """기본 정렬과 (날짜, id) 정렬도 커서로 넘기는지 테스트합니다."""
+        # Created last but dated first, so id and (date, id) orders differ
+        Transaction.objects.create(
+            account=self.account, date=datetime.date(2023, 12, 31), amount=Decimal(0)
+        )
+
+        for order, expected in (
+            (None, [[1, 2], [3, 4], [5, 0]]),
+            ({"date": "DESC"}, [[5, 4], [3, 2], [1, 0]]),
+            ({"date": "DESC", "id": "DESC"}, [[0, 5], [4, 3], [2, 1]]),
+        ):
+            pages = []
+            after = None
+            while True:
+                page = self.query(first=2, after=after, order=order)
+                pages.append(self.amounts(page))
+                self.assertTrue(
+                    all(
+                        from_base64(edge["cursor"])[0] == "transaction"
+                        for edge in page["edges"]
+                    )
+                )
+                if not page["pageInfo"]["hasNextPage"]:
+                    break
+                after = page["pageInfo"]["endCursor"]
+            self.assertEqual(pages, expected)
+
+    def test_other_order_pages_by_offset(self):
+        """날짜가 아닌 정렬은 오프셋으로 넘기는지 테스트합니다."""
+        page = self.query(first=2, order={"amount": "DESC"})
+        self.assertEqual(self.amounts(page), [5, 4])
+
+        page = self.query(
+            first=2, after=page["pageInfo"]["endCursor"], order={"amount": "DESC"}
+        )
+        self.assertEqual(self.amounts(page), [3, 2])
+
+    def test_counts(self):
+        """전체 개수를 캐시하고 거래가 저장, 삭제되거나 원장이 바뀌면 다시 세는지 테스트합니다."""
+        query = "query { transactionRelay { totalCount estimatedCount } }"
+        self.assertEqual(self.query(query)["totalCount"], 5)
+        self.assertIsInstance(self.query(query)["estimatedCount"], int)
+
+        Transaction.objects.filter(amount=5).delete()
+        self.assertEqual(self.query(query)["totalCount"], 4)
+
+        Transaction.objects.create(
+            account=self.account, date=datetime.date(2024, 1, 6), amount=Decimal(6)
+        )
+        self.assertEqual(self.query(query)["totalCount"], 5)
+
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    account=self.account, date=datetime.date(2024, 1, 7), amount=7
+                )
+            ]
+        )
+        self.assertEqual(self.query(query)["totalCount"], 5)
+        ledger.transactions_changed([(self.account.id, datetime.date(2024, 1, 7))])
+        self.assertEqual(self.query(query)["totalCount"], 6)
+
+
+class PersistedQueryTest(TestCase):
+    """해시로 보낸 persisted query를 테스트하는 클래스"""
+
+    query = "query { salaryYears }"
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.allow_list_path = Path(directory.name) / "persisted_queries.json"
+
+    def post(self, sha256=None, query=None):
+        body = {}
+        if query is not None:
+            body["query"] = query
+        if sha256 is not None:
+            body["extensions"] = {
+                "persistedQuery": {"version": 1, "sha256Hash": sha256}
+            }
+        with override_settings(GRAPHQL_PERSISTED_QUERIES_PATH=self.allow_list_path):
+            return self.client.post(
+                "/money/graphql", body, content_type="application/json"
+            )
+
+    def test_register_and_reuse(self):
+        """처음 쿼리와 함께 보낸 해시를 다음 요청부터 쿼리 없이 쓰는지 테스트합니다."""
+        sha256 = query_hash(self.query)
+
+        response = self.post(sha256)
+        self.assertEqual(
+            response.json(),
+            {
+                "errors": [
+                    {
+                        "message": "PersistedQueryNotFound",
+                        "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                    }
+                ]
+            },
+        )
+
+        response = self.post(sha256, self.query)
+        self.assertEqual(response.json(), {"data": {"salaryYears": []}})
+
+        response = self.post(sha256)
+        self.assertEqual(response.json(), {"data": {"salaryYears": []}})
+
+    def test_hash_mismatch(self):
+        """쿼리와 해시가 다르면 거부하는지 테스트합니다."""
+        response = self.post(query_hash("query { other }"), self.query)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_allow_list_only(self):
+        """허용 목록만 받을 때 목록의 해시만 실행하는지 테스트합니다."""
+        sha256 = query_hash(self.query)
+        self.allow_list_path.write_text(json.dumps({sha256: self.query}))
+
+        with override_settings(GRAPHQL_PERSISTED_QUERIES_ONLY=True):
+            response = self.post(sha256)
+            self.assertEqual(response.json(), {"data": {"salaryYears": []}})
+
+            response = self.post(query="query { salarySummary { year } }")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(
+                response.json()["errors"][0]["extensions"],
+                {"code": "PERSISTED_QUERY_NOT_ALLOWED"},
+            )
+
+    def test_invalid_extension(self):
+        """persistedQuery가 객체가 아니면 오류로 거부하는지 테스트합니다."""
+        with override_settings(GRAPHQL_PERSISTED_QUERIES_PATH=self.allow_list_path):
+            response = self.client.post(
+                "/money/graphql",
+                {"extensions": {"persistedQuery": "abc"}},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"][0]["message"], "Invalid persistedQuery extension"
+        )
+
+
+BULK_TRANSACTIONS = """
+mutation ($data: [TransactionInput!]!) {
+  createTransactions(data: $data) {
+    nodes { id amount }
+    errors { index field message }
+  }
+}
+"""
+
+BULK_UPDATE_TRANSACTIONS = """
+mutation ($data: [TransactionPartialInput!]!) {
+  updateTransactions(data: $data) {
+    nodes { id date }
+    errors { index field message }
+  }
+}
+"""
+
+BULK_STOCK_TRANSACTIONS = """
+mutation ($data: [StockTransactionInput!]!) {
+  createStockTransactions(data: $data) {
+    nodes { id shares }
+    errors { index field message }
+  }
+}
+"""
+
+BULK_AMAZON_ORDERS = """
+mutation ($data: [AmazonOrderInput!]!) {
+  createAmazonOrders(data: $data) {
+    nodes { id item }
+    errors { index field message }
+  }
+}
+"""
+
+
+class BulkMutationTest(TestCase):
+    """여러 행을 한 번에 등록하고 수정하는 뮤테이션을 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Checking",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.other = Account.objects.create(
+            name="Saving",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+
+    def mutate(self, query, data, name):
+        response = self.client.post(
+            "/money/graphql",
+            {"query": query, "variables": {"data": data}},
+            content_type="application/json",
+        )
+        result = response.json()
+        self.assertNotIn("errors", result)
+        return result["data"][name]
+
+    def transaction_input(self, account, day, amount):
+        return {
+            "account": {"set": str(account.id)},
+            "date": f"2024-01-{day:02d}",
+            "amount": amount,
+            "type": "ETC",
+            "isInternal": False,
+            "note": "",
+        }
+
+    def balances(self, account):
+        return list(
+            Transaction.objects.filter(account=account)
+            .order_by("date", "id")
+            .values_list("amount", "balance")
+        )
+
+    def test_create_transactions(self):
+        """여러 계좌의 거래를 한 번에 등록하고 계좌마다 잔액을 갱신하는지 테스트합니다."""
+        payload = self.mutate(
+            BULK_TRANSACTIONS,
+            [
+                self.transaction_input(self.account, 1, "1000"),
+                self.transaction_input(self.other, 2, "500"),
+                self.transaction_input(self.account, 3, "-300"),
+            ],
+            "createTransactions",
+        )
+
+        self.assertEqual(payload["errors"], [])
+        self.assertEqual(len(payload["nodes"]), 3)
+        self.assertEqual(
+            self.balances(self.account),
+            [(Decimal(1000), Decimal(1000)), (Decimal(-300), Decimal(700))],
+        )
+        self.assertEqual(self.balances(self.other), [(Decimal(500), Decimal(500))])
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal(700))
+
+    def test_create_transactions_row_errors(self):
+        """잘못된 행이 있으면 행마다 오류를 돌려주고 아무것도 등록하지 않는지 테스트합니다."""
+        payload = self.mutate(
+            BULK_TRANSACTIONS,
+            [
+                self.transaction_input(self.account, 1, "1000"),
+                {
+                    **self.transaction_input(self.account, 2, "500"),
+                    "account": {"set": "0"},
+                },
+                {**self.transaction_input(self.account, 3, "-300"), "amount": "1e20"},
+            ],
+            "createTransactions",
+        )
+
+        self.assertEqual(payload["nodes"], [])
+        self.assertEqual(
+            [(error["index"], error["field"]) for error in payload["errors"]],
+            [(1, "account"), (2, "amount")],
+        )
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_relation_node_types(self):
+        """관계에 다른 타입 노드의 ID를 주면 행 오류로 거부하는지 테스트합니다."""
+        payload = self.mutate(
+            BULK_TRANSACTIONS,
+            [
+                {
+                    **self.transaction_input(self.account, 1, "1000"),
+                    "account": {"set": to_base64("AccountNode", self.account.id)},
+                },
+                {
+                    **self.transaction_input(self.account, 2, "500"),
+                    "account": {"set": to_base64("RetailerNode", self.account.id)},
+                },
+            ],
+            "createTransactions",
+        )
+
+        self.assertEqual(
+            payload["errors"],
+            [
+                {
+                    "index": 1,
+                    "field": "account",
+                    "message": "Expected an id of Account, got one of RetailerNode.",
+                }
+            ],
+        )
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_update_transactions(self):
+        """날짜를 옮긴 거래의 이전 날짜와 새 날짜부터 잔액을 다시 계산하는지 테스트합니다."""
+        created = self.mutate(
+            BULK_TRANSACTIONS,
+            [
+                self.transaction_input(self.account, 1, "1000"),
+                self.transaction_input(self.account, 5, "-300"),
+                self.transaction_input(self.account, 10, "200"),
+            ],
+            "createTransactions",
+        )
+        last = created["nodes"][2]["id"]
+
+        payload = self.mutate(
+            BULK_UPDATE_TRANSACTIONS,
+            [{"id": last, "date": "2024-01-03"}, {"id": last, "note": "again"}],
+            "updateTransactions",
+        )
+        self.assertEqual(
+            [(error["index"], error["field"]) for error in payload["errors"]],
+            [(1, "id")],
+        )
+
+        payload = self.mutate(
+            BULK_UPDATE_TRANSACTIONS,
+            [{"id": last, "date": "2024-01-03"}],
+            "updateTransactions",
+        )
+        self.assertEqual(payload["errors"], [])
+        self.assertEqual(payload["nodes"][0]["date"], "2024-01-03")
+        self.assertEqual(
+            self.balances(self.account),
+            [
+                (Decimal(1000), Decimal(1000)),
+                (Decimal(200), Decimal(1200)),
+                (Decimal(-300), Decimal(900)),
+            ],
+        )
+
+    def test_create_stock_transactions(self):
+        """주식 거래를 한 번에 등록하고 보유 현황을 갱신하는지 테스트합니다."""
+        stock = Stock.objects.create(name="Apple", ticker="AAPL")
+        related = Transaction.objects.create(
+            account=self.account, date=datetime.date(2024, 1, 1), amount=Decimal(0)
+        )
+        trades = [
+            {
+                "account": {"set": str(self.account.id)},
+                "stock": {"set": str(stock.id)},
+                "relatedTransaction": {"set": str(related.id)},
+                "date": f"2024-01-{day:02d}",
+                "shares": shares,
+                "price": "100",
+                "amount": str(Decimal(shares) * 100),
+                "note": "",
+            }
+            for day, shares in ((2, "10"), (4, "-4"))
+        ]
+
+        payload = self.mutate(
+            BULK_STOCK_TRANSACTIONS, trades, "createStockTransactions"
+        )
+
+        self.assertEqual(payload["errors"], [])
+        self.assertEqual(StockTransaction.objects.count(), 2)
+        self.assertEqual(
+            StockPosition.objects.filter(stock=stock)
+            .order_by("-date")
+            .values_list("shares", flat=True)
+            .first(),
+            Decimal(6),
+        )
+
+    def test_create_amazon_orders(self):
+        """아마존 주문을 한 번에 등록하는지 테스트합니다."""
+        paid = Transaction.objects.create(
+            account=self.account, date=datetime.date(2024, 1, 1), amount=Decimal(-50)
+        )
+        orders = [
+            {
+                "date": "2024-01-01",
+                "item": item,
+                "isReturned": False,
+                "transaction": {"set": str(paid.id)},
+            }
+            for item in ("Book", "Pen")
+        ]
+
+        payload = self.mutate(BULK_AMAZON_ORDERS, orders, "createAmazonOrders")
+
+        self.assertEqual(payload["errors"], [])
+        self.assertEqual(
+            sorted(AmazonOrder.objects.values_list("item", flat=True)),
+            ["Book", "Pen"],
+        )
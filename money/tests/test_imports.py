@@ -0,0 +1,123 @@
+import datetime
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from money.choices import AccountType, TransactionCategory
+from money.helpers.imports import import_transactions, parse_rows
+from money.models.accounts import Account, Bank
+from money.models.transactions import Transaction
+
+KAKAO_BANK = (
+    "2024.11.01 09:00:00\t입금\t1,000\t1,000\t월급\t회사\n"
+    "2024.11.02 12:30:00\t출금\t-300\t700\t점심\t식당\n"
+    "2024.11.03 18:00:00\t출금\t-200\t500\t\t마트\n"
+)
+
+
+class LedgerImportTest(TestCase):
+    """은행 거래내역 일괄 등록을 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Test Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+
+    def run_import(self, file_format, content):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "statement.tsv"
+            path.write_text(content, encoding="utf-8")
+            stdout = StringIO()
+            call_command(
+                "import_transactions",
+                file_format,
+                str(path),
+                account=self.account.id,
+                stdout=stdout,
+            )
+        return stdout.getvalue()
+
+    def test_import_updates_balances_and_skips_duplicates(self):
+        """거래를 등록하고 잔액을 갱신하며 다시 등록하면 건너뛰는지 테스트합니다."""
+        output = self.run_import("kakao_bank", KAKAO_BANK)
+
+        self.assertIn("3 of 3 transactions created, 0 duplicates", output)
+        self.assertEqual(
+            list(Transaction.objects.order_by("date").values_list("amount", "balance")),
+            [
+                (Decimal(1000), Decimal(1000)),
+                (Decimal(-300), Decimal(700)),
+                (Decimal(-200), Decimal(500)),
+            ],
+        )
+        first = Transaction.objects.order_by("date").first()
+        self.assertEqual(json.loads(first.note), first.raw)
+        self.assertEqual(
+            list(
+                Transaction.objects.filter(
+                    raw__contains={"retailer": "회사"}
+                ).values_list("id", flat=True)
+            ),
+            [first.id],
+        )
+
+        output = self.run_import(
+            "kakao_bank", KAKAO_BANK + "2024.11.04 08:00:00\t입금\t50\t550\t\t이자\n"
+        )
+
+        self.assertIn("1 of 4 transactions created, 3 duplicates", output)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal(550))
+
+    def test_import_in_batches(self):
+        """여러 묶음으로 나눠 등록해도 파일 안의 중복을 건너뛰는지 테스트합니다."""
+        lines = KAKAO_BANK.splitlines(keepends=True)
+
+        with self.assertNumQueries(18):
+            result = import_transactions(
+                self.account.id, parse_rows("kakao_bank", lines + lines), 2
+            )
+
+        self.assertEqual((result.rows, result.created, result.duplicates), (6, 3, 3))
+
+    def test_kb_bank_and_nhbank_housing(self):
+        """국민은행과 주택청약 형식을 읽는지 테스트합니다."""
+        self.run_import(
+            "kb_bank",
+            "2024.11.01 09:00:00\t급여\t회 사\t\t0\t1,000\t1,000\n"
+            "2024.11.02 09:00:00\t체크카드\t식당\t\t300\t0\t700\n",
+        )
+        self.run_import("nhbank_housing", "2024-12-01\n\n2025-01-01\n")
+
+        self.assertEqual(
+            list(
+                Transaction.objects.order_by("date").values_list(
+                    "date", "amount", "type", "is_internal"
+                )
+            ),
+            [
+                (datetime.date(2024, 11, 1), 1000, TransactionCategory.ETC, False),
+                (datetime.date(2024, 11, 2), -300, TransactionCategory.ETC, False),
+                (datetime.date(2024, 12, 1), 100000, "TRANSFER", True),
+                (datetime.date(2025, 1, 1), 100000, "TRANSFER", True),
+            ],
+        )
+
+    def test_invalid_row_rolls_back(self):
+        """잘못된 줄이 있으면 아무것도 등록하지 않는지 테스트합니다."""
+        with self.assertRaisesMessage(CommandError, "line 4"):
+            self.run_import("kakao_bank", KAKAO_BANK + "2024.11.04\t입금\tabc\n")
+
+        self.assertFalse(Transaction.objects.exists())
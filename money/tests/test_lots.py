@@ -0,0 +1,163 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from money.choices import AccountType, CostBasisMethod, CurrencyType
+from money.helpers import lots, positions
+from money.models.accounts import Account, Bank
+from money.models.stocks import RealizedGain, Stock, StockLot, StockTransaction
+
+
+class StockLotTest(TestCase):
+    """주식 취득 단가와 실현/미실현 손익 계산을 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Brokerage",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.STOCK,
+        )
+        self.apple = Stock.objects.create(name="Apple", ticker="AAPL")
+
+    def trade(self, trade_date, shares, price):
+        trade = StockTransaction.objects.create(
+            account=self.account,
+            stock=self.apple,
+            date=trade_date,
+            shares=Decimal(shares),
+            price=Decimal(price),
+            amount=Decimal(shares) * Decimal(price),
+        )
+        positions.stock_transactions_changed(
+            [(self.account.id, self.apple.id, trade.date)]
+        )
+        return trade
+
+    def profit(self, method, year=None):
+        (profit,) = lots.get_stock_profits(method, year)
+        return (
+            profit.shares,
+            profit.cost_basis,
+            profit.market_value,
+            profit.realized_gain,
+            profit.unrealized_gain,
+        )
+
+    def test_fifo_and_average_cost(self):
+        """선입선출과 평균단가로 손익을 계산하는지 테스트합니다."""
+        self.trade(datetime.date(2024, 1, 2), "10", "100")
+        self.trade(datetime.date(2024, 1, 3), "10", "200")
+        self.trade(datetime.date(2024, 1, 5), "-15", "300")
+
+        self.assertEqual(
+            self.profit(CostBasisMethod.FIFO),
+            (Decimal(5), Decimal(1000), Decimal(1500), Decimal(2500), Decimal(500)),
+        )
+        self.assertEqual(
+            self.profit(CostBasisMethod.AVERAGE),
+            (Decimal(5), Decimal(750), Decimal(1500), Decimal(2250), Decimal(750)),
+        )
+
+    def test_incremental_matches_rebuild(self):
+        """이전 날짜의 거래를 추가해도 전체 재계산과 같은지 테스트합니다."""
+        self.trade(datetime.date(2024, 1, 2), "10", "100")
+        self.trade(datetime.date(2024, 1, 5), "-4", "150")
+        self.trade(datetime.date(2024, 1, 8), "-4", "120")
+        self.trade(datetime.date(2024, 1, 4), "3", "110")
+        self.trade(datetime.date(2024, 1, 6), "-1", "130")
+
+        def state():
+            return (
+                sorted(
+                    StockLot.objects.values_list(
+                        "method", "date", "shares", "price", "remaining"
+                    )
+                ),
+                sorted(
+                    RealizedGain.objects.values_list(
+                        "method", "date", "lot__date", "shares", "cost", "gain"
+                    )
+                ),
+            )
+
+        incremental = state()
+        call_command("rebuild_stock_lots", stdout=open("/dev/null", "w"))
+        self.assertEqual(state(), incremental)
+
+    def test_profit_by_year(self):
+        """연도별 실현 손익과 연말 기준 미실현 손익을 계산하는지 테스트합니다."""
+        self.trade(datetime.date(2023, 6, 1), "10", "100")
+        self.trade(datetime.date(2023, 12, 1), "-2", "150")
+        self.trade(datetime.date(2024, 3, 1), "-8", "90")
+
+        self.assertEqual(
+            self.profit(CostBasisMethod.FIFO, 2023),
+            (Decimal(8), Decimal(800), Decimal(1200), Decimal(100), Decimal(400)),
+        )
+        self.assertEqual(
+            self.profit(CostBasisMethod.FIFO, 2024),
+            (Decimal(0), Decimal(0), Decimal(0), Decimal(-80), Decimal(0)),
+        )
+
+    def test_sale_without_lots(self):
+        """보유 수량보다 많이 팔면 초과분은 손익 없이 기록하는지 테스트합니다."""
+        self.trade(datetime.date(2024, 1, 2), "1", "100")
+        self.trade(datetime.date(2024, 1, 3), "-3", "120")
+
+        self.assertEqual(
+            list(
+                RealizedGain.objects.filter(method=CostBasisMethod.FIFO)
+                .order_by("id")
+                .values_list("lot_id", "shares", "gain")
+            ),
+            [
+                (StockLot.objects.get(method=CostBasisMethod.FIFO).id, 1, 20),
+                (None, 2, 0),
+            ],
+        )
+
+    def test_graphql_stock_profit(self):
+        """GraphQL로 손익을 조회하는지 테스트합니다."""
+        self.trade(datetime.date(2024, 1, 2), "10", "100")
+        self.trade(datetime.date(2024, 1, 5), "-5", "120")
+
+        query = """
+        query {
+          stockProfit(method: AVERAGE, year: 2024) {
+            stock { name }
+            shares
+            realizedGain
+            unrealizedGain
+          }
+        }
+        """
+        response = self.client.post(
+            "/money/graphql", {"query": query}, content_type="application/json"
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "data": {
+                    "stockProfit": [
+                        {
+                            "stock": {"name": "Apple"},
+                            "shares": "5.0000",
+                            "realizedGain": "100.00",
+                            "unrealizedGain": "100.00",
+                        }
+                    ]
+                }
+            },
+        )
@@ -0,0 +1,89 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from money.choices import AccountType, CurrencyType, TransactionCategory
+from money.helpers import ledger
+from money.helpers.monthly import (
+    MONTH_RANGE_CACHE_KEY,
+    get_month_range,
+    update_month_info,
+)
+from money.models.accounts import Account, Bank
+from money.models.transactions import Transaction
+
+
+class MonthRangeTest(TestCase):
+    """월 선택기에 쓰이는 거래 기간 캐시를 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Checking",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.create_transaction(datetime.date(2023, 11, 30))
+        self.create_transaction(datetime.date(2024, 2, 1))
+
+    def create_transaction(self, transaction_date):
+        Transaction.objects.create(
+            account=self.account, date=transaction_date, amount=Decimal(-10)
+        )
+        ledger.transactions_changed([(self.account.id, transaction_date)])
+
+    def test_month_list(self):
+        """기간 안의 모든 달이 연도별로 묶이는지 테스트합니다."""
+        self.assertEqual(
+            get_month_range()["months"],
+            {2023: ["2023-11", "2023-12"], 2024: ["2024-01", "2024-02"]},
+        )
+
+    def test_update_month_info_is_cached(self):
+        """캐시된 뒤에는 쿼리 없이 월 정보를 채우는지 테스트합니다."""
+        get_month_range()
+        request = RequestFactory().get("/", {"month": "2024-01"})
+        context = {"additional_get_query": {}}
+
+        with self.assertNumQueries(0):
+            update_month_info(request, context)
+
+        self.assertEqual(context["selected_month"], ("2024-01", "2024년 01월"))
+        self.assertEqual(context["additional_get_query"], {"month": "2024-01"})
+
+    def test_invalidated_outside_range(self):
+        """기간 밖의 거래가 추가될 때만 캐시가 갱신되는지 테스트합니다."""
+        cached = get_month_range()
+
+        self.create_transaction(datetime.date(2024, 1, 15))
+        self.assertIsNotNone(cache.get(MONTH_RANGE_CACHE_KEY))
+        self.assertEqual(get_month_range(), cached)
+
+        self.create_transaction(datetime.date(2024, 3, 1))
+        self.assertEqual(get_month_range()["end"], datetime.date(2024, 3, 1))
+        self.assertEqual(get_month_range()["months"][2024][-1], "2024-03")
+
+    def test_month_selector_pages(self):
+        """월 선택기를 포함한 화면이 렌더링되는지 테스트합니다."""
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        for url in [
+            reverse("money:transaction_list"),
+            reverse("money:transaction_category") + "?month=2024-02",
+            reverse(
+                "money:category_detail",
+                kwargs={"category_type": TransactionCategory.ETC},
+            ),
+            reverse("money:review_internal_transaction"),
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertContains(response, "?month=2023-12")
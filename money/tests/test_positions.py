@@ -0,0 +1,220 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from money.choices import AccountType, CurrencyType
+from money.helpers import holdings, positions, valuation
+from money.models.accounts import Account, Bank
+from money.models.stocks import Stock, StockPosition, StockPrice, StockTransaction
+
+
+class StockPositionTest(TestCase):
+    """주식 보유 현황 테이블을 테스트하는 클래스"""
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Brokerage",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.STOCK,
+        )
+        self.apple = Stock.objects.create(name="Apple", ticker="AAPL")
+        self.google = Stock.objects.create(name="Google", ticker="GOOG")
+
+    def trade(self, stock, day, shares, price):
+        trade = StockTransaction.objects.create(
+            account=self.account,
+            stock=stock,
+            date=datetime.date(2024, 1, day),
+            shares=Decimal(shares),
+            price=Decimal(price),
+            amount=Decimal(shares) * Decimal(price),
+        )
+        positions.stock_transactions_changed([(self.account.id, stock.id, trade.date)])
+        return trade
+
+    def set_price(self, stock, day, price):
+        StockPrice.objects.create(
+            stock=stock, date=datetime.date(2024, 1, day), price=Decimal(price)
+        )
+        positions.stock_prices_changed([(stock.id, datetime.date(2024, 1, day))])
+
+    def test_positions_follow_trades_and_prices(self):
+        """거래와 시세가 기록될 때마다 보유 수량과 평가액이 갱신되는지 테스트합니다."""
+        self.trade(self.apple, 2, "10", "100")
+        self.set_price(self.apple, 3, "110")
+        self.trade(self.apple, 5, "-4", "120")
+        self.set_price(self.apple, 1, "90")
+
+        self.assertEqual(
+            list(
+                StockPosition.objects.order_by("date").values_list(
+                    "date__day", "shares", "price", "market_value"
+                )
+            ),
+            [
+                (2, Decimal(10), Decimal(100), Decimal(1000)),
+                (3, Decimal(10), Decimal(110), Decimal(1100)),
+                (5, Decimal(6), Decimal(120), Decimal(720)),
+            ],
+        )
+
+    def test_incremental_matches_rebuild(self):
+        """중간 날짜의 거래를 추가해도 전체 재계산과 같은지 테스트합니다."""
+        self.trade(self.apple, 2, "10", "100")
+        self.trade(self.google, 4, "1", "50")
+        self.trade(self.apple, 8, "-10", "130")
+        self.set_price(self.google, 6, "55")
+        self.trade(self.apple, 5, "2", "105")
+
+        incremental = list(
+            StockPosition.objects.order_by("date", "stock_id").values_list(
+                "date", "stock_id", "shares", "price", "market_value"
+            )
+        )
+        call_command("rebuild_stock_positions", stdout=open("/dev/null", "w"))
+        self.assertEqual(
+            list(
+                StockPosition.objects.order_by("date", "stock_id").values_list(
+                    "date", "stock_id", "shares", "price", "market_value"
+                )
+            ),
+            incremental,
+        )
+
+    def test_stock_snapshot(self):
+        """날짜별 보유 현황을 범위로 읽어오는지 테스트합니다."""
+        self.trade(self.apple, 2, "10", "100")
+        self.trade(self.google, 4, "1", "50")
+        self.trade(self.apple, 8, "-10", "130")
+
+        snapshot, stock_list = positions.get_stock_snapshot(
+            start=datetime.date(2024, 1, 3)
+        )
+
+        self.assertEqual(stock_list, ["Apple", "Google"])
+        self.assertEqual(
+            [(data["date"], data["total"]) for data in snapshot],
+            [("2024-01-04", Decimal(1050)), ("2024-01-08", Decimal(50))],
+        )
+        self.assertEqual(snapshot[0]["balance"], {"Apple": 10, "Google": 1})
+
+    def test_stock_views(self):
+        """보유 현황을 읽는 화면과 API가 동작하는지 테스트합니다."""
+        self.trade(self.apple, 2, "10", "100")
+
+        for url in [
+            reverse("money:get_stock_snapshot"),
+            reverse("money:stock_chart"),
+            reverse("money:amount_snapshot_list"),
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+
+        data = self.client.get(reverse("money:get_stock_snapshot")).json()
+        self.assertEqual(data["data"][0]["total"], "1000.00")
+
+    def test_portfolio_value(self):
+        """보유 주식을 날짜별 최신 시세로 평가하는지 테스트합니다."""
+        self.trade(self.apple, 2, "10", "100")
+        self.set_price(self.apple, 3, "110")
+        self.trade(self.apple, 6, "5", "120")
+        self.set_price(self.apple, 7, "100")
+        self.set_price(self.google, 4, "999")
+
+        per_account, per_currency = valuation.get_portfolio_values(
+            datetime.date(2024, 1, 1), datetime.date(2024, 1, 8)
+        )
+
+        expected = [
+            (datetime.date(2024, 1, day), Decimal(value))
+            for day, value in [
+                (2, 1000),
+                (3, 1100),
+                (4, 1100),
+                (5, 1100),
+                (6, 1800),
+                (7, 1500),
+                (8, 1500),
+            ]
+        ]
+        self.assertEqual(per_account, {self.account.id: expected})
+        self.assertEqual(per_currency, {CurrencyType.USD: expected})
+
+        response = self.client.get(
+            reverse("money:get_portfolio_value"), {"end": "2024-01-02"}
+        )
+        self.assertEqual(
+            response.json()["currencies"],
+            {"USD": [{"x": "2024-01-02", "y": "1000.00"}]},
+        )
+
+    def test_portfolio_value_downsampling(self):
+        """긴 기간의 평가액은 달마다 마지막 값만 남기는지 테스트합니다."""
+        self.trade(self.apple, 2, "10", "100")
+
+        _, per_currency = valuation.get_portfolio_values(
+            datetime.date(2024, 1, 1), datetime.date(2024, 3, 15)
+        )
+        series = per_currency[CurrencyType.USD]
+        self.assertEqual(len(series), 74)
+        self.assertIs(valuation.downsample_values(series), series)
+
+        self.assertEqual(
+            [value_date for value_date, _ in valuation.downsample_values(series, 30)],
+            [
+                datetime.date(2024, 1, 31),
+                datetime.date(2024, 2, 29),
+                datetime.date(2024, 3, 15),
+            ],
+        )
+
+    def test_bank_holdings(self):
+        """은행의 보유 주식을 캐시하고 거래와 시세가 기록되면 갱신하는지 테스트합니다."""
+        self.trade(self.apple, 2, "10", "100")
+        self.trade(self.google, 3, "1", "50")
+        self.trade(self.google, 4, "-1", "60")
+        self.set_price(self.apple, 5, "110")
+
+        with self.assertNumQueries(3):
+            bank_holdings = holdings.get_bank_holdings(self.bank.id)
+        self.assertEqual(
+            [
+                (holding.stock.name, holding.shares, holding.last_price, holding.value)
+                for holding in bank_holdings
+            ],
+            [("Apple", Decimal(10), Decimal(110), Decimal(1100))],
+        )
+        # Only the accounts and stocks are read again
+        self.apple.name = "Apple Inc."
+        self.apple.save()
+        with self.assertNumQueries(2):
+            bank_holdings = holdings.get_bank_holdings(self.bank.id)
+        self.assertEqual(bank_holdings[0].stock.name, "Apple Inc.")
+
+        self.account.bank = Bank.objects.create(name="Other Bank")
+        self.account.save()
+        self.assertEqual(holdings.get_bank_holdings(self.bank.id), [])
+        self.account.bank = self.bank
+        self.account.save()
+
+        self.set_price(self.apple, 6, "120")
+        self.assertEqual(holdings.get_bank_holdings(self.bank.id)[0].value, 1200)
+
+        response = self.client.get(reverse("money:bank_detail", args=[self.bank.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["stock_balance_map"][self.account.id],
+            [("Apple Inc.", 10.0, 120.0)],
+        )
@@ -0,0 +1,92 @@
+import datetime
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from money.choices import AccountType, CurrencyType
+from money.helpers import positions
+from money.models.accounts import Account, Bank
+from money.models.stocks import Stock, StockPosition, StockPrice, StockTransaction
+
+
+class StockPriceLoaderTest(TestCase):
+    """주식 시세 일괄 적재와 시점 조회를 테스트하는 클래스"""
+
+    def setUp(self):
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Brokerage",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.STOCK,
+        )
+        self.apple = Stock.objects.create(name="Apple", ticker="AAPL")
+        self.google = Stock.objects.create(name="Google", ticker="GOOG")
+
+    def load(self, content):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "prices.csv"
+            path.write_text(content)
+            stdout = StringIO()
+            call_command("load_stock_prices", str(path), stdout=stdout)
+        return stdout.getvalue()
+
+    def test_load_skips_existing_and_unknown(self):
+        """이미 있는 시세와 모르는 종목을 건너뛰고 적재하는지 테스트합니다."""
+        StockPrice.objects.create(
+            stock=self.apple, date=datetime.date(2024, 1, 2), price=Decimal(1)
+        )
+
+        output = self.load(
+            "ticker,date,price\n"
+            "AAPL,2024-01-02,100\n"
+            "AAPL,2024-01-03,110\n"
+            "GOOG,2024-01-03,50\n"
+            "MSFT,2024-01-03,300\n"
+        )
+
+        self.assertIn("2 of 4", output)
+        self.assertIn("MSFT", output)
+        self.assertEqual(
+            list(
+                StockPrice.objects.order_by("stock_id", "date").values_list(
+                    "stock__ticker", "date__day", "price"
+                )
+            ),
+            [
+                ("AAPL", 2, Decimal(1)),
+                ("AAPL", 3, Decimal(110)),
+                ("GOOG", 3, Decimal(50)),
+            ],
+        )
+        self.assertFalse(StockPrice.objects.filter(created_at=None).exists())
+
+    def test_load_refreshes_positions(self):
+        """적재한 시세로 보유 평가액이 갱신되는지 테스트합니다."""
+        StockTransaction.objects.create(
+            account=self.account,
+            stock=self.apple,
+            date=datetime.date(2024, 1, 2),
+            shares=Decimal(10),
+            price=Decimal(100),
+            amount=Decimal(1000),
+        )
+        positions.stock_transactions_changed(
+            [(self.account.id, self.apple.id, datetime.date(2024, 1, 2))]
+        )
+
+        self.load("ticker,date,price\nAAPL,2024-01-03,120\n")
+
+        self.assertEqual(
+            list(
+                StockPosition.objects.order_by("date").values_list(
+                    "date__day", "market_value"
+                )
+            ),
+            [(2, Decimal(1000)), (3, Decimal(1200))],
+        )
@@ -0,0 +1,199 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+
+from money.choices import AccountType, CurrencyType, TransactionCategory
+from money.helpers import ledger
+from money.helpers.rollups import rebuild_monthly_summary
+from money.models.accounts import Account, Bank
+from money.models.shoppings import Retailer
+from money.models.transactions import Transaction, TransactionMonthlySummary
+
+
+class MonthlySummaryTest(TestCase):
+    """월별 거래 집계 테이블을 테스트하는 클래스"""
+
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpassword"
+        )
+        self.client.login(username="testuser", password="testpassword")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.usd = Account.objects.create(
+            name="USD",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.krw = Account.objects.create(
+            name="KRW",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.KRW,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.retailer = Retailer.objects.create(name="Market")
+
+    def create_transaction(self, account, month, day, amount, **kwargs):
+        transaction = Transaction.objects.create(
+            account=account,
+            date=datetime.date(2024, month, day),
+            amount=Decimal(amount),
+            **kwargs,
+        )
+        ledger.transactions_changed([(account.id, transaction.date)])
+        return transaction
+
+    def summary(self):
+        return {
+            (row.month, row.currency, row.type, row.retailer_id, row.is_internal): (
+                row.total,
+                row.plus_sum,
+                row.minus_sum,
+                row.count,
+            )
+            for row in TransactionMonthlySummary.objects.all()
+        }
+
+    def test_rollup_matches_rebuild(self):
+        """증분 갱신 결과가 전체 재계산 결과와 같은지 테스트합니다."""
+        grocery = {"type": TransactionCategory.GROCERY, "retailer": self.retailer}
+        self.create_transaction(self.usd, 1, 3, "-30", **grocery)
+        self.create_transaction(self.usd, 1, 20, "-20", **grocery)
+        self.create_transaction(self.usd, 1, 21, "5", **grocery)
+        self.create_transaction(self.usd, 2, 1, "100", type=TransactionCategory.INCOME)
+        self.create_transaction(self.krw, 1, 5, "-1000", is_internal=True)
+
+        incremental = self.summary()
+        self.assertEqual(
+            incremental[
+                (
+                    datetime.date(2024, 1, 1),
+                    CurrencyType.USD,
+                    TransactionCategory.GROCERY,
+                    self.retailer.id,
+                    False,
+                )
+            ],
+            (Decimal(-45), Decimal(5), Decimal(-50), 3),
+        )
+
+        rebuild_monthly_summary()
+        self.assertEqual(self.summary(), incremental)
+
+    def test_update_moves_between_months(self):
+        """거래 날짜를 바꾸면 이전 달과 새 달이 모두 갱신되는지 테스트합니다."""
+        transaction = self.create_transaction(self.usd, 1, 3, "-30")
+
+        response = self.client.post(
+            reverse("money:transaction_update", kwargs={"pk": transaction.id}),
+            {
+                "date": "2024-03-03",
+                "account": self.usd.id,
+                "amount": "-30",
+                "type": TransactionCategory.ETC,
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(
+            list(TransactionMonthlySummary.objects.values_list("month", "total")),
+            [(datetime.date(2024, 3, 1), Decimal(-30))],
+        )
+
+    def test_account_delete(self):
+        """계좌를 삭제하면 그 계좌의 거래가 집계에서 빠지는지 테스트합니다."""
+        self.create_transaction(self.usd, 1, 3, "-30")
+        self.create_transaction(self.krw, 1, 5, "-1000")
+        other = Account.objects.create(
+            name="Other USD",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.create_transaction(other, 1, 7, "-10")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Account.objects.filter(pk__in=[self.usd.pk, self.krw.pk]).delete()
+
+        self.assertEqual(
+            list(TransactionMonthlySummary.objects.values_list("currency", "total")),
+            [(CurrencyType.USD, Decimal(-10))],
+        )
+
+    def test_admin_currency_change(self):
+        """관리자 화면에서 계좌 통화를 바꾸면 두 통화의 집계가 갱신되는지 테스트합니다."""
+        self.create_transaction(self.usd, 1, 3, "-30")
+        self.create_transaction(self.usd, 2, 3, "-20")
+        get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpassword"
+        )
+        self.client.login(username="admin", password="adminpassword")
+
+        response = self.client.post(
+            reverse("admin:money_account_change", args=[self.usd.pk]),
+            {
+                "bank": self.bank.pk,
+                "name": "USD",
+                "type": AccountType.CHECKING_ACCOUNT,
+                "amount": "-50",
+                "currency": CurrencyType.KRW,
+                "is_active": "on",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(
+            sorted(
+                TransactionMonthlySummary.objects.values_list(
+                    "month", "currency", "total"
+                )
+            ),
+            [
+                (datetime.date(2024, 1, 1), CurrencyType.KRW, Decimal(-30)),
+                (datetime.date(2024, 2, 1), CurrencyType.KRW, Decimal(-20)),
+            ],
+        )
+
+    def test_management_command(self):
+        """관리 명령으로 집계 테이블을 다시 만들 수 있는지 테스트합니다."""
+        self.create_transaction(self.usd, 1, 3, "-30")
+        TransactionMonthlySummary.objects.all().delete()
+
+        call_command("rebuild_monthly_summary", stdout=open("/dev/null", "w"))
+
+        self.assertEqual(
+            TransactionMonthlySummary.objects.aggregate(Sum("total"))["total__sum"],
+            Decimal(-30),
+        )
+
+    def test_views_read_rollup(self):
+        """집계 테이블을 읽는 화면이 정상적으로 렌더링되는지 테스트합니다."""
+        self.create_transaction(
+            self.usd,
+            1,
+            3,
+            "-30",
+            type=TransactionCategory.GROCERY,
+            retailer=self.retailer,
+        )
+
+        for url in [
+            reverse("money:transaction_chart_list") + "?year=2024",
+            reverse("money:retailer_summary"),
+            reverse("money:retailer_detail", kwargs={"pk": self.retailer.id}),
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+
+        response = self.client.get(reverse("money:retailer_summary"))
+        self.assertEqual(response.context["data"], [30.0])
@@ -0,0 +1,110 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+
+from money.choices import AccountType, CurrencyType
+from money.helpers import ledger
+from money.helpers.snapshots import create_daily_snapshot, rebuild_daily_snapshot
+from money.models.accounts import Account, AmountSnapshot, AmountSnapshotWatermark, Bank
+from money.models.transactions import Transaction
+
+
+class DailySnapshotTest(TestCase):
+    """일별 자산 스냅샷 생성을 테스트하는 클래스"""
+
+    def setUp(self):
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.checking = Account.objects.create(
+            name="Checking",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.saving = Account.objects.create(
+            name="Saving",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.USD,
+            type=AccountType.SAVINGS_ACCOUNT,
+        )
+        self.krw = Account.objects.create(
+            name="KRW",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.KRW,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+
+    def create_transaction(self, account, day, amount):
+        return Transaction.objects.create(
+            account=account, date=datetime.date(2024, 1, day), amount=Decimal(amount)
+        )
+
+    def test_create_daily_snapshot(self):
+        """날짜와 통화별로 합계와 계좌별 잔액이 저장되는지 테스트합니다."""
+        self.create_transaction(self.checking, 1, "100")
+        self.create_transaction(self.saving, 1, "50")
+        self.create_transaction(self.checking, 3, "-100")
+        self.create_transaction(self.krw, 2, "1000")
+
+        rebuild_daily_snapshot()
+
+        usd = AmountSnapshot.objects.filter(currency=CurrencyType.USD).order_by("date")
+        self.assertEqual(
+            [(s.date.day, s.amount, s.summary) for s in usd],
+            [
+                (1, Decimal(150), {"Checking": "100.00", "Saving": "50.00"}),
+                (3, Decimal(50), {"Saving": "50.00"}),
+            ],
+        )
+        krw = AmountSnapshot.objects.get(currency=CurrencyType.KRW)
+        self.assertEqual(krw.amount, Decimal(1000))
+
+    def test_rebuild_overwrites_snapshot(self):
+        """다시 생성하면 기존 스냅샷을 덮어쓰는지 테스트합니다."""
+        transaction = self.create_transaction(self.checking, 1, "100")
+        rebuild_daily_snapshot()
+
+        transaction.amount = Decimal(70)
+        transaction.save()
+        rebuild_daily_snapshot()
+
+        snapshot = AmountSnapshot.objects.get()
+        self.assertEqual(snapshot.amount, Decimal(70))
+        self.assertEqual(snapshot.summary, {"Checking": "70.00"})
+
+    def test_refresh_from_dirty_date(self):
+        """변경된 날짜부터 이전 스냅샷을 이어서 다시 계산하는지 테스트합니다."""
+        self.create_transaction(self.checking, 1, "100")
+        self.create_transaction(self.saving, 2, "50")
+        moved = self.create_transaction(self.checking, 3, "-30")
+        rebuild_daily_snapshot()
+
+        moved.date = datetime.date(2024, 1, 4)
+        moved.save()
+        ledger.transactions_changed(
+            [
+                (self.checking.pk, datetime.date(2024, 1, 3)),
+                (self.checking.pk, moved.date),
+            ]
+        )
+        self.assertEqual(
+            AmountSnapshotWatermark.objects.get().dirty_date, datetime.date(2024, 1, 3)
+        )
+
+        # Watermarks, last clean snapshot, delete, read and a single upsert
+        with self.assertNumQueries(6):
+            create_daily_snapshot()
+
+        usd = AmountSnapshot.objects.filter(currency=CurrencyType.USD).order_by("date")
+        self.assertEqual(
+            [(s.date.day, s.amount, s.summary) for s in usd],
+            [
+                (1, Decimal(100), {"Checking": "100.00"}),
+                (2, Decimal(150), {"Checking": "100.00", "Saving": "50.00"}),
+                (4, Decimal(120), {"Checking": "70.00", "Saving": "50.00"}),
+            ],
+        )
+        self.assertFalse(AmountSnapshotWatermark.objects.exists())
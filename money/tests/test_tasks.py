@@ -0,0 +1,177 @@
+import datetime
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from money import tasks
+from money.choices import AccountType, CurrencyType
+from money.helpers import ledger
+from money.models.accounts import Account, AmountSnapshot, Bank
+from money.models.transactions import Transaction, TransactionFile
+
+
+class RebuildTaskTest(TestCase):
+    """잔액과 스냅샷 재계산 태스크를 테스트하는 클래스"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpassword"
+        )
+        self.client.login(username="testuser", password="testpassword")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.accounts = [
+            Account.objects.create(
+                name=f"Account {currency}",
+                bank=self.bank,
+                amount=0,
+                currency=currency,
+                type=AccountType.CHECKING_ACCOUNT,
+            )
+            for currency, _ in CurrencyType.choices
+        ]
+        for account in self.accounts:
+            for day, amount in ((1, "100"), (2, "-40")):
+                Transaction.objects.create(
+                    account=account,
+                    date=datetime.date(2024, 1, day),
+                    amount=Decimal(amount),
+                )
+
+    def test_update_balance_endpoint(self):
+        """잔액 재계산 요청이 태스크 ID를 반환하고 진행 상황을 조회할 수 있는지 테스트합니다."""
+        account = self.accounts[0]
+        response = self.client.get(
+            reverse("money:update_balance", kwargs={"account_id": account.id})
+        )
+        data = response.json()
+
+        self.assertTrue(data["success"])
+        account.refresh_from_db()
+        self.assertEqual(account.amount, Decimal(60))
+
+        status = self.client.get(data["status_url"]).json()
+        self.assertEqual(status, {"state": "SUCCESS", "completed": 1, "total": 1})
+
+    def test_update_balances_fan_out(self):
+        """계좌마다 태스크가 나뉘어 실행되는지 테스트합니다."""
+        result = tasks.update_balances([account.id for account in self.accounts])
+
+        self.assertEqual(len(result.results), len(self.accounts))
+        self.assertEqual(tasks.get_progress(result.id)["completed"], len(self.accounts))
+        for account in self.accounts:
+            account.refresh_from_db()
+            self.assertEqual(account.amount, Decimal(60))
+
+    def test_update_snapshot_endpoint(self):
+        """변경된 통화만 스냅샷 태스크가 실행되는지 테스트합니다."""
+        ledger.transactions_changed([(self.accounts[0].id, datetime.date(2024, 1, 1))])
+
+        data = self.client.get(reverse("money:update_snapshot")).json()
+
+        status = self.client.get(data["status_url"]).json()
+        self.assertEqual(status, {"state": "SUCCESS", "completed": 1, "total": 1})
+        self.assertEqual(
+            list(AmountSnapshot.objects.values_list("currency", flat=True).distinct()),
+            [self.accounts[0].currency],
+        )
+
+    def test_full_snapshot_rebuild(self):
+        """전체 재계산은 모든 통화의 스냅샷을 만드는지 테스트합니다."""
+        data = self.client.get(reverse("money:update_snapshot") + "?full=1").json()
+
+        status = self.client.get(data["status_url"]).json()
+        self.assertEqual(status["total"], len(CurrencyType.choices))
+        self.assertEqual(AmountSnapshot.objects.count(), 2 * len(self.accounts))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TransactionFileTaskTest(TestCase):
+    """업로드한 거래내역 파일 처리 태스크를 테스트하는 클래스"""
+
+    statement = (
+        "2024.11.01 09:00:00\t입금\t1,000\t1,000\t월급\t회사\n"
+        "2024.11.02 12:30:00\t출금\t-300\t700\t점심\t식당\n"
+    )
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.account = Account.objects.create(
+            name="Test Account",
+            bank=self.bank,
+            amount=0,
+            currency=CurrencyType.KRW,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+
+    def upload(self, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("money:file_upload"),
+                {
+                    "file": SimpleUploadedFile("statement.tsv", content.encode()),
+                    "date": "2024-11-30",
+                    "account": self.account.id,
+                },
+            )
+        self.assertTrue(response.json()["success"])
+        return TransactionFile.objects.latest("id")
+
+    def test_upload_is_processed(self):
+        """업로드한 파일의 형식을 알아내 거래를 등록하는지 테스트합니다."""
+        transaction_file = self.upload(self.statement)
+
+        self.assertTrue(transaction_file.is_processed)
+        self.assertIsNotNone(transaction_file.processed_date)
+        self.assertEqual(transaction_file.file_format, "kakao_bank")
+        self.assertEqual(
+            (
+                transaction_file.row_count,
+                transaction_file.created_count,
+                transaction_file.duplicate_count,
+            ),
+            (2, 2, 0),
+        )
+        self.assertIsNotNone(transaction_file.processing_seconds)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.amount, Decimal(700))
+
+        transaction_file = self.upload(self.statement)
+        self.assertEqual(transaction_file.duplicate_count, 2)
+        self.assertEqual(Transaction.objects.count(), 2)
+
+    def test_failed_file_is_not_retried(self):
+        """처리에 실패한 파일은 오류를 남기고 다시 처리하지 않는지 테스트합니다."""
+        transaction_file = self.upload("2024.11.01\t입금\n")
+
+        self.assertFalse(transaction_file.is_processed)
+        self.assertIn("Unknown statement format", transaction_file.error)
+        self.assertEqual(tasks.process_transaction_files(), [])
+
+        transaction_file.error = ""
+        transaction_file.file.save("statement.tsv", ContentFile(self.statement))
+        self.assertEqual(tasks.process_transaction_files(), [transaction_file.pk])
+        transaction_file.refresh_from_db()
+        self.assertTrue(transaction_file.is_processed)
+
+    def test_database_error_is_recorded(self):
+        """데이터베이스 오류로 실패한 파일도 오류를 남겨 다시 처리하지 않는지 테스트합니다."""
+        transaction_file = self.upload(
+            "2024.11.01 09:00:00\t입금\t100000000000000000000\t0\t\t회사\n"
+        )
+
+        self.assertFalse(transaction_file.is_processed)
+        self.assertIn("DataError", transaction_file.error)
+        self.assertFalse(Transaction.objects.exists())
+        self.assertEqual(tasks.process_transaction_files(), [])
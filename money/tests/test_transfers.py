@@ -0,0 +1,139 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from money.choices import AccountType, TransactionCategory
+from money.helpers.transfers import load_candidates, match_transfers, save_matches
+from money.models.accounts import Account, Bank
+from money.models.exchanges import Exchange
+from money.models.transactions import Transaction
+
+
+class TransferMatchTest(TestCase):
+    """계좌 간 이체와 환전 짝짓기를 테스트하는 클래스"""
+
+    def setUp(self):
+        get_user_model().objects.create_user(username="testuser", password="testpw")
+        self.client.login(username="testuser", password="testpw")
+
+        self.bank = Bank.objects.create(name="Test Bank")
+        self.krw = Account.objects.create(
+            name="KRW Account",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        self.krw_savings = Account.objects.create(
+            name="KRW Savings",
+            bank=self.bank,
+            amount=0,
+            currency="KRW",
+            type=AccountType.SAVINGS_ACCOUNT,
+        )
+        self.usd = Account.objects.create(
+            name="USD Account",
+            bank=self.bank,
+            amount=0,
+            currency="USD",
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+
+    def create(self, account, day, amount):
+        return Transaction.objects.create(
+            account=account,
+            date=datetime.date(2024, 1, day),
+            amount=Decimal(amount),
+            is_internal=True,
+            type=TransactionCategory.TRANSFER,
+        )
+
+    def match(self):
+        return save_matches(match_transfers(load_candidates()))
+
+    def assertLinked(self, one, other):
+        one.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(one.related_transaction, other)
+        self.assertEqual(other.related_transaction, one)
+
+    def test_same_currency_transfer(self):
+        """같은 통화의 반대 금액 입금을 며칠 뒤까지 찾아 연결하는지 테스트합니다."""
+        source = self.create(self.krw, 1, "-50000")
+        target = self.create(self.krw_savings, 3, "50000")
+        late = self.create(self.krw, 10, "-70000")
+        self.create(self.krw_savings, 20, "70000")
+
+        self.assertEqual(len(self.match()), 1)
+
+        self.assertLinked(source, target)
+        late.refresh_from_db()
+        self.assertIsNone(late.related_transaction)
+        self.assertFalse(Exchange.objects.exists())
+
+    def test_exchange(self):
+        """같은 날 환율 범위 안의 원화와 달러 거래를 환전으로 기록하는지 테스트합니다."""
+        source = self.create(self.krw, 1, "-135000")
+        target = self.create(self.usd, 1, "100")
+
+        self.assertEqual(len(self.match()), 1)
+
+        self.assertLinked(source, target)
+        exchange = Exchange.objects.get()
+        self.assertEqual(exchange.from_transaction, source)
+        self.assertEqual(exchange.to_transaction, target)
+        self.assertEqual(exchange.ratio_per_krw, Decimal("1350.00"))
+
+    def test_exchange_out_of_range(self):
+        """환율 범위를 벗어나면 환전으로 연결하지 않는지 테스트합니다."""
+        self.create(self.krw, 1, "-50000")
+        self.create(self.usd, 1, "100")
+
+        self.assertEqual(self.match(), [])
+        self.assertFalse(Exchange.objects.exists())
+
+    def test_ambiguous_transfer(self):
+        """후보 입금이 여럿이면 검토하도록 남겨두는지 테스트합니다."""
+        self.create(self.krw, 1, "-50000")
+        self.create(self.krw_savings, 1, "50000")
+        self.create(self.usd, 1, "50000")
+        self.create(self.krw_savings, 1, "50000")
+
+        self.assertEqual(self.match(), [])
+
+    def test_already_linked(self):
+        """짝지은 뒤에 연결된 거래는 저장하지 않는지 테스트합니다."""
+        source = self.create(self.krw, 1, "-50000")
+        target = self.create(self.krw_savings, 1, "50000")
+        matches = match_transfers(load_candidates())
+        other = self.create(self.krw_savings, 1, "-1")
+        Transaction.objects.filter(pk=target.pk).update(related_transaction=other)
+
+        self.assertEqual(save_matches(matches), [])
+
+        source.refresh_from_db()
+        self.assertIsNone(source.related_transaction)
+
+    def test_update_related_transaction_view(self):
+        """검토 화면에서 보낸 짝만 검사해 연결하는지 테스트합니다."""
+        source = self.create(self.krw, 1, "-50000")
+        target = self.create(self.krw_savings, 2, "50000")
+        wrong = self.create(self.krw, 3, "-1000")
+        other = self.create(self.krw_savings, 3, "2000")
+
+        response = self.client.post(
+            reverse("money:update_related_transaction"),
+            {
+                f"name_{target.id}": str(source.id),
+                f"name_{wrong.id}": str(other.id),
+                f"name_{other.id}": "",
+            },
+        )
+
+        self.assertEqual(response.json(), {f"name_{target.id}": str(source.id)})
+        self.assertLinked(source, target)
+        wrong.refresh_from_db()
+        self.assertIsNone(wrong.related_transaction)
@@ -1,12 +1,36 @@
+from datetime import date
+from decimal import Decimal
+
 import strawberry
 import strawberry.django
+from django.db.models import Count, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
 from strawberry import auto, relay
 
 from money.models.accounts import Account, AmountSnapshot, Bank
+from money.models.transactions import Transaction
 from money.types.common import BankBalance
 
-
 # region Account
+# Computed per page by the optimizer in the query of the accounts themselves
+TRANSACTION_COUNT = Coalesce(
+    Subquery(
+        Transaction.objects.filter(account=OuterRef("pk"))
+        .order_by()
+        .values("account")
+        .annotate(count=Count("id"))
+        .values("count")
+    ),
+    Value(0),
+)
+# Last transaction in the running balance order of money.helpers.balance
+LATEST_BALANCE = Subquery(
+    Transaction.objects.filter(account=OuterRef("pk"))
+    .order_by("-date", "amount", "-id")
+    .values("balance")[:1]
+)
+
+
 @strawberry.django.filters.filter(Account, lookups=True)
 class AccountFilter:
     id: auto
@@ -41,6 +65,24 @@ class AccountNode(relay.Node):
     last_transaction: auto
     first_transaction: auto
 
+    @strawberry.django.field(annotate={"transaction_count_value": TRANSACTION_COUNT})
+    def transaction_count(self) -> int:
+        count = getattr(self, "transaction_count_value", None)
+        if count is None:
+            count = Transaction.objects.filter(account=self).count()
+        return count
+
+    @strawberry.django.field(annotate={"latest_balance_value": LATEST_BALANCE})
+    def latest_balance(self) -> Decimal | None:
+        if hasattr(self, "latest_balance_value"):
+            return self.latest_balance_value
+        return (
+            Transaction.objects.filter(account=self)
+            .order_by("-date", "amount", "-id")
+            .values_list("balance", flat=True)
+            .first()
+        )
+
 
 @strawberry.django.input(Account)
 class AccountInput:
@@ -67,7 +109,18 @@ class BankOrder:
 class BankNode(relay.Node):
     id: relay.GlobalID
     name: auto
-    balance: list[BankBalance]
+
+    @strawberry.django.field(
+        prefetch_related=[
+            Prefetch(
+                "account_set",
+                queryset=Account.objects.only("id", "bank", "currency", "amount"),
+                to_attr="balance_accounts",
+            )
+        ]
+    )
+    def balance(self) -> list[BankBalance]:
+        return self.balance
 
     account_set: strawberry.django.relay.ListConnectionWithTotalCount[
         AccountNode
@@ -103,3 +156,21 @@ class AmountSnapshotNode(relay.Node):
 
 
 # endregion
+
+
+# region: BalanceSeries
+@strawberry.type
+class BalancePointNode:
+    month: date
+    balance: Decimal
+
+
+@strawberry.type
+class BalanceSeriesNode:
+    """계좌의 월말 잔액 추이를 나타내는 타입"""
+
+    account: AccountNode
+    points: list[BalancePointNode]
+
+
+# endregion
@@ -0,0 +1,114 @@
+from typing import Any
+
+import strawberry
+from django.db import models
+from strawberry import UNSET, relay
+from strawberry.types import Info
+from strawberry_django.fields.types import OneToManyInput
+from strawberry_django.utils.typing import get_django_definition
+
+from money.helpers.bulk import BulkResult, RowError, bulk_create_rows, bulk_update_rows
+
+
+@strawberry.type
+class BulkRowError:
+    """대량 입력에서 잘못된 행의 오류를 나타내는 타입"""
+
+    index: int
+    field: str | None
+    message: str
+
+
+def _global_id(value: Any) -> relay.GlobalID | None:
+    # Relations may be given as a relay GlobalID or as the raw primary key
+    if isinstance(value, relay.GlobalID):
+        return value
+    if isinstance(value, str):
+        try:
+            return relay.GlobalID.from_id(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _node_model(info: Info, type_name: str) -> type[models.Model] | None:
+    definition = info.schema.get_type_by_name(type_name)
+    origin = getattr(definition, "origin", None)
+    django_definition = get_django_definition(origin) if origin else None
+    return django_definition.model if django_definition else None
+
+
+def _to_pk(
+    info: Info, related_model: type[models.Model], value: Any
+) -> tuple[Any, str | None]:
+    """Primary key of a relation value and the error of a node of another type."""
+    global_id = _global_id(value)
+    if global_id is None:
+        return value, None
+    if _node_model(info, global_id.type_name) is not related_model:
+        return None, (
+            f"Expected an id of {related_model.__name__}, "
+            f"got one of {global_id.type_name}."
+        )
+    return global_id.node_id, None
+
+
+def input_values(
+    info: Info, model: type[models.Model], index: int, data: Any
+) -> tuple[dict[str, Any], list[RowError]]:
+    """
+    Field values set on a strawberry_django input, relations by attname, and
+    the errors of relations given the id of another node type.
+    """
+    values = {}
+    errors = []
+    for name, value in vars(data).items():
+        if value is UNSET or name == "id":
+            continue
+        field = model._meta.get_field(name)
+        if isinstance(value, OneToManyInput):
+            value = value.set
+        if not field.is_relation:
+            values[name] = value
+        elif value is None:
+            values[field.attname] = None
+        else:
+            pk, error = _to_pk(info, field.related_model, value)
+            if error is not None:
+                errors.append(RowError(index, name, error))
+            values[field.attname] = pk
+    return values, errors
+
+
+def bulk_create_inputs(
+    info: Info, model: type[models.Model], data: list[Any]
+) -> BulkResult:
+    values = []
+    errors = []
+    for index, row in enumerate(data):
+        row_values, row_errors = input_values(info, model, index, row)
+        values.append(row_values)
+        errors.extend(row_errors)
+    return bulk_create_rows(model, values, errors)
+
+
+def bulk_update_inputs(
+    info: Info, model: type[models.Model], data: list[Any]
+) -> BulkResult:
+    values = []
+    errors = []
+    for index, row in enumerate(data):
+        pk, error = _to_pk(info, model, row.id)
+        if error is not None:
+            errors.append(RowError(index, "id", error))
+        row_values, row_errors = input_values(info, model, index, row)
+        values.append((pk, row_values))
+        errors.extend(row_errors)
+    return bulk_update_rows(model, values, errors)
+
+
+def row_errors(result: BulkResult) -> list[BulkRowError]:
+    return [
+        BulkRowError(index=error.index, field=error.field, message=error.message)
+        for error in result.errors
+    ]
@@ -0,0 +1,28 @@
+from typing import Any
+
+from strawberry.extensions import FieldExtension
+
+from money.helpers import ledger, positions
+from money.models.stocks import StockTransaction
+from money.models.transactions import Transaction
+
+
+class LedgerUpdateExtension(FieldExtension):
+    """
+    Update balances of the accounts and the stock positions touched by a
+    transaction or stock transaction mutation.
+    """
+
+    def resolve(self, next_, source: Any, info, **kwargs: Any) -> Any:
+        result = next_(source, info, **kwargs)
+
+        rows = result if isinstance(result, list) else [result]
+        ledger.transactions_changed(
+            (row.account_id, row.date) for row in rows if isinstance(row, Transaction)
+        )
+        positions.stock_transactions_changed(
+            (row.account_id, row.stock_id, row.date)
+            for row in rows
+            if isinstance(row, StockTransaction)
+        )
+        return result
@@ -3,6 +3,7 @@ import strawberry.django
 from strawberry import auto, relay
 
 from money.models.shoppings import AmazonOrder
+from money.types.bulk import BulkRowError
 from money.types.transactions import TransactionNode
 
 
@@ -31,4 +32,20 @@ class AmazonOrderNode(relay.Node):
     return_transaction: TransactionNode | None
 
 
+@strawberry.django.partial(AmazonOrder)
+class AmazonOrderPartialInput:
+    id: strawberry.ID
+    date: auto
+    item: auto
+    is_returned: auto
+    transaction: TransactionNode | None
+    return_transaction: TransactionNode | None
+
+
+@strawberry.type
+class AmazonOrderBulkPayload:
+    nodes: list[AmazonOrderNode]
+    errors: list[BulkRowError]
+
+
 # endregion
@@ -1,9 +1,13 @@
+from decimal import Decimal
+
 import strawberry
 import strawberry.django
 from strawberry import auto, relay
 
+from money.choices import CostBasisMethod
 from money.models import stocks
 from money.types.accounts import AccountNode
+from money.types.bulk import BulkRowError
 from money.types.transactions import TransactionNode
 
 
@@ -67,4 +71,45 @@ class StockTransactionNode(relay.Node):
     note: auto
 
 
+@strawberry.django.partial(stocks.StockTransaction)
+class StockTransactionPartialInput:
+    id: strawberry.ID
+    date: auto
+    account: AccountNode | None
+    stock: StockNode | None
+    related_transaction: TransactionNode | None
+
+    price: auto
+    amount: auto
+    shares: auto
+    note: auto
+
+
+@strawberry.type
+class StockTransactionBulkPayload:
+    nodes: list[StockTransactionNode]
+    errors: list[BulkRowError]
+
+
+# endregion
+
+
+# region: StockProfit
+CostBasisMethodEnum = strawberry.enum(CostBasisMethod, name="CostBasisMethod")
+
+
+@strawberry.type
+class StockProfitNode:
+    """계좌와 종목별 실현/미실현 손익을 나타내는 타입"""
+
+    account: AccountNode
+    stock: StockNode
+    year: int | None
+    shares: Decimal
+    cost_basis: Decimal
+    market_value: Decimal
+    realized_gain: Decimal
+    unrealized_gain: Decimal
+
+
 # endregion
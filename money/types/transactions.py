@@ -1,9 +1,25 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
 import strawberry
 import strawberry.django
+from django.db.models import F, OrderBy, Q, QuerySet
 from strawberry import auto, relay
+from strawberry.relay.utils import (
+    from_base64,
+    should_resolve_list_connection_edges,
+    to_base64,
+)
+from strawberry.types import Info
+from strawberry_django.relay import ListConnectionWithTotalCount
+from strawberry_django.resolvers import django_resolver
 
+from money.choices import CurrencyType, TransactionCategory, TransactionGrouping
+from money.helpers.counts import get_cached_count, get_estimated_count
 from money.models.transactions import Transaction
 from money.types.accounts import AccountFilter, AccountNode, AccountOrder
+from money.types.bulk import BulkRowError
 from money.types.retailers import RetailerNode
 
 
@@ -45,6 +61,190 @@ class TransactionNode(relay.Node):
         return self.balance if self.amount >= 0 else -self.balance
 
 
+TRANSACTION_CURSOR_PREFIX = "transaction"
+
+
+# Keyset fields of the orderings paged by keyset
+KEYSET_ORDERINGS = {
+    ("date",): ("date", "id"),
+    ("date", "id"): ("date", "id"),
+    ("date", "pk"): ("date", "id"),
+    ("id",): ("id",),
+    ("pk",): ("id",),
+    # TransactionOrder applies id before date, so the date never breaks a tie
+    ("id", "date"): ("id",),
+}
+
+
+def _order_item(item: Any) -> tuple[str, bool] | None:
+    if isinstance(item, str):
+        return item.lstrip("-"), item.startswith("-")
+    if isinstance(item, OrderBy) and isinstance(item.expression, F):
+        return item.expression.name, item.descending
+    return None
+
+
+def _keyset(query_set: QuerySet) -> tuple[tuple[str, ...], bool] | None:
+    """
+    Keyset fields and direction of a query_set ordered by id, by date or by
+    (date, id) in one direction, None for any other order.
+    """
+    items = [_order_item(item) for item in query_set.query.order_by]
+    if not items:
+        return ("id",), False
+    if None in items or len({descending for _, descending in items}) != 1:
+        return None
+    fields = KEYSET_ORDERINGS.get(tuple(name for name, _ in items))
+    if fields is None:
+        return None
+    return fields, items[0][1]
+
+
+def _decode_cursor(cursor: str | None) -> tuple[date, int] | None:
+    prefix, value = from_base64(cursor)
+    if prefix != TRANSACTION_CURSOR_PREFIX:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    day, pk = value.split(":")
+    return date.fromisoformat(day), int(pk)
+
+
+def _seek(
+    query_set: QuerySet,
+    cursor: tuple[date, int],
+    fields: tuple[str, ...],
+    descending: bool,
+) -> QuerySet:
+    """
+    Rows after cursor in the order of fields. The redundant bound on date alone
+    lets the (date, id) index start the scan at the cursor.
+    """
+    day, pk = cursor
+    if fields == ("id",):
+        return (
+            query_set.filter(id__lt=pk) if descending else query_set.filter(id__gt=pk)
+        )
+    if descending:
+        return query_set.filter(Q(date__lt=day) | Q(date=day, id__lt=pk), date__lte=day)
+    return query_set.filter(Q(date__gt=day) | Q(date=day, id__gt=pk), date__gte=day)
+
+
+@strawberry.type(description="Transactions paged by their (date, id).")
+class TransactionConnection(ListConnectionWithTotalCount[TransactionNode]):
+    """
+    Transactions paged by the (date, id) of the last edge instead of an offset,
+    so a page deep in the ledger costs as much as the first one. Ordered by id,
+    the default, only the id of the cursor is used. Ordered by anything else,
+    or given an offset cursor, it pages by offset.
+    """
+
+    @strawberry.field(description="Total quantity of existing nodes.")
+    @django_resolver
+    def total_count(self) -> int | None:
+        if isinstance(self.nodes, QuerySet):
+            return get_cached_count(self.nodes)
+        return None
+
+    @strawberry.field(description="Quantity of nodes estimated by the database.")
+    @django_resolver
+    def estimated_count(self) -> int | None:
+        if isinstance(self.nodes, QuerySet):
+            return get_estimated_count(self.nodes)
+        return None
+
+    @classmethod
+    def resolve_connection(
+        cls,
+        nodes: Any,
+        *,
+        info: Info,
+        before: str | None = None,
+        after: str | None = None,
+        first: int | None = None,
+        last: int | None = None,
+        max_results: int | None = None,
+        **kwargs: Any,
+    ) -> "TransactionConnection":
+        keyset = _keyset(nodes) if isinstance(nodes, QuerySet) else None
+        try:
+            after_key = _decode_cursor(after) if after else None
+            before_key = _decode_cursor(before) if before else None
+        except ValueError:
+            keyset = None
+        if keyset is None:
+            return super().resolve_connection(
+                nodes,
+                info=info,
+                before=before,
+                after=after,
+                first=first,
+                last=last,
+                max_results=max_results,
+                **kwargs,
+            )
+
+        max_results = (
+            max_results
+            if max_results is not None
+            else info.schema.config.relay_max_results
+        )
+        for name, value in (("first", first), ("last", last)):
+            if value is not None and not 0 <= value <= max_results:
+                raise ValueError(
+                    f"Argument '{name}' must be between 0 and {max_results}."
+                )
+
+        fields, descending = keyset
+        query_set = nodes
+        if after_key is not None:
+            query_set = _seek(query_set, after_key, fields, descending)
+        if before_key is not None:
+            query_set = _seek(query_set, before_key, fields, not descending)
+
+        # Paging backwards walks the index the other way and flips the page
+        backwards = last is not None and first is None
+        if backwards:
+            limit = last
+        elif first is not None:
+            limit = first
+        else:
+            limit = max_results
+        page_descending = descending != backwards
+        ordering = [f"-{field}" if page_descending else field for field in fields]
+
+        rows = []
+        if should_resolve_list_connection_edges(info):
+            rows = list(
+                query_set.annotate(cursor_date=F("date")).order_by(*ordering)[
+                    : limit + 1
+                ]
+            )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+
+        edges = [
+            relay.Edge(
+                cursor=to_base64(
+                    TRANSACTION_CURSOR_PREFIX, f"{row.cursor_date.isoformat()}:{row.pk}"
+                ),
+                node=cls.resolve_node(row, info=info, **kwargs),
+            )
+            for row in rows
+        ]
+        connection = cls(
+            edges=edges,
+            page_info=relay.PageInfo(
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None,
+                has_previous_page=has_more if backwards else after_key is not None,
+                has_next_page=before_key is not None if backwards else has_more,
+            ),
+        )
+        connection.nodes = nodes
+        return connection
+
+
 @strawberry.django.input(Transaction)
 class TransactionInput:
     amount: auto
@@ -56,4 +256,46 @@ class TransactionInput:
     note: auto
 
 
+@strawberry.django.partial(Transaction)
+class TransactionPartialInput:
+    id: strawberry.ID
+    amount: auto
+    account: AccountNode | None
+    retailer: RetailerNode | None
+    date: auto
+    type: auto
+    is_internal: auto
+    reviewed: auto
+    note: auto
+
+
+@strawberry.type
+class TransactionBulkPayload:
+    nodes: list[TransactionNode]
+    errors: list[BulkRowError]
+
+
+# endregion
+
+
+# region: TransactionTotal
+TransactionGroupingEnum = strawberry.enum(
+    TransactionGrouping, name="TransactionGrouping"
+)
+
+
+@strawberry.type
+class TransactionTotalNode:
+    """통화와 묶음 기준별 거래 합계를 나타내는 타입"""
+
+    currency: CurrencyType
+    month: date | None
+    type: TransactionCategory | None
+    retailer: RetailerNode | None
+    total: Decimal
+    income: Decimal
+    spending: Decimal
+    count: int
+
+
 # endregion
@@ -2,17 +2,17 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
-from strawberry.django.views import GraphQLView
 
 from money import views
 from money.schema import schema
 from money.views import transaction_detail_view, transaction_view, view_functions
+from money.views.graphql_view import PersistedQueryGraphQLView
 
 app_name = "money"
 
 # Configure GraphQL view with GraphiQL enabled.
 # In DEBUG, exempt from CSRF to allow the built-in UI to function without manual headers.
-graphql_view = GraphQLView.as_view(schema=schema, graphiql=True)
+graphql_view = PersistedQueryGraphQLView.as_view(schema=schema, graphiql=True)
 if settings.DEBUG:
     graphql_view = csrf_exempt(graphql_view)
 
@@ -53,12 +53,22 @@ urlpatterns = [
         view=view_functions.create_daily_snapshot,
         name="update_snapshot",
     ),
+    path(
+        "task_status/<str:task_id>",
+        view=view_functions.get_task_status,
+        name="task_status",
+    ),
     # region Stock
     path(
         "get_stock_snapshot",
         view=view_functions.get_stock_snapshot,
         name="get_stock_snapshot",
     ),
+    path(
+        "get_portfolio_value",
+        view=view_functions.get_portfolio_value,
+        name="get_portfolio_value",
+    ),
     path(
         "stock_chart",
         view=views.stock_amount_chart_view,
@@ -2,18 +2,27 @@ from typing import Any
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.paginator import Paginator
-from django.db.models import Max, Min, Prefetch, Sum
+from django.db.models import F, Prefetch, Sum
 from django.db.models.functions.math import Sign
 from django.shortcuts import render
 from django.views.generic import DetailView, View
 
 from money.choices import CurrencyType, TransactionCategory
-from money.helpers.charts import get_transaction_chart_data
+from money.helpers.charts import get_account_chart_series
 from money.helpers.helper import update_retailer_summary
-from money.helpers.monthly import filter_month, update_month_info, update_month_summary
+from money.helpers.monthly import (
+    filter_month,
+    filter_summary_month,
+    update_month_info,
+    update_month_summary,
+)
 from money.models.accounts import Account
 from money.models.stocks import StockTransaction
-from money.models.transactions import Transaction, TransactionDetail
+from money.models.transactions import (
+    Transaction,
+    TransactionDetail,
+    TransactionMonthlySummary,
+)
 
 
 class AccountDetailView(LoginRequiredMixin, DetailView):
@@ -61,11 +70,7 @@ class AccountDetailView(LoginRequiredMixin, DetailView):
         page = paginator.get_page(page_number)
         context["page_obj"] = page
 
-        context["data"] = get_transaction_chart_data(
-            ordered_transaction_set,
-            account.currency,
-            reverse=True,
-        )
+        context["data"] = get_account_chart_series(account)
 
         context["stock_list"] = (
             StockTransaction.objects.filter(account=account)
@@ -95,25 +100,23 @@ class CategoryDetailView(LoginRequiredMixin, View):
         )
         transaction_list = filter_month(request, transaction_list)
 
-        date_range = Transaction.objects.aggregate(Min("date"), Max("date"))
-        update_month_info(
-            request,
-            context,
-            date_range["date__min"],
-            date_range["date__max"],
-        )
+        update_month_info(request, context)
 
-        update_month_summary(request, context, transaction_list)
+        summary_list = TransactionMonthlySummary.objects.filter(
+            type=category_type, is_internal=False
+        )
+        summary_list = filter_summary_month(request, summary_list)
+        update_month_summary(request, context, summary_list)
 
         context["category"] = category_type
         context["transaction_list"] = transaction_list
         context["unreviewd"] = transaction_list.filter(reviewed=False)
 
         context["retailer_detail"] = (
-            transaction_list.values(
-                "retailer__id", "retailer__name", "account__currency"
+            summary_list.values(
+                "retailer__id", "retailer__name", account__currency=F("currency")
             )
-            .annotate(Sum("amount"))
+            .annotate(amount__sum=Sum("total"))
             .order_by("amount__sum")
         )
         context["detail_item_summary"] = (
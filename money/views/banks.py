@@ -2,12 +2,11 @@ from collections import defaultdict
 from typing import Any, cast
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, FloatField, OuterRef, QuerySet, Subquery
+from django.db.models import Count, QuerySet
 from django.views.generic import DetailView, ListView
-from django_stubs_ext import WithAnnotations
 
+from money.helpers.holdings import get_bank_holdings
 from money.models.accounts import Account, Bank
-from money.models.stocks import StockPrice, StockTransaction
 
 
 class BankDetailView(LoginRequiredMixin, DetailView):
@@ -21,56 +20,13 @@ class BankDetailView(LoginRequiredMixin, DetailView):
             "type", "name"
         )
 
-        # Get last stock transaction for each account
-        last_stock_transaction = (
-            StockTransaction.objects.filter(
-                stock=OuterRef("stock"), account__name=OuterRef("account__name")
-            )
-            .order_by("-date", "amount")
-            .values("balance")
-        )
-
-        # Get last stock price for each stock
-        last_stock_price = (
-            StockPrice.objects.filter(stock=OuterRef("stock"))
-            .order_by("-date")
-            .values("price")
-        )
-
-        # Annotate last stock transaction for each account
-        last_transactions_per_account: QuerySet[WithAnnotations[Any]] = (
-            StockTransaction.objects.filter(account__bank=bank)
-            .distinct("stock", "account__name")
-            .annotate(
-                last_stock_transaction=Subquery(
-                    last_stock_transaction[:1],
-                    output_field=FloatField(),
-                ),
-                last_stock_price=Subquery(
-                    last_stock_price[:1],
-                    output_field=FloatField(),
-                ),
-            )
-        )
-
         stock_balance_map = defaultdict(list)
         stock_value_map = defaultdict(float)
-        for data in last_transactions_per_account:
-            if (
-                data.last_stock_transaction > 0.01
-                or data.last_stock_transaction < -0.01
-            ):
-                stock_balance_map[data.account.pk].append(
-                    (
-                        data.stock.name,
-                        data.last_stock_transaction,
-                        data.last_stock_price,
-                    )
-                )
-                if data.last_stock_price is not None:
-                    stock_value_map[data.account.pk] += (
-                        data.last_stock_transaction * data.last_stock_price
-                    )
+        for holding in get_bank_holdings(bank.pk):
+            stock_balance_map[holding.account.pk].append(
+                (holding.stock.name, float(holding.shares), float(holding.last_price))
+            )
+            stock_value_map[holding.account.pk] += float(holding.value)
 
         context["account_list"] = account_list
         context["stock_balance_map"] = stock_balance_map
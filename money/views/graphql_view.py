@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.http import HttpRequest, JsonResponse
+from strawberry.django.views import GraphQLView
+from strawberry.http import GraphQLRequestData
+from strawberry.http.sync_base_view import SyncHTTPRequestAdapter
+
+from money.helpers.persisted_queries import PersistedQueryError, resolve_query
+
+
+class PersistedQueryGraphQLView(GraphQLView):
+    """
+    GraphQL view accepting the sha256 of a persisted query in place of its text,
+    as {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": ...}}}.
+    A rejected hash is answered with a GraphQL error carrying its code.
+    """
+
+    def parse_http_body(self, request: SyncHTTPRequestAdapter) -> GraphQLRequestData:
+        request_data = super().parse_http_body(request)
+
+        if request.method == "GET":
+            extensions = request.query_params.get("extensions")
+            extensions = self.parse_json(extensions) if extensions else {}
+        elif "application/json" in (request.content_type or ""):
+            extensions = self.parse_json(request.body).get("extensions") or {}
+        else:
+            extensions = {}
+        if not isinstance(extensions, dict):
+            extensions = {}
+
+        request_data.query = resolve_query(
+            request_data.query, extensions.get("persistedQuery")
+        )
+        return request_data
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except PersistedQueryError as e:
+            return JsonResponse(
+                {"errors": [{"message": str(e), "extensions": {"code": e.code}}]},
+                status=e.status,
+            )
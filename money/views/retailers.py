@@ -1,15 +1,14 @@
 from typing import Any
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Case, FloatField, Sum, When
-from django.db.models.functions import TruncMonth
+from django.db.models import F, Sum
 from django.urls import reverse_lazy
 from django.views.generic import DetailView, TemplateView
 from django.views.generic.edit import CreateView
 
 from money.choices import CurrencyType, TransactionCategory
 from money.forms import RetailerForm
-from money.models.transactions import Retailer, Transaction
+from money.models.transactions import Retailer, Transaction, TransactionMonthlySummary
 
 
 class RetailerSummaryView(LoginRequiredMixin, TemplateView):
@@ -20,26 +19,13 @@ class RetailerSummaryView(LoginRequiredMixin, TemplateView):
         currency = self.request.GET.get("currency", CurrencyType.USD)
 
         return (
-            Transaction.objects.filter(account__currency=currency, is_internal=False)
+            TransactionMonthlySummary.objects.filter(
+                currency=currency, is_internal=False
+            )
             .values(
                 "retailer__id", "retailer__name", "retailer__type", "retailer__category"
             )
-            .annotate(
-                minus_sum=Sum(
-                    Case(
-                        When(amount__lt=0, then="amount"),
-                        default=0,
-                        output_field=FloatField(),
-                    )
-                ),
-                plus_sum=Sum(
-                    Case(
-                        When(amount__gt=0, then="amount"),
-                        default=0,
-                        output_field=FloatField(),
-                    )
-                ),
-            )
+            .annotate(minus_sum=Sum("minus_sum"), plus_sum=Sum("plus_sum"))
             .order_by("retailer__name")
         )
 
@@ -47,13 +33,14 @@ class RetailerSummaryView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         context["currency"] = self.request.GET.get("currency", CurrencyType.USD)
         context["category_list"] = TransactionCategory.choices
+        context["transaction_list"] = self.get_queryset()
         label = []
         data = []
 
         for transaction in context["transaction_list"]:
             if transaction["minus_sum"] < 0:
                 label.append(transaction["retailer__name"])
-                data.append(-transaction["minus_sum"])
+                data.append(float(-transaction["minus_sum"]))
 
         context["label"] = label
         context["data"] = data
@@ -73,9 +60,9 @@ class RetailerDetailView(LoginRequiredMixin, DetailView):
             retailer_id=self.kwargs["pk"]
         ).order_by("date")
         transactions_by_month = (
-            trnasactions.annotate(month=TruncMonth("date"))
-            .values("month", "account__currency")
-            .annotate(total_amount=Sum("amount"))
+            TransactionMonthlySummary.objects.filter(retailer_id=self.kwargs["pk"])
+            .values("month", account__currency=F("currency"))
+            .annotate(total_amount=Sum("total"))
             .order_by("month", "account__currency")
         )
         context["transactions"] = trnasactions
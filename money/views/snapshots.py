@@ -5,7 +5,7 @@ from django.views.generic import ListView
 
 from money.choices import CurrencyType
 from money.helpers.charts import merge_charts, snapshot_chart
-from money.helpers.snapshots import get_stock_snapshot
+from money.helpers.valuation import downsample_values, get_portfolio_values
 from money.models.accounts import AmountSnapshot
 
 
@@ -20,9 +20,12 @@ class AmountSnapshotListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs: Any) -> dict[str, list[Any]]:
         context = super().get_context_data(**kwargs)
 
-        stock_snapshot, _ = get_stock_snapshot()
+        _, per_currency = get_portfolio_values()
         stock_chart: list[dict[str, str]] = [
-            {"x": str(data["date"]), "y": str(data["total"])} for data in stock_snapshot
+            {"x": value_date.strftime("%Y-%m-%d"), "y": str(value)}
+            for value_date, value in downsample_values(
+                per_currency.get(CurrencyType.USD, [])
+            )
         ]
         context["stock_data"] = stock_chart
 
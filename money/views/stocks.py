@@ -6,7 +6,7 @@ from django.views.generic.edit import CreateView
 
 from money.forms import StockForm
 from money.helpers.charts import convert_snapshot_to_chart_data
-from money.helpers.snapshots import get_stock_snapshot
+from money.helpers.positions import get_stock_snapshot
 from money.models.stocks import Stock, StockTransaction
 
 
@@ -35,9 +35,9 @@ class StockAmountChartView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
 
         # group by currency
-        snapshot, stock_set = get_stock_snapshot()
+        snapshot, stock_list = get_stock_snapshot()
         context["labels"], context["datasets"] = convert_snapshot_to_chart_data(
-            snapshot, stock_set
+            [(data["date"], data["balance"]) for data in snapshot], stock_list
         )
         return context
 
@@ -4,21 +4,7 @@ from typing import Any
 from django import forms
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import transaction
-from django.db.models import (
-    Case,
-    Count,
-    F,
-    FloatField,
-    Func,
-    Max,
-    Min,
-    Prefetch,
-    Q,
-    QuerySet,
-    Sum,
-    When,
-)
-from django.db.models.functions import TruncMonth
+from django.db.models import Count, F, Func, Prefetch, Q, QuerySet, Sum
 from django.shortcuts import render
 from django.urls import reverse_lazy
 from django.views.generic import DetailView, ListView, TemplateView, UpdateView, View
@@ -26,14 +12,15 @@ from django.views.generic.edit import CreateView
 
 from money import forms as money_forms
 from money.choices import CurrencyType, ExchangeType, TransactionCategory
+from money.helpers import ledger, positions
 from money.helpers.charts import snapshot_chart
-from money.helpers.monthly import filter_month, update_month_info
+from money.helpers.monthly import filter_month, filter_summary_month, update_month_info
 from money.helpers.yearly import year_summary
 from money.models.accounts import Account, AmountSnapshot
 from money.models.exchanges import Exchange
 from money.models.shoppings import AmazonOrder, Retailer
 from money.models.stocks import StockTransaction
-from money.models.transactions import Transaction
+from money.models.transactions import Transaction, TransactionMonthlySummary
 
 
 # Transaction related views
@@ -50,24 +37,27 @@ class TransactionListView(LoginRequiredMixin, ListView):
         if reviewed is not None:
             qs = qs.filter(reviewed=reviewed)
 
+        raw_retailer = self.request.GET.get("raw_retailer", None)
+        if raw_retailer:
+            # Containment, unlike ->> with ILIKE, is served by the raw GIN index
+            qs = qs.filter(raw__contains={"retailer": raw_retailer})
+
         return qs
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
 
-        date_range = Transaction.objects.aggregate(Min("date"), Max("date"))
         context["additional_get_query"] = {}
-        update_month_info(
-            self.request,
-            context,
-            date_range["date__min"],
-            date_range["date__max"],
-        )
+        update_month_info(self.request, context)
 
         reviewed = self.request.GET.get("reviewed", None)
         if reviewed is not None:
             context["additional_get_query"]["reviewed"] = reviewed
 
+        raw_retailer = self.request.GET.get("raw_retailer", None)
+        if raw_retailer:
+            context["additional_get_query"]["raw_retailer"] = raw_retailer
+
         return context
 
 
@@ -89,26 +79,13 @@ class TransactionChartListView(LoginRequiredMixin, ListView):
 
         selected_year = self.request.GET.get("year", date.today().year)
         monthly_summary = (
-            Transaction.objects.filter(is_internal=False)
+            TransactionMonthlySummary.objects.filter(is_internal=False)
             .filter(~Q(type=TransactionCategory.STOCK))
-            .annotate(month=TruncMonth("date"))
-            .values("month", "account__currency")
+            .values("month", account__currency=F("currency"))
             .annotate(
-                total_amount=Sum("amount"),
-                minus_sum=Sum(
-                    Case(
-                        When(amount__lt=0, then="amount"),
-                        default=0,
-                        output_field=FloatField(),
-                    )
-                ),
-                plus_sum=Sum(
-                    Case(
-                        When(amount__gt=0, then="amount"),
-                        default=0,
-                        output_field=FloatField(),
-                    )
-                ),
+                total_amount=Sum("total"),
+                minus_sum=Sum("minus_sum"),
+                plus_sum=Sum("plus_sum"),
             )
             .order_by("-month", "account__currency")
         )
@@ -166,6 +143,11 @@ class TransactionCreateView(LoginRequiredMixin, CreateView):
         context["account"] = Account.objects.get(pk=self.kwargs["account_id"])
         return context
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        ledger.transactions_changed([(self.object.account_id, self.object.date)])
+        return response
+
 
 transaction_create_view = TransactionCreateView.as_view()
 
@@ -175,6 +157,16 @@ class TransactionUpdateView(UpdateView):
     model = Transaction
     form_class = money_forms.TransactionUpdateForm
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        ledger.transactions_changed(
+            [
+                (form.initial.get("account"), form.initial.get("date")),
+                (self.object.account_id, self.object.date),
+            ]
+        )
+        return response
+
 
 transaction_update_view = TransactionUpdateView.as_view()
 
@@ -184,21 +176,17 @@ class TransactionCategoryView(LoginRequiredMixin, View):
     template_name = "category/category.html"
 
     def get(self, request, *args, **kwargs):
-        query_set = Transaction.objects.values("type", "account__currency")
-        query_set = filter_month(request, query_set)
+        query_set = TransactionMonthlySummary.objects.values(
+            "type", account__currency=F("currency")
+        )
+        query_set = filter_summary_month(request, query_set)
 
         context = {"additional_get_query": {}}
 
-        date_range = Transaction.objects.aggregate(Min("date"), Max("date"))
-        update_month_info(
-            request,
-            context,
-            date_range["date__min"],
-            date_range["date__max"],
-        )
+        update_month_info(request, context)
 
         context["summarization"] = query_set.annotate(
-            total_amount=-Sum("amount")
+            total_amount=-Sum("total")
         ).order_by("account__currency", "-total_amount")
 
         label_per_currency = {k[0]: [] for k in CurrencyType.choices}
@@ -360,13 +348,7 @@ class ReviewInternalTransactionView(LoginRequiredMixin, ListView):
         if self.request.GET.get(self.INTERNAL_ONLY_FLAG, False):
             context["additional_get_query"][self.INTERNAL_ONLY_FLAG] = True
 
-        date_range = Transaction.objects.aggregate(Min("date"), Max("date"))
-        update_month_info(
-            self.request,
-            context,
-            date_range["date__min"],
-            date_range["date__max"],
-        )
+        update_month_info(self.request, context)
         return context
 
 
@@ -446,6 +428,17 @@ class StockTransactionCreateView(LoginRequiredMixin, CreateView):
         stock_transaction.related_transaction = transaction
         stock_transaction.save()
 
+        ledger.transactions_changed([(transaction.account_id, transaction.date)])
+        positions.stock_transactions_changed(
+            [
+                (
+                    stock_transaction.account_id,
+                    stock_transaction.stock_id,
+                    stock_transaction.date,
+                )
+            ]
+        )
+
         return super().form_valid(form)
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
@@ -1,57 +1,24 @@
 import datetime
 import json
-from collections import defaultdict
-from decimal import Decimal
 
 import requests
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.db.models import Count, Q
 from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render
+from django.urls import reverse
 
-from money import choices, forms
-from money.helpers import snapshots
-from money.models.accounts import Account
-from money.models.exchanges import Exchange
+from money import forms, tasks
+from money.helpers import month_end, positions, transfers, valuation
 from money.models.shoppings import AmazonOrder, DetailItem, Retailer
 from money.models.transactions import Transaction, TransactionCategory
 
 
 def update_balance(request, account_id):
-    account = Account.objects.get(pk=account_id)
-    transactions = account.transaction_set.all().order_by("date", "-amount")
-
-    total = Decimal(0)
-    first = True
-    for transaction in transactions:
-        if first:
-            account.first_transaction = transaction.date
-            first = False
-        total += transaction.amount
-        if abs(total) < 0.01:
-            total = 0
-        transaction.balance = total
-        transaction.save()
-        account.last_transaction = transaction.date
-
-    account.amount = total
-    account.last_update = datetime.datetime.now()
-    account.save()
-
-    stocks = (
-        account.stocktransaction_set.all()
-        .order_by("date", "-amount")
-        .prefetch_related("stock")
-    )
-
-    stock_sum = defaultdict(int)
+    result = tasks.update_balances([account_id])
 
-    for stock in stocks:
-        stock_sum[stock.stock.id] += stock.shares
-        stock.balance = stock_sum[stock.stock.id]
-        stock.save()
-
-    return JsonResponse({"success": True})
+    return JsonResponse({"success": True, **_task_info(result.id)})
 
 
 @login_required
@@ -80,80 +47,37 @@ def get_retailer_type(request, retailer_id):
 @login_required
 def update_related_transaction(request):
     if request.method == "POST":
-        # Get the form data from the request.POST dictionary
-        updated = {}
+        # name_<source id>: <target id> pairs typed on the review page
+        pairs = {}
         for item, value in request.POST.items():
             if item.startswith("name_") and value:
-                source_id = int(item[5:])
-                target_id = int(value)
-
-                source: Transaction = Transaction.objects.get(id=source_id)
-                target: Transaction = Transaction.objects.get(id=target_id)
-
-                if source.account.currency == target.account.currency:
-                    if (
-                        source.related_transaction is None
-                        and target.related_transaction is None
-                        and source.is_internal
-                        and target.is_internal
-                        and source_id != target_id
-                        and source.account.pk != target.account.pk
-                    ):
-                        if abs(source.amount + target.amount) < 0.01:
-                            source.related_transaction = target
-                            target.related_transaction = source
-
-                            target.save()
-                            source.save()
-                            updated[item] = value
-                else:
-                    # 환전
-                    if (
-                        source.date == target.date
-                        and source.related_transaction is None
-                        and target.related_transaction is None
-                        and source.is_internal
-                        and target.is_internal
-                        and source_id != target_id
-                        and source.account.pk != target.account.pk
-                        and source.amount * target.amount < 0
-                    ):
-                        if source.amount > 0:
-                            # source should has minus amount
-                            temp = source
-                            source = target
-                            target = temp
-
-                        if source.account.currency == choices.CurrencyType.KRW:
-                            ratio = source.amount / target.amount
-                        else:
-                            ratio = target.amount / source.amount
-
-                        ratio = round(-ratio, 2)
-
-                        if ratio > 1600 or ratio < 1000:
-                            continue
-
-                        exchange = Exchange(
-                            date=source.date,
-                            from_transaction=source,
-                            to_transaction=target,
-                            from_amount=source.amount,
-                            to_amount=target.amount,
-                            from_currency=source.account.currency,
-                            to_currency=target.account.currency,
-                            ratio_per_krw=ratio,
-                        )
-                        exchange.save()
-
-                        source.related_transaction = target
-                        target.related_transaction = source
-
-                        target.save()
-                        source.save()
-                        updated[item] = value
-
-        return JsonResponse(updated)
+                pairs[item] = (int(item[5:]), int(value))
+
+        candidates = {
+            candidate.id: candidate
+            for candidate in transfers.candidates_by_id(
+                {pk for pair in pairs.values() for pk in pair}
+            )
+        }
+        matches = {}
+        for item, (source_id, target_id) in pairs.items():
+            if source_id not in candidates or target_id not in candidates:
+                continue
+            match = transfers.check_pair(candidates[source_id], candidates[target_id])
+            if match is not None:
+                matches[item] = match
+                # A transaction goes to the first pair it appears in
+                candidates.pop(source_id)
+                candidates.pop(target_id)
+
+        saved = set(transfers.save_matches(list(matches.values())))
+        return JsonResponse(
+            {
+                item: request.POST[item]
+                for item, match in matches.items()
+                if match in saved
+            }
+        )
     return HttpResponseNotAllowed(permitted_methods=["POST"])
 
 
@@ -229,18 +153,73 @@ def get_exchange_rate(request):
 
 @login_required
 def create_daily_snapshot(request):
-    snapshots.create_daily_snapshot()
-    return JsonResponse({"success": True})
+    result = tasks.update_daily_snapshot(full=bool(request.GET.get("full")))
+    return JsonResponse({"success": True, **_task_info(result.id)})
+
+
+@login_required
+def get_task_status(request, task_id):
+    return JsonResponse(tasks.get_progress(task_id))
+
+
+def _task_info(task_id: str) -> dict[str, str]:
+    return {
+        "task_id": task_id,
+        "status_url": reverse("money:task_status", kwargs={"task_id": task_id}),
+    }
 
 
 @login_required
-# trunk-ignore(pylint/W0613)
 def get_stock_snapshot(request):
-    stock_snapshot, stock_list = snapshots.get_stock_snapshot()
+    try:
+        start, end = _get_date_range(request)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "invalid date"}, status=400)
+    stock_snapshot, stock_list = positions.get_stock_snapshot(start, end)
 
     return JsonResponse({"data": stock_snapshot, "stock_list": stock_list})
 
 
+@login_required
+def get_portfolio_value(request):
+    try:
+        start, end = _get_date_range(request)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "invalid date"}, status=400)
+    per_account, per_currency = valuation.get_portfolio_values(start, end)
+
+    return JsonResponse(
+        {
+            "accounts": {
+                account_id: _value_chart(valuation.downsample_values(series))
+                for account_id, series in per_account.items()
+            },
+            "currencies": {
+                currency: _value_chart(valuation.downsample_values(series))
+                for currency, series in per_currency.items()
+            },
+        }
+    )
+
+
+def _get_date_range(
+    request: HttpRequest,
+) -> tuple[datetime.date | None, datetime.date | None]:
+    # optional ?start=YYYY-mm-dd&end=YYYY-mm-dd
+    start, end = (
+        datetime.date.fromisoformat(request.GET[key]) if request.GET.get(key) else None
+        for key in ("start", "end")
+    )
+    return start, end
+
+
+def _value_chart(series: valuation.ValueSeries) -> list[dict[str, str]]:
+    return [
+        {"x": value_date.strftime("%Y-%m-%d"), "y": str(value)}
+        for value_date, value in series
+    ]
+
+
 @login_required
 def filter_retailer(request):
     keyword = request.GET.get("keyword")
@@ -258,7 +237,10 @@ def file_upload(request):
         print("Post")
         form = forms.TransactionFileForm(request.POST, request.FILES)
         if form.is_valid():
-            form.save()
+            transaction_file = form.save()
+            transaction.on_commit(
+                lambda: tasks.process_transaction_file.delay(transaction_file.pk)
+            )
             return JsonResponse({"success": True})
     else:
         form = forms.TransactionFileForm()
@@ -268,37 +250,19 @@ def file_upload(request):
 
 @login_required
 def get_end_month_balance(request):
-    accounts = Account.objects.filter(is_active=True)
-    end_month_balances = []
-
-    year = "2024"
-
-    for account in accounts:
-        account_balances = []
-        for month in range(1, 13):
-            last_transaction = (
-                account.transaction_set.filter(date__year=year, date__month=month)
-                .order_by("date", "-amount")
-                .last()
-            )
-
-            if last_transaction is None:
-                continue
-
-            account_balances.append(
-                {
-                    "month": month,
-                    "balance": last_transaction.balance,
-                    "transaction_id": last_transaction.id,
-                }
-            )
-
-        end_month_balances.append(
-            {
-                "account_id": account.id,
-                "account_name": account.name,
-                "balance": account_balances,
-            }
+    # ?year=YYYY, or ?start=YYYY-mm-dd&end=YYYY-mm-dd, defaults to this year
+    try:
+        if request.GET.get("start") or request.GET.get("end"):
+            start = datetime.date.fromisoformat(request.GET["start"])
+            end = datetime.date.fromisoformat(request.GET["end"])
+        else:
+            year = int(request.GET.get("year", datetime.date.today().year))
+            start, end = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {"success": False, "error": "invalid year or date range"}, status=400
         )
 
-    return JsonResponse({"end_month_balances": end_month_balances})
+    return JsonResponse(
+        {"end_month_balances": month_end.get_month_end_balances(start, end)}
+    )
@@ -0,0 +1,98 @@
+import datetime
+import random
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+
+from money.choices import AccountType, CurrencyType
+from money.helpers import balance
+from money.models.accounts import Account, Bank
+from money.models.transactions import Transaction
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_update_balance(account):
+    """Per-row loop that update_balance used before the window query engine."""
+    transactions = account.transaction_set.all().order_by("date", "-amount", "id")
+
+    total = Decimal(0)
+    for transaction_row in transactions:
+        total += transaction_row.amount
+        if abs(total) < 0.01:
+            total = 0
+        transaction_row.balance = total
+        transaction_row.save()
+
+    stock_sum = defaultdict(int)
+    for stock in account.stocktransaction_set.all().order_by("date", "-amount", "id"):
+        stock_sum[stock.stock_id] += stock.shares
+        stock.balance = stock_sum[stock.stock_id]
+        stock.save()
+
+
+def create_ledger(size: int) -> Account:
+    bank = Bank.objects.create(name="Benchmark Bank")
+    account = Account.objects.create(
+        name="Benchmark Account",
+        bank=bank,
+        amount=0,
+        currency=CurrencyType.KRW,
+        type=AccountType.CHECKING_ACCOUNT,
+    )
+
+    start = datetime.date.today() - datetime.timedelta(days=size // 5)
+    rng = random.Random(0)
+    Transaction.objects.bulk_create(
+        Transaction(
+            account=account,
+            date=start + datetime.timedelta(days=i // 5),
+            amount=Decimal(rng.randint(-50000, 50000)) / 100,
+        )
+        for i in range(size)
+    )
+    return account
+
+
+def measure(func, account) -> float:
+    Transaction.objects.filter(account=account).update(balance=None)
+    begin = time.perf_counter()
+    func(account)
+    return time.perf_counter() - begin
+
+
+def run(*args):
+    """python manage.py runscript benchmark_balance --script-args 10000"""
+    size = int(args[0]) if args else 10000
+
+    try:
+        with transaction.atomic():
+            account = create_ledger(size)
+
+            legacy = measure(legacy_update_balance, account)
+            expected = list(
+                Transaction.objects.filter(account=account)
+                .order_by("id")
+                .values_list("balance", flat=True)
+            )
+
+            engine = measure(balance.update_account_balance, account)
+            actual = list(
+                Transaction.objects.filter(account=account)
+                .order_by("id")
+                .values_list("balance", flat=True)
+            )
+
+            print(f"transactions: {size}")
+            print(f"per-row save loop: {legacy:.3f}s")
+            print(f"window query engine: {engine:.3f}s ({legacy / engine:.1f}x)")
+            print(f"same result: {expected == actual}")
+
+            # Do not leave the synthetic ledger behind
+            raise Rollback
+    except Rollback:
+        pass
@@ -0,0 +1,131 @@
+import datetime
+import random
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, reset_queries, transaction
+
+from money.choices import AccountType, CurrencyType
+from money.helpers import snapshots
+from money.models.accounts import Account, AmountSnapshot, Bank
+from money.models.transactions import Transaction
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_create_daily_snapshot():
+    """Per-date loop that create_daily_snapshot used before the bulk builder."""
+
+    def create_snapshot(date, currency, amount, summary):
+        float_summary = {k: str(v) for k, v in summary.items()}
+        if AmountSnapshot.objects.filter(date=date, currency=currency):
+            snapshot = AmountSnapshot.objects.get(date=date, currency=currency)
+            snapshot.amount = amount
+            snapshot.summary = float_summary
+        else:
+            snapshot = AmountSnapshot(
+                date=date, currency=currency, amount=amount, summary=float_summary
+            )
+        snapshot.save()
+
+    all_transaction_list = (
+        Transaction.objects.all().order_by("date").prefetch_related("account")
+    )
+    for currency in CurrencyType.choices:
+        transaction_list = all_transaction_list.filter(account__currency=currency[0])
+        if not transaction_list:
+            continue
+
+        prev_date = transaction_list[0].date
+        total_value = Decimal(0.0)
+        history = defaultdict(Decimal)
+        for transaction_row in transaction_list:
+            if prev_date != transaction_row.date:
+                create_snapshot(prev_date, currency[0], total_value, history)
+                prev_date = transaction_row.date
+
+            account_id = transaction_row.account.name
+            account_value = history[account_id] + transaction_row.amount
+            if account_value == 0.0:
+                del history[account_id]
+            else:
+                history[account_id] = account_value
+            total_value += transaction_row.amount
+
+        create_snapshot(prev_date, currency[0], total_value, history)
+
+
+def create_ledger(years: int, size: int, account_count: int = 20) -> None:
+    bank = Bank.objects.create(name="Benchmark Bank")
+    account_list = Account.objects.bulk_create(
+        Account(
+            name=f"Benchmark Account {i}",
+            bank=bank,
+            amount=0,
+            currency=CurrencyType.KRW if i % 2 else CurrencyType.USD,
+            type=AccountType.CHECKING_ACCOUNT,
+        )
+        for i in range(account_count)
+    )
+
+    days = years * 365
+    start = datetime.date.today() - datetime.timedelta(days=days)
+    rng = random.Random(0)
+    Transaction.objects.bulk_create(
+        (
+            Transaction(
+                account=rng.choice(account_list),
+                date=start + datetime.timedelta(days=i * days // size),
+                amount=Decimal(rng.randint(-50000, 50000)) / 100,
+            )
+            for i in range(size)
+        ),
+        batch_size=5000,
+    )
+
+
+def measure(func) -> tuple[float, int]:
+    AmountSnapshot.objects.all().delete()
+    reset_queries()
+    begin = time.perf_counter()
+    func()
+    return time.perf_counter() - begin, len(connection.queries)
+
+
+def snapshot_rows():
+    return list(
+        AmountSnapshot.objects.order_by("currency", "date").values_list(
+            "date", "currency", "amount", "summary"
+        )
+    )
+
+
+def run(*args):
+    """python manage.py runscript benchmark_snapshot --script-args 10 100000"""
+    years = int(args[0]) if args else 10
+    size = int(args[1]) if len(args) > 1 else 100000
+
+    try:
+        with transaction.atomic():
+            create_ledger(years, size)
+
+            legacy, legacy_queries = measure(legacy_create_daily_snapshot)
+            expected = snapshot_rows()
+
+            builder, builder_queries = measure(snapshots.create_daily_snapshot)
+            actual = snapshot_rows()
+
+            print(f"ledger: {years} years, {size} transactions")
+            print(f"per-date loop: {legacy:.3f}s")
+            print(f"bulk builder: {builder:.3f}s ({legacy / builder:.1f}x)")
+            if connection.queries_logged:
+                print(f"queries: {legacy_queries} -> {builder_queries}")
+            print(f"same result: {expected == actual}")
+
+            # Do not leave the synthetic ledger behind
+            raise Rollback
+    except Rollback:
+        pass
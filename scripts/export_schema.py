@@ -1,16 +1,88 @@
 from __future__ import annotations
 
+import argparse
+import json
 import os
 import sys
 from pathlib import Path
 
 
+def collect_operations(paths: list[Path]) -> list[str]:
+    """
+    Every operation of the .graphql documents under paths, printed with the
+    fragments it spreads, as clients send it and hash it.
+    """
+    from graphql import (
+        DocumentNode,
+        FragmentDefinitionNode,
+        FragmentSpreadNode,
+        OperationDefinitionNode,
+        Visitor,
+        parse,
+        print_ast,
+        visit,
+    )
+
+    class SpreadCollector(Visitor):
+        def __init__(self) -> None:
+            super().__init__()
+            self.names: list[str] = []
+
+        def enter_fragment_spread(self, node: FragmentSpreadNode, *args) -> None:
+            self.names.append(node.name.value)
+
+    definitions = []
+    for path in paths:
+        files = [path] if path.is_file() else sorted(path.rglob("*.graphql"))
+        for file in files:
+            definitions.extend(parse(file.read_text(encoding="utf-8")).definitions)
+
+    fragments = {
+        definition.name.value: definition
+        for definition in definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+    operations = []
+    for definition in definitions:
+        if not isinstance(definition, OperationDefinitionNode):
+            continue
+
+        used: list[str] = []
+        pending = [definition]
+        while pending:
+            collector = SpreadCollector()
+            visit(pending.pop(), collector)
+            for name in collector.names:
+                if name not in used:
+                    used.append(name)
+                    pending.append(fragments[name])
+
+        document = DocumentNode(
+            definitions=[definition, *(fragments[name] for name in used)]
+        )
+        operations.append(print_ast(document))
+    return operations
+
+
 def main() -> None:
     backend_root = Path(__file__).resolve().parents[1]
     # Ensure backend root is on sys.path so imports like `money.schema` work
     if str(backend_root) not in sys.path:
         sys.path.insert(0, str(backend_root))
 
+    parser = argparse.ArgumentParser(
+        description="Write schema.graphql and the persisted query allow-list"
+    )
+    parser.add_argument(
+        "documents",
+        nargs="*",
+        type=Path,
+        default=[backend_root.parent / "frontend" / "src"],
+        help=".graphql files or directories of the client operations",
+    )
+    args = parser.parse_args()
+
     # Default to local settings unless explicitly provided
     os.environ.setdefault(
         "DJANGO_SETTINGS_MODULE",
@@ -21,6 +93,10 @@ def main() -> None:
 
     django.setup()
 
+    from django.conf import settings
+    from graphql import parse, validate
+
+    from money.helpers.persisted_queries import query_hash
     from money.schema import schema  # noqa: WPS433
 
     sdl = schema.as_str()
@@ -28,6 +104,25 @@ def main() -> None:
     output_path.write_text(sdl, encoding="utf-8")
     print(f"Wrote schema to {output_path}")
 
+    documents = [path for path in args.documents if path.exists()]
+    if not documents:
+        print("No client documents found, allow-list not written")
+        return
+
+    allow_list = {}
+    for query in collect_operations(documents):
+        errors = validate(schema._schema, parse(query))
+        if errors:
+            sys.exit(f"Invalid operation:\n{query}\n{errors[0].message}")
+        allow_list[query_hash(query)] = query
+
+    allow_list_path = Path(settings.GRAPHQL_PERSISTED_QUERIES_PATH)
+    allow_list_path.write_text(
+        json.dumps(allow_list, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    print(f"Wrote {len(allow_list)} persisted queries to {allow_list_path}")
+
 
 if __name__ == "__main__":
     main()